@@ -0,0 +1,291 @@
+from game_log import (HEADER, RECORD, MAGIC, END_OF_GAME, GameLogError,
+                      LoggedGame)
+from events import EventType
+from card import ALL_CARDS, KING
+from rules import STANDARD_RULES
+from simulate import special_card_name
+from typing import Dict, Iterable, List, Optional, Tuple
+from array import array
+import argparse
+import mmap
+import os
+import numpy as np
+
+
+# the report name and whether the card is a penalty by the standard rules,
+# indexed by code
+SPECIAL_NAMES = [special_card_name(card.suit, card.value)
+                 for card in ALL_CARDS]
+PENALTY_CARDS = np.array(STANDARD_RULES.draws) > 0
+# kings that cancel a king's penalty when played in answer to it
+CANCEL_CARDS = np.array([card.value == KING for card in ALL_CARDS]
+                        ) & ~PENALTY_CARDS
+
+
+class _Columns:
+    """Growable typed columns the archive is built from"""
+    def __init__(self) -> None:
+        self.seeds = array('Q')
+        self.players = array('B')
+        self.turns = array('l')
+        self.event_game = array('l')
+        self.event_turn = array('l')
+        self.event_seat = array('B')
+        self.event_type = array('B')
+        self.event_value = array('l')
+        self.card_event = array('l')
+        self.card_code = array('B')
+
+    def add_game(self, seed: int, players: int) -> int:
+        self.seeds.append(seed)
+        self.players.append(players)
+        self.turns.append(0)
+        return len(self.seeds) - 1
+
+    def add_event(self, game: int, event_type: int, turn: int, seat: int,
+                  cards, value: int) -> None:
+        index = len(self.event_type)
+        self.event_game.append(game)
+        self.event_turn.append(turn)
+        self.event_seat.append(seat)
+        self.event_type.append(event_type)
+        self.event_value.append(value)
+        if event_type != EventType.MOVE:
+            self.card_event.extend([index] * len(cards))
+            self.card_code.extend(cards)
+
+
+def read_buffer(columns: '_Columns', data) -> None:
+    """
+    Adds the games stored in a buffer holding a log to the columns
+    without building an event for every record
+    Throws error if the buffer is not a valid log
+    """
+    offset = 0
+    size = len(data)
+    while offset < size:
+        if size - offset < HEADER.size:
+            raise GameLogError('The log ends in the middle of a game')
+        magic, seed, players, deck_size = HEADER.unpack_from(data, offset)
+        if magic != MAGIC:
+            raise GameLogError(f'No game starts at byte {offset}')
+        offset += HEADER.size + deck_size
+        game = columns.add_game(seed, players)
+        while True:
+            if size - offset < RECORD.size:
+                raise GameLogError('The log ends in the middle of a game')
+            event_type, seat, turn, value, length = RECORD.unpack_from(
+                data, offset)
+            offset += RECORD.size
+            if event_type == END_OF_GAME:
+                columns.turns[game] = turn
+                break
+            columns.add_event(game, event_type, turn, seat,
+                              data[offset:offset + length], value)
+            offset += length
+
+
+class GameArchive:
+    """
+    Class GameArchive. Holds many logged games as columnar NumPy arrays
+    and computes statistics over all of them at once. Events are rows
+    of the event columns and the cards they played or drew are rows of
+    the card columns pointing back at their event. Hand indexes logged
+    with moves are left out.
+    Contains attributes:
+
+    :param seeds: The seed of every game
+    :type seeds: np.ndarray
+
+    :param players: The number of seats at every game
+    :type players: np.ndarray
+
+    :param turns: The number of turns every game lasted
+    :type turns: np.ndarray
+
+    :param event_game: The game every event belongs to
+    :type event_game: np.ndarray
+
+    :param event_type: The type of every event from EventType
+    :type event_type: np.ndarray
+
+    :param card_event: The event every card belongs to
+    :type card_event: np.ndarray
+
+    :param card_code: The code of every card
+    :type card_code: np.ndarray
+    """
+    def __init__(self, columns: '_Columns') -> None:
+        """Initialises the GameArchive class from filled columns"""
+        self.seeds = np.asarray(columns.seeds, dtype=np.uint64)
+        self.players = np.asarray(columns.players, dtype=np.uint8)
+        self.turns = np.asarray(columns.turns, dtype=np.int64)
+        self.event_game = np.asarray(columns.event_game, dtype=np.int64)
+        self.event_turn = np.asarray(columns.event_turn, dtype=np.int64)
+        self.event_seat = np.asarray(columns.event_seat, dtype=np.uint8)
+        self.event_type = np.asarray(columns.event_type, dtype=np.uint8)
+        self.event_value = np.asarray(columns.event_value, dtype=np.int64)
+        self.card_event = np.asarray(columns.card_event, dtype=np.int64)
+        self.card_code = np.asarray(columns.card_code, dtype=np.uint8)
+
+    @classmethod
+    def from_games(cls, games: Iterable['LoggedGame']) -> 'GameArchive':
+        """Builds an archive from games that were already read"""
+        columns = _Columns()
+        for logged in games:
+            game = columns.add_game(logged.seed, logged.num_of_players)
+            for event in logged.events:
+                columns.add_event(game, event.type, event.turn, event.seat,
+                                  event.cards, event.value)
+            columns.turns[game] = logged.turns
+        return cls(columns)
+
+    @classmethod
+    def from_buffer(cls, data) -> 'GameArchive':
+        """
+        Builds an archive straight from a buffer holding a log
+        Throws error if the buffer is not a valid log
+        """
+        columns = _Columns()
+        read_buffer(columns, data)
+        return cls(columns)
+
+    @classmethod
+    def load(cls, paths: Iterable[str]) -> 'GameArchive':
+        """
+        Memory maps the logs and builds one archive from all of them
+        Throws error if any of them is not a valid log
+        """
+        columns = _Columns()
+        for path in paths:
+            if os.path.getsize(path) == 0:
+                continue
+            with open(path, 'rb') as log:
+                with mmap.mmap(log.fileno(), 0,
+                               access=mmap.ACCESS_READ) as data:
+                    read_buffer(columns, data)
+        return cls(columns)
+
+    @property
+    def games(self) -> int:
+        return len(self.seeds)
+
+    def events_of(self, event_type: 'EventType') -> np.ndarray:
+        """Returns the indexes of the events of the given type"""
+        return np.flatnonzero(self.event_type == event_type)
+
+    def played_cards(self) -> np.ndarray:
+        """Returns the rows of the card columns that were played"""
+        return np.flatnonzero(
+            self.event_type[self.card_event] == EventType.CARD_PLAYED)
+
+    def special_card_frequencies(self) -> Dict[str, float]:
+        """Returns how many times every special card was played per game"""
+        counts = np.bincount(self.card_code[self.played_cards()],
+                             minlength=len(ALL_CARDS))
+        frequencies = {}
+        for code in np.flatnonzero(counts):
+            name = SPECIAL_NAMES[code]
+            if name is not None:
+                frequencies[name] = frequencies.get(name, 0) + counts[code]
+        return {name: count / max(self.games, 1)
+                for name, count in sorted(frequencies.items())}
+
+    def penalty_chains(self) -> np.ndarray:
+        """
+        Returns the length of every penalty chain, the number of 2s, 3s
+        and penalty kings played before someone had to draw them.
+        Chains cancelled by another king and chains still going
+        when a game ended are left out. Draws for not saying makao
+        are logged as MAKAO_PENALTY and do not end a chain
+        """
+        played = self.played_cards()
+        penalties = self.card_event[
+            played[PENALTY_CARDS[self.card_code[played]]]]
+
+        # a chain ends when its cards are drawn or when a king
+        # that cancels it is played on its own in answer to it
+        sizes = np.bincount(self.card_event, minlength=len(self.event_type))
+        cancels = self.card_event[
+            played[CANCEL_CARDS[self.card_code[played]]]]
+        cancels = cancels[sizes[cancels] == 1]
+        draws = self.events_of(EventType.DRAW)
+        ends = np.union1d(draws, cancels)
+        if not len(draws):
+            return np.zeros(0, dtype=np.int64)
+
+        # every penalty card belongs to the first end after its event
+        # as long as both happened in the same game
+        chain = np.searchsorted(ends, penalties, side='right')
+        penalties = penalties[chain < len(ends)]
+        chain = chain[chain < len(ends)]
+        same_game = self.event_game[penalties] == self.event_game[
+            ends[chain]]
+        lengths = np.bincount(chain[same_game], minlength=len(ends))
+        lengths = lengths[np.isin(ends, draws)]
+        return lengths[lengths > 0]
+
+    def average_penalty_chain(self) -> float:
+        """Returns the average length of a penalty chain"""
+        lengths = self.penalty_chains()
+        return float(lengths.mean()) if len(lengths) else 0.0
+
+    def game_lengths(self, bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the histogram of game lengths in turns and its bin edges"""
+        return np.histogram(self.turns, bins=bins)
+
+    def first_places(self) -> np.ndarray:
+        """Returns the seat that finished first in every game, -1 if none"""
+        won = self.events_of(EventType.PLAYER_WON)
+        won = won[self.event_value[won] == 1]
+        seats = np.full(self.games, -1, dtype=np.int64)
+        seats[self.event_game[won]] = self.event_seat[won]
+        return seats
+
+    def win_rates(self, num_of_players: int) -> np.ndarray:
+        """
+        Returns how often every seat finished first
+        in the finished games with the given number of players
+        """
+        seats = self.first_places()
+        seats = seats[(self.players == num_of_players) & (seats >= 0)]
+        if not len(seats):
+            return np.zeros(num_of_players)
+        return np.bincount(seats, minlength=num_of_players) / len(seats)
+
+    def first_player_advantage(self) -> float:
+        """
+        Returns how much more often the first seat finished first
+        than it would if every seat had the same chance
+        """
+        seats = self.first_places()
+        finished = seats >= 0
+        if not finished.any():
+            return 0.0
+        expected = 1 / self.players[finished]
+        return float(np.mean((seats[finished] == 0) - expected))
+
+    def __str__(self) -> str:
+        """Gives a summary of the archived games"""
+        specials = ', '.join(f'{name}: {count:.2f}' for name, count
+                             in self.special_card_frequencies().items())
+        turns = self.turns.mean() if self.games else 0.0
+        return (f'{self.games} games, {turns:.1f} turns on average\n'
+                f'First player advantage - '
+                f'{self.first_player_advantage():+.1%}\n'
+                f'Average penalty chain - '
+                f'{self.average_penalty_chain():.2f} cards\n'
+                f'Special cards per game - {specials}')
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='makao stats',
+        description='Reports statistics over binary game logs')
+    parser.add_argument('logs', nargs='+')
+    args = parser.parse_args(argv)
+    print(GameArchive.load(args.logs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+from game import Game
+from card import ALL_CARDS
+from card_stack import CardStack
+from deck import Deck
+from opponent import Opponent
+from player import Player
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+
+
+BASELINE_PATH = 'benchmark_baseline.json'
+# metrics where a lower number is better, every other one is a throughput
+LOWER_IS_BETTER = ('peak_kib', 'retained_blocks_per_turn')
+# the memory tracemalloc uses for itself is left out of the snapshots
+SNAPSHOT_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),)
+
+
+def bench_games(num_of_players: int, games: int, seed: int = 0,
+                max_turns: int = 2000) -> Dict[str, float]:
+    """
+    Plays headless games with only bots and returns how fast they went
+    and how much memory they needed. CPython keeps no count of every
+    allocation, so the peak memory of a game is reported together with
+    the memory blocks the games still hold after they were played,
+    per turn. Those only grow if the engine keeps what it no longer
+    needs, a negative number means the games ended holding less than
+    they were dealt with. Memory is measured in a second run so
+    tracing it does not slow down the timed one
+    """
+    tables = [Game.headless(num_of_players, seed=seed + index)
+              for index in range(games)]
+    start = time.perf_counter()
+    turns = sum(game.run(max_turns) for game in tables)
+    elapsed = time.perf_counter() - start
+
+    tables = [Game.headless(num_of_players, seed=seed + index)
+              for index in range(games)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    peak = 0
+    for game in tables:
+        tracemalloc.reset_peak()
+        game.run(max_turns)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    after = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff
+                 for stat in after.compare_to(before, 'filename'))
+
+    return {
+        'games_per_second': games / elapsed,
+        'turns_per_second': turns / elapsed,
+        'peak_kib': peak / 1024,
+        'retained_blocks_per_turn': blocks / max(turns, 1),
+    }
+
+
+def ops_per_second(function: Callable[[], int], repeat: int = 5) -> float:
+    """
+    Returns how many operations per second a function does at best,
+    the function returns the number of operations it did
+    """
+    operations = function()
+    best = min(timeit.repeat(function, repeat=repeat, number=1))
+    return operations / best
+
+
+def bench_is_valid_combo(size: int) -> float:
+    """Checks random one to three card combos on random top cards"""
+    rng = random.Random(1)
+    stacks = []
+    for _ in range(16):
+        stack = CardStack([rng.choice(ALL_CARDS)])
+        stacks.append(stack)
+    combos = [rng.sample(ALL_CARDS, rng.randint(1, 3)) for _ in range(size)]
+
+    def run() -> int:
+        for stack in stacks:
+            for combo in combos:
+                stack.is_valid_combo(combo)
+        return len(stacks) * len(combos)
+    return ops_per_second(run)
+
+
+def bench_remove_cards(size: int) -> float:
+    """Removes a card from a ten card hand and gives it back"""
+    player = Player('Bench', list(ALL_CARDS[:10]))
+    indexes = [[index % 10] for index in range(size)]
+
+    def run() -> int:
+        for moves in indexes:
+            player.add_card(player.remove_cards(moves)[0])
+        return len(indexes)
+    return ops_per_second(run)
+
+
+def bench_draw_card(size: int) -> float:
+    """Draws whole decks card by card"""
+    deck = Deck(CardStack([ALL_CARDS[0]]), random.Random(1))
+    rounds = max(size // 52, 1)
+
+    def run() -> int:
+        for _ in range(rounds):
+            deck.refresh_deck()
+            for _ in range(52):
+                deck.draw_card()
+        return rounds * 52
+    return ops_per_second(run)
+
+
+def bench_get_optimal_card(size: int) -> float:
+    """Picks a move for a seven card hand on different top cards"""
+    rng = random.Random(1)
+    opponent = Opponent('Bench', rng.sample(ALL_CARDS, 7), rng)
+    stacks = [CardStack([rng.choice(ALL_CARDS)]) for _ in range(size)]
+
+    def run() -> int:
+        for stack in stacks:
+            opponent.reset_said_makao()
+            opponent.get_optimal_card(stack)
+        return len(stacks)
+    return ops_per_second(run)
+
+
+def bench_card_str(size: int) -> float:
+    """Formats every card"""
+    rounds = max(size // 52, 1)
+
+    def run() -> int:
+        for _ in range(rounds):
+            for card in ALL_CARDS:
+                str(card)
+        return rounds * 52
+    return ops_per_second(run)
+
+
+MICROBENCHMARKS = {
+    'is_valid_combo': bench_is_valid_combo,
+    'remove_cards': bench_remove_cards,
+    'draw_card': bench_draw_card,
+    'get_optimal_card': bench_get_optimal_card,
+    'card_str': bench_card_str,
+}
+
+
+def run_suite(games: int = 50, size: int = 2000,
+              players: Sequence[int] = (2, 3, 4)) -> Dict[str, float]:
+    """Runs every benchmark and returns the results by name"""
+    results = {}
+    for num_of_players in players:
+        for name, value in bench_games(num_of_players, games).items():
+            results[f'games_{num_of_players}p.{name}'] = value
+    for name, bench in MICROBENCHMARKS.items():
+        results[f'micro.{name}.ops_per_second'] = bench(size)
+    return results
+
+
+def find_regressions(results: Dict[str, float], baseline: Dict[str, float],
+                     tolerance: float = 0.25) -> List[str]:
+    """
+    Returns a description of every result that is worse than its
+    baseline by more than the tolerance, a fraction of the baseline
+    """
+    regressions = []
+    for name, expected in baseline.items():
+        if name not in results or not expected:
+            continue
+        actual = results[name]
+        if name.rsplit('.', 1)[-1] in LOWER_IS_BETTER:
+            change = (actual - expected) / abs(expected)
+        else:
+            change = 1 - actual / expected
+        if change > tolerance:
+            regressions.append(f'{name}: {actual:.1f} against a baseline '
+                               f'of {expected:.1f} ({change:.0%} worse)')
+    return regressions
+
+
+def load_baseline(path: str) -> Optional[Dict[str, float]]:
+    """Returns the saved results, None if none were saved yet"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def save_baseline(path: str, results: Dict[str, float]) -> None:
+    """Saves the results as the baseline future runs are compared to"""
+    with open(path, 'w') as file:
+        json.dump({'python': sys.version.split()[0], 'results': results},
+                  file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='makao bench',
+        description='Measures the speed of the game engine and fails '
+                    'if it has become slower than the saved baseline')
+    parser.add_argument('--games', type=int, default=50,
+                        help='games played for every table size')
+    parser.add_argument('--size', type=int, default=2000,
+                        help='operations in every microbenchmark')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='fraction a result may be worse by')
+    parser.add_argument('--save', action='store_true',
+                        help='save the results as the new baseline')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.games, args.size)
+    for name, value in sorted(results.items()):
+        print(f'{name:45} {value:14.1f}')
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f'Saved the baseline to {args.baseline}')
+        return
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f'There is no baseline at {args.baseline}, '
+              f'run with --save to create one')
+        return
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,9 @@
 from enum import IntEnum
 from colorama import Fore, Style
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rules import RuleBook
 
 
 class InvalidSuitError(Exception):
@@ -19,28 +23,62 @@ class Suits(IntEnum):
     HEARTS = 4
 
 
+CARD_COUNT = 52
+
+# the values of the cards whose effects do not depend on the house rules
+ACE = 1
+JACK = 11
+QUEEN = 12
+KING = 13
+
+_SUIT_VALUES = frozenset(Suits)
+
+
 class Card:
     """
-    Class Card. Contains attributes:
+    Class Card. Every card exists only once and cannot be changed,
+    creating a card returns the shared instance. When several decks are
+    mixed together their copies of a card are that same instance, no rule
+    depends on which copy is played so copies are equal on purpose
+    and hands keep count of how many of them they hold.
+    Contains attributes:
 
     :param suit: The card's suit
     :type suit: int
 
     :param value: Card's value from Two to Ace (Ace.val = 1)
     :type value: int
+
+    :param code: The card's number from 0 to 51, ordered by suit and value
+    :type code: int
     """
-    def __init__(self, suit: int, value: int) -> None:
+    __slots__ = ('_suit', '_value', '_code')
+
+    def __new__(cls, suit: int, value: int) -> 'Card':
         """
-        Initialises the card class. Throws error if the card given is invalid
+        Returns the card with the given suit and value.
+        Throws error if the card given is invalid
         """
-        values = [value for value in Suits]
-        if suit not in values:
+        if suit not in _SUIT_VALUES:
             raise InvalidSuitError()
-        self._suit = suit
 
-        if value > 14 or value < 1:
+        if value > 13 or value < 1:
             raise ValueNotInRangeError()
-        self._value = value
+        return ALL_CARDS[(suit - 1) * 13 + value - 1]
+
+    @classmethod
+    def _create(cls, suit: int, value: int) -> 'Card':
+        """Creates the single instance of a card when the table is built"""
+        card = object.__new__(cls)
+        object.__setattr__(card, '_suit', Suits(suit))
+        object.__setattr__(card, '_value', value)
+        object.__setattr__(card, '_code', (suit - 1) * 13 + value - 1)
+        return card
+
+    @staticmethod
+    def from_code(code: int) -> 'Card':
+        """Returns the card with the given code"""
+        return ALL_CARDS[code]
 
     @property
     def suit(self) -> int:
@@ -50,23 +88,21 @@ class Card:
     def value(self) -> int:
         return self._value
 
-    def is_special(self) -> bool:
-        if self.value in [1, 2, 3, 4, 11, 12]:
-            return True
-        if self.value == 13 and self.suit in [Suits.HEARTS, Suits.SPADES]:
-            return True
-        return False
+    @property
+    def code(self) -> int:
+        return self._code
+
+    def is_special(self, rules: 'RuleBook') -> bool:
+        """Returns True if the card has an effect under the given rules"""
+        return rules.special[self._code]
 
-    def can_put_card(self, other: 'Card') -> bool:
+    def can_put_card(self, other: 'Card', rules: 'RuleBook') -> bool:
         """
         Returns True if this card can be put on the card given.
         Returns False otherwise
-        Follows the rules of the game
+        Follows the given rules of the game
         """
-        if (other.value == self.value or other.suit == self.suit
-           or self.value == 12 or other.value == 12):
-            return True
-        return False
+        return bool(rules.compatibility[other._code] >> self._code & 1)
 
     def __str__(self) -> str:
         """
@@ -81,7 +117,34 @@ class Card:
         return (f'{names[self.value - 2]}{color + suits[self.suit - 1]}'
                 + Style.RESET_ALL)
 
+    def __repr__(self) -> str:
+        return f'Card({self.suit.name}, {self.value})'
+
     def __eq__(self, other: 'Card') -> bool:
         """Checks if given cards are equal"""
-        return self.suit == other.suit and self.value == other.value
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self._code == other._code
+
+    def __hash__(self) -> int:
+        return self._code
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError('Cards cannot be changed')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError('Cards cannot be changed')
+
+    def __copy__(self) -> 'Card':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'Card':
+        return self
+
+    def __reduce__(self) -> tuple:
+        return (Card.from_code, (self._code,))
+
+
+ALL_CARDS = tuple(Card._create(suit, value)
+                  for suit in Suits for value in range(1, 14))
 
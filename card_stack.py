@@ -1,28 +1,22 @@
-from typing import List, Optional
-from card import Card, Suits
+from typing import Iterator, List, Optional
+from card import Card, Suits, ALL_CARDS, JACK
 from player import Player, Status
+from rules import Effect, RuleBook, STANDARD_RULES
 
 
-class KingOfSpadesException(Exception):
-    def __init__(self):
-        super().__init__('Someone has played the king of spades')
+SUIT_MASKS = {suit: sum(1 << card.code for card in ALL_CARDS
+                        if card.suit == suit) for suit in Suits}
 
-
-class AceException(Exception):
-    def __init__(self):
-        super().__init__('Someone has played an ace')
-
-
-class JackException(Exception):
-    def __init__(self):
-        super().__init__('Someone has played a jack')
+VALUE_MASKS = {value: sum(1 << card.code for card in ALL_CARDS
+                          if card.value == value) for value in range(1, 14)}
 
 
 class CardStack:
     """
     Class CardStack. Contains attributes:
 
-    :param cards: The cards on the card pile
+    :param cards: The cards on the card pile. The list is handed over to
+    the deck when it is recycled, copy it to keep the cards seen at a time
     :type cards: List['Card']
 
     :param forced_suit: The suit that is required to be played 
@@ -33,14 +27,22 @@ class CardStack:
     after the Jack special interaction
     :type forced_suit: int
 
+    :param rules: The compiled rules the cards on the stack follow
+    :type rules: 'RuleBook'
     """
-    def __init__(self, cards: Optional[List['Card']] = None) -> None:
-        """Initialises the CardStack class"""
+    def __init__(self, cards: Optional[List['Card']] = None,
+                 rules: 'RuleBook' = STANDARD_RULES) -> None:
+        """Initialises the CardStack class, by the standard rules if none"""
         if not cards:
             self._cards = []
         else:
             self._cards = cards
 
+        self._rules = rules
+        self._compatibility = rules.compatibility
+        self._statuses = rules.statuses
+        self._effects = rules.effects
+
         self._forced_suit = None
         self._forced_value = None
 
@@ -56,11 +58,19 @@ class CardStack:
     def forced_value(self) -> int:
         return self._forced_value
 
+    @property
+    def rules(self) -> 'RuleBook':
+        return self._rules
+
     @property
     def top_card(self) -> 'Card':
         """Returns the card at the top of the card stack"""
         return self.cards[-1]
 
+    def set_cards(self, cards: List['Card']) -> None:
+        """Replaces the cards on the stack, the last card is on top"""
+        self._cards = list(cards)
+
     def set_forced_suit(self, suit: int) -> None:
         """Forces a card becuase of the Ace interaction"""
         self._forced_suit = suit
@@ -77,86 +87,146 @@ class CardStack:
         """Resets the value after the Jack interaction"""
         self._forced_value = None
 
+    def legal_mask(self) -> int:
+        """
+        Returns the mask of every card that can start a combo
+        on the current top card, taking forced suits and values into account
+        """
+        top = self.top_card
+        if self._forced_suit is None and self._forced_value is None:
+            return self._compatibility[top.code]
+        if self._forced_suit is not None:
+            return (VALUE_MASKS[top.value]
+                    | SUIT_MASKS.get(self._forced_suit, 0))
+        mask = VALUE_MASKS.get(self._forced_value, 0)
+        if top.value == JACK:
+            mask |= VALUE_MASKS[JACK]
+        return mask
+
+    def legal_cards(self, hand_mask: int) -> int:
+        """Returns the mask of the cards in a hand that can be played"""
+        return self.legal_mask() & hand_mask
+
     def is_valid_combo(self, cards: List['Card']) -> bool:
         """
         Checks if the given card sequence is valid 
         according to the rules of makao
         """
-        for index, card in enumerate(cards):
-            if index == 0:
-                if self.forced_suit is None and self.forced_value is None:
-                    if not card.can_put_card(self.top_card):
-                        return False
-                else:
-                    if self.forced_suit is not None:
-                        if card.value == self.top_card.value:
-                            continue
-                        if card.suit != self.forced_suit:
-                            return False
-                    else:
-                        if not (card.value == self.forced_value or
-                                (card.value == self.top_card.value and
-                                 card.value == 11)):
-                            return False
-
-            else:
-                if not card.can_put_card(cards[index-1]):
-                    return False
-
+        if not cards:
+            return True
+        if not self.legal_mask() >> cards[0].code & 1:
+            return False
+        compatibility = self._compatibility
+        for index in range(1, len(cards)):
+            if not (compatibility[cards[index-1].code]
+                    >> cards[index].code & 1):
+                return False
         return True
 
+    def generate_combos(self, hand: List['Card'],
+                        max_length: Optional[int] = None
+                        ) -> Iterator[List[int]]:
+        """
+        Lazily yields the hand indexes of every valid card sequence
+        Sequences that use the same cards and end on the same card
+        lead to the same position, so only the first of them is yielded
+        and the search does not continue past the others
+        """
+        if max_length is None:
+            max_length = len(hand)
+        codes = [card.code for card in hand]
+        first_mask = self.legal_mask()
+        seen = set()
+        pending = [([], 0, 0, first_mask)]
+        while pending:
+            chain, used, key, mask = pending.pop()
+            tried = 0
+            children = []
+            for index, code in enumerate(codes):
+                bit = 1 << code
+                if not mask & bit or tried & bit or used >> index & 1:
+                    continue
+                tried |= bit
+                new_key = key + (1 << 4 * code)
+                if (new_key, code) in seen:
+                    continue
+                seen.add((new_key, code))
+                new_chain = chain + [index]
+                yield new_chain
+                if len(new_chain) < max_length:
+                    children.append((new_chain, used | 1 << index, new_key,
+                                     self._compatibility[code]))
+            pending.extend(reversed(children))
+
     def __str__(self) -> str:
         """Gives a brief description of the card on top of the stack"""
         return f'The card at the top is {self.top_card}'
 
-    def remove_bottom_cards(self) -> None:
-        """Removes all the bottom cards after the deck has ran out"""
-        removed = self.cards[0:-1]
-        self._cards = self.cards[-1:]
-        return removed
+    def recycle_bottom_cards(self, spare: List['Card']) -> List['Card']:
+        """
+        Hands over all the bottom cards after the deck has ran out.
+        No cards are copied, the stack's list is given away
+        and the top card is moved to the empty spare list
+        Returns an empty list if there are no cards under the top card
+        """
+        if len(self._cards) < 2:
+            return []
+        bottom = self._cards
+        spare.clear()
+        spare.append(bottom.pop())
+        self._cards = spare
+        return bottom
 
     def add_cards_on_top(self, cards: List['Card'],
                          prev_player: 'Player' = None,
                          next_player: 'Player' = None,
-                         all_players: List['Player'] = None) -> None:
-
-        """Adds a card on top of the card stack"""
+                         all_players: List['Player'] = None
+                         ) -> List['Effect']:
+        """
+        Adds cards on top of the card stack, triggering the effect
+        of every one of them. Returns every decision the cards leave
+        to be made, each once in the order they were played.
+        An ace covered by a later card leaves no suit to choose
+        """
+        effects = []
         for card in cards:
             self._cards.append(card)
             if self.forced_suit is not None:
                 self.reset_forced_suit()
-            self.trigger_top_effect(prev_player, next_player, all_players)
+            effect = self.trigger_top_effect(prev_player, next_player,
+                                             all_players)
+            if effect != Effect.NONE and effect not in effects:
+                effects.append(effect)
+        if (Effect.ACE in effects
+                and self._effects[self._cards[-1].code] != Effect.ACE):
+            effects.remove(Effect.ACE)
+        return effects
 
     def trigger_top_effect(self, prev_player: 'Player',
                            next_player: 'Player',
-                           all_players: List['Player']) -> None:
+                           all_players: List['Player']) -> 'Effect':
         """
         Triggers the effect special effect of a card
-        based on the rules of makao
+        looked up in the stack's rules
+        Returns the decision the card leaves to be made
         """
         if prev_player is None or next_player is None:
-            return
+            return Effect.NONE
 
-        card = self.top_card
-
-        if card.value == 2 or card.value == 3:
-            next_player.set_status_effect(Status.DRAW2OR3)
-            next_player.increase_cards_to_draw(card.value)
-        elif card.value == 4:
-            next_player.set_status_effect(Status.BLOCKED)
-            next_player.increase_block()
-        elif card.value == 11:
+        code = self._cards[-1].code
+        status = self._statuses[code]
+        if status == Status.NOEFFECT:
+            return self._effects[code]
+        if status == Status.FORCESUIT:
             for player in all_players:
                 if not player.won:
                     player.set_status_effect(Status.FORCESUIT)
-            raise JackException
-        elif card.value == 13:
-            if card.suit == Suits.SPADES:
-                prev_player.set_status_effect(Status.DRAW5)
-                prev_player.increase_cards_to_draw(5)
-                raise KingOfSpadesException
-            elif card.suit == Suits.HEARTS:
-                next_player.set_status_effect(Status.DRAW5)
-                next_player.increase_cards_to_draw(5)
-        elif card.value == 1:
-            raise AceException
+        else:
+            target = (prev_player if self._rules.backward[code]
+                      else next_player)
+            target.set_status_effect(status)
+            if status == Status.BLOCKED:
+                target.increase_block()
+            else:
+                target.increase_cards_to_draw(self._rules.draws[code])
+        return self._effects[code]
@@ -0,0 +1,311 @@
+from card import Card
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from concurrent.futures import CancelledError
+from abc import ABC, abstractmethod
+import asyncio
+import sys
+
+if TYPE_CHECKING:
+    from game import Game
+    from player import Player
+
+
+class InvalidDecisionError(Exception):
+    def __init__(self, message: str = 'The decision cannot be used'):
+        super().__init__(message)
+
+
+class PlayerController(ABC):
+    """
+    Class PlayerController. Makes all the decisions for a single seat.
+    Every method receives the game and the player it decides for
+    """
+    @abstractmethod
+    def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        """
+        Returns the indexes of the cards the player wants to play
+        The index equal to the size of the hand means a pass
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        """Returns the suit picked after the player has played an ace"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        """Returns the value picked after the player has played a jack"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_first_save(self, game: 'Game', player: 'Player',
+                       card: 'Card') -> int:
+        """Returns 1 if the player wants to play the card they just drew"""
+        raise NotImplementedError
+
+
+class HumanController(PlayerController):
+    """
+    Class HumanController. Asks the person at the terminal for every decision
+    """
+    def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        sentence = game.ask_player_input(player)
+        sequence = input(sentence).split(' ')
+        if sequence[-1] in ['MAKAO', 'STOP']:
+            game.handle_special_inputs(player, sequence[-1])
+            sequence.pop()
+        return [int(card) - 1 for card in sequence]
+
+    def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        prompt = f'Pick a suit: \n{game.get_suits_description()}'
+        suit = input(prompt)
+        while suit not in ['1', '2', '3', '4']:
+            suit = input(f'There is no such suit. {prompt}')
+        return int(suit)
+
+    def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        prompt = (f'Pick a value to force '
+                  f'({game.rules.describe_demands()}): ')
+        demands = [str(value) for value in game.rules.jack_demands]
+        value = input(prompt)
+        while value not in demands:
+            value = input(f'This value cannot be forced. {prompt}')
+        return int(value)
+
+    def get_first_save(self, game: 'Game', player: 'Player',
+                       card: 'Card') -> int:
+        ans = input(f'You drew a {card}. Play it? (y/n): ')
+        return 1 if ans == 'y' else 0
+
+
+class OpponentController(PlayerController):
+    """
+    Class OpponentController. Uses the Opponent heuristics for every decision
+    """
+    def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        return [player.get_optimal_card(game.stack)]
+
+    def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        return player.get_optimal_suit()
+
+    def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        return player.get_optimal_value(game.rules.jack_demands)
+
+    def get_first_save(self, game: 'Game', player: 'Player',
+                       card: 'Card') -> int:
+        return 1
+
+
+class PassController(PlayerController):
+    """
+    Class PassController. The default action for a seat that did not
+    decide in time. Passes every turn and picks the suit and value
+    it holds the most of, like the Opponent heuristics
+    """
+    def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        return [len(player.hand)]
+
+    def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        return max(range(1, 5), key=player.count_suit)
+
+    def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        return max(game.rules.jack_demands, key=player.count_value)
+
+    def get_first_save(self, game: 'Game', player: 'Player',
+                       card: 'Card') -> int:
+        return 0
+
+
+class AsyncPlayerController(ABC):
+    """
+    Class AsyncPlayerController. Makes all the decisions for a single seat
+    like PlayerController does, but every decision is awaited.
+    Throws InvalidDecisionError or ConnectionError if it cannot decide
+    """
+    @abstractmethod
+    async def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        """
+        Returns the indexes of the cards the player wants to play
+        The index equal to the size of the hand means a pass
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        """Returns the suit picked after the player has played an ace"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        """Returns the value picked after the player has played a jack"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_first_save(self, game: 'Game', player: 'Player',
+                             card: 'Card') -> int:
+        """Returns 1 if the player wants to play the card they just drew"""
+        raise NotImplementedError
+
+
+class AsyncAdapter(AsyncPlayerController):
+    """
+    Class AsyncAdapter. Lets a controller that decides straight away,
+    like the bots, be awaited the same way as the others
+    """
+    def __init__(self, controller: 'PlayerController') -> None:
+        """Initialises the AsyncAdapter class"""
+        self._controller = controller
+
+    async def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        return self._controller.get_moves(game, player)
+
+    async def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        return self._controller.get_ace_suit(game, player)
+
+    async def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        return self._controller.get_jack_value(game, player)
+
+    async def get_first_save(self, game: 'Game', player: 'Player',
+                             card: 'Card') -> int:
+        return self._controller.get_first_save(game, player, card)
+
+
+class AsyncHumanController(AsyncPlayerController):
+    """
+    Class AsyncHumanController. Asks the person at the terminal for every
+    decision, reading the terminal without blocking the event loop
+    so a decision can be given up on when its time runs out
+    """
+    def __init__(self) -> None:
+        """Initialises the AsyncHumanController class"""
+        self._reader = None
+
+    async def read_line(self, prompt: str) -> str:
+        """Shows the prompt and waits for the next line typed"""
+        if self._reader is None:
+            self._reader = asyncio.StreamReader()
+            await asyncio.get_running_loop().connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(self._reader),
+                sys.stdin)
+        print(prompt, end='', flush=True)
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError('The terminal has been closed')
+        return line.decode().strip()
+
+    async def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        sequence = (await self.read_line(
+            game.ask_player_input(player))).split(' ')
+        if sequence[-1] in ['MAKAO', 'STOP']:
+            game.handle_special_inputs(player, sequence[-1])
+            sequence.pop()
+        return [int(card) - 1 for card in sequence]
+
+    async def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        suits_string = game.get_suits_description()
+        suit = await self.read_line(f'Pick a suit: \n{suits_string}')
+        if suit not in ['1', '2', '3', '4']:
+            raise InvalidDecisionError('There is no such suit')
+        return int(suit)
+
+    async def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        value = await self.read_line(f'Pick a value to force '
+                                     f'({game.rules.describe_demands()}): ')
+        if value not in [str(value) for value in game.rules.jack_demands]:
+            raise InvalidDecisionError('This value cannot be forced')
+        return int(value)
+
+    async def get_first_save(self, game: 'Game', player: 'Player',
+                             card: 'Card') -> int:
+        ans = await self.read_line(f'You drew a {card}. Play it? (y/n): ')
+        return 1 if ans == 'y' else 0
+
+
+class TimedController(PlayerController):
+    """
+    Class TimedController. Lets a game that is played synchronously wait
+    for an AsyncPlayerController. Every decision has a time limit and the
+    fallback controller decides instead once it runs out, or if the
+    controller could not decide. Without an event loop the controller
+    runs its own, with one the game has to be played in another thread.
+    Contains attributes:
+
+    :param controller: The controller making the decisions
+    :type controller: 'AsyncPlayerController'
+
+    :param timeout: The seconds every decision may take, None for no limit
+    :type timeout: Optional[float]
+
+    :param timeouts: The seconds for single decisions, by method name
+    :type timeouts: Dict[str, Optional[float]]
+
+    :param fallback: The controller used when a decision is not made
+    :type fallback: 'PlayerController'
+    """
+    def __init__(self, controller: 'AsyncPlayerController',
+                 timeout: Optional[float] = None,
+                 timeouts: Optional[Dict[str, Optional[float]]] = None,
+                 fallback: Optional['PlayerController'] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Initialises the TimedController class"""
+        self._controller = controller
+        self._timeout = timeout
+        self._timeouts = dict(timeouts) if timeouts is not None else {}
+        self._fallback = fallback if fallback is not None else (
+            PassController())
+        self._loop = loop
+        self._own_loop = None
+        self._timed_out = 0
+
+    @property
+    def controller(self) -> 'AsyncPlayerController':
+        return self._controller
+
+    @property
+    def timed_out(self) -> int:
+        return self._timed_out
+
+    def timeout_for(self, decision: str) -> Optional[float]:
+        """Returns the time limit of a decision"""
+        return self._timeouts.get(decision, self._timeout)
+
+    def decide(self, decision: str, *args) -> Any:
+        """
+        Waits for a decision of the controller
+        Returns the fallback's decision if it is not made in time
+        """
+        waiting = asyncio.wait_for(
+            getattr(self._controller, decision)(*args),
+            self.timeout_for(decision))
+        try:
+            if self._loop is not None:
+                return asyncio.run_coroutine_threadsafe(
+                    waiting, self._loop).result()
+            if self._own_loop is None:
+                self._own_loop = asyncio.new_event_loop()
+            return self._own_loop.run_until_complete(waiting)
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+        except (ConnectionError, InvalidDecisionError, CancelledError):
+            pass
+        return getattr(self._fallback, decision)(*args)
+
+    def close(self) -> None:
+        """Closes the event loop the controller ran on its own"""
+        if self._own_loop is not None:
+            self._own_loop.close()
+            self._own_loop = None
+
+    def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        return self.decide('get_moves', game, player)
+
+    def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        return self.decide('get_ace_suit', game, player)
+
+    def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        return self.decide('get_jack_value', game, player)
+
+    def get_first_save(self, game: 'Game', player: 'Player',
+                       card: 'Card') -> int:
+        return self.decide('get_first_save', game, player, card)
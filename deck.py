@@ -1,6 +1,6 @@
-from card import Card, Suits
+from card import Card, ALL_CARDS
 from card_stack import CardStack
-from typing import List
+from typing import List, Optional
 import random
 
 
@@ -14,40 +14,86 @@ class Deck:
     Class Deck. Contains attributes:
 
     :param cards: Cards that are currently in the deck. Starts with 52 cards
+    for every deck mixed in, copies of a card are the same instance.
+    Recycling swaps the lists of the deck and the card stack, so a list
+    taken from here may later hold the stack's cards, copy it to keep
+    the cards seen at a time
     :type cards: List[Card]
 
     :param card_stack: The stack that is bound to this deck
     :type card_stack: 'CardStack'
+
+    :param rng: The random number generator used for shuffling
+    :type rng: random.Random
+
+    :param num_of_decks: The number of 52 card decks mixed together
+    :type num_of_decks: int
     """
-    def __init__(self, card_stack: CardStack) -> None:
-        """Initialises the Deck Class with 52 cards in it"""
-        self._cards = []
+    def __init__(self, card_stack: CardStack,
+                 rng: Optional[random.Random] = None,
+                 num_of_decks: int = 1) -> None:
+        """Initialises the Deck Class with 52 cards for every deck"""
         self._card_stack = card_stack
-        for suit in Suits:
-            for value in range(1, 14):
-                self._cards.append(Card(suit, value))
+        self._rng = rng if rng is not None else random.Random()
+        self._num_of_decks = num_of_decks
+        self._cards = list(ALL_CARDS) * num_of_decks
 
     @property
     def cards(self) -> List[Card]:
         return self._cards
 
+    @property
+    def num_of_decks(self) -> int:
+        return self._num_of_decks
+
+    @property
+    def rng(self) -> random.Random:
+        return self._rng
+
+    def set_cards(self, cards: List[Card]) -> None:
+        """Replaces the cards in the deck, the last card is on top"""
+        self._cards = list(cards)
+
     def shuffle_deck(self) -> None:
         """Shuffles the deck randomly"""
-        random.shuffle(self._cards)
+        self._rng.shuffle(self._cards)
+
+    def recycle(self) -> None:
+        """
+        Turns the cards under the top of the card stack into the deck
+        and shuffles them, the lists of the deck and the stack
+        swap places so no cards are copied
+        """
+        self._cards = self._card_stack.recycle_bottom_cards(self._cards)
+        self.shuffle_deck()
 
     def draw_card(self) -> 'Card':
         """Removes the card from top of the deck and returns it"""
-        if len(self._cards) == 0:
-            self._cards = self._card_stack.remove_bottom_cards()
-            self.shuffle_deck()
-        if len(self._cards) == 0:
-            raise EmptyDeckError
-        else:
-            return self._cards.pop()
+        if not self._cards:
+            self.recycle()
+            if not self._cards:
+                raise EmptyDeckError
+        return self._cards.pop()
+
+    def draw_cards(self, count: int) -> List['Card']:
+        """
+        Removes up to count cards from the top of the deck and returns
+        them in the order draw_card would. Returns fewer cards if
+        the deck and the card stack have ran out
+        """
+        drawn = []
+        while len(drawn) < count:
+            if not self._cards:
+                self.recycle()
+                if not self._cards:
+                    break
+            start = max(len(self._cards) - (count - len(drawn)), 0)
+            taken = self._cards[start:]
+            del self._cards[start:]
+            taken.reverse()
+            drawn += taken
+        return drawn
 
     def refresh_deck(self) -> None:
         """Resets the deck's cards to their base state"""
-        self._cards = []
-        for suit in Suits:
-            for value in range(1, 14):
-                self._cards.append(Card(suit, value))
+        self._cards = list(ALL_CARDS) * self._num_of_decks
@@ -0,0 +1,80 @@
+from enum import IntEnum
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class EventType(IntEnum):
+    CARD_PLAYED = 1
+    PASS = 2
+    DRAW = 3
+    BLOCK = 4
+    SUIT_FORCED = 5
+    VALUE_FORCED = 6
+    MAKAO = 7
+    STOP = 8
+    PLAYER_WON = 9
+    MOVE = 10
+    FIRST_SAVE = 11
+    MAKAO_PENALTY = 12
+
+
+class Event(NamedTuple):
+    """
+    A single thing that happened during a game
+
+    :param type: What happened
+    :type type: EventType
+
+    :param turn: The turn it happened in
+    :type turn: int
+
+    :param seat: The seat of the player it happened to
+    :type seat: int
+
+    :param cards: The codes of the cards that were played or drawn,
+    for a move the indexes of the cards the player picked from their hand
+    :type cards: Tuple[int]
+
+    :param value: The number of cards drawn, the turns blocked,
+    the forced suit or value, the place of a winner, 1 if a move was made
+    after saying makao or 1 if the player chose to play a saved card
+    :type value: int
+    """
+    type: EventType
+    turn: int
+    seat: int
+    cards: Tuple[int, ...] = ()
+    value: int = 0
+
+
+class EventBus:
+    """
+    Class EventBus. Passes events on to the subscribers that asked
+    for their type. Events nobody asked for are never created
+    """
+    def __init__(self) -> None:
+        """Initialises the EventBus class"""
+        self._subscribers: Dict[EventType, List[Callable]] = {
+            event_type: [] for event_type in EventType}
+
+    def subscribe(self, callback: Callable[[Event], None],
+                  event_types: Optional[Iterable[EventType]] = None) -> None:
+        """Calls the callback with every event of the given types"""
+        if event_types is None:
+            event_types = EventType
+        for event_type in event_types:
+            self._subscribers[event_type].append(callback)
+
+    def unsubscribe(self, callback: Callable[[Event], None]) -> None:
+        """Stops sending events to the callback"""
+        for subscribers in self._subscribers.values():
+            while callback in subscribers:
+                subscribers.remove(callback)
+
+    def wants(self, event_type: EventType) -> bool:
+        """Checks if anyone is subscribed to the event type"""
+        return bool(self._subscribers[event_type])
+
+    def publish(self, event: Event) -> None:
+        """Sends the event to everyone subscribed to its type"""
+        for callback in self._subscribers[event.type]:
+            callback(event)
@@ -1,35 +1,49 @@
 from card_stack import CardStack
-from card import Card
-from card_stack import KingOfSpadesException, AceException, JackException
+from card import Card, CARD_COUNT, JACK
+from rules import Effect, Rules, RuleBook, compile_rules
 from opponent import Opponent
-from player import Player, Status, WrongCardIndexError
+from player import Player, Status
 from main_player import MainPlayer
-from deck import Deck, EmptyDeckError
-from typing import List
-from card import Suits
+from deck import Deck
+from controller import PlayerController, HumanController, OpponentController
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from collections import deque
+from game_state import GameState
+from seat_ring import SeatRing
+from events import Event, EventBus, EventType
+from renderer import (Renderer, NullRenderer, TerminalRenderer,
+                      ProfiledRenderer, SUIT_SYMBOLS)
+from profiler import PhaseProfiler
 from colorama import Fore, Style
-import os
-import sys
+import random
 
 
-class InvalidOppNumError(Exception):
-    def __init__(self):
-        super().__init__("The number of opponents has to be between 1 and 3.")
+# the most opponents at a table and the most players sharing a deck
+MAX_OPPONENTS = 11
+PLAYERS_PER_DECK = 4
 
-
-class InvalidMoveError(Exception):
-    def __init__(self):
-        super().__init__("This is not a valid move.")
+# the methods of a game timed by a profiler and the phases they belong to
+PROFILED_METHODS = {
+    'handle_turn': 'turn',
+    'prepare_special_turn': 'special_turn',
+    'get_player_input': 'input',
+    'get_player_ace_suit': 'decision',
+    'get_player_jack_card': 'decision',
+    'get_player_first_save_input': 'decision',
+    'check_moves': 'validation',
+    'player_draw_cards': 'draw',
+}
 
 
-class InvalidTopCardError(Exception):
-    def __init__(self):
-        super().__init__("You cannot put this card on top of the card stack.")
+def decks_needed(num_of_players: int) -> int:
+    """Returns the number of decks mixed together for a table"""
+    return -(-num_of_players // PLAYERS_PER_DECK)
 
 
-class InvalidStatusTransferError(Exception):
+class InvalidOppNumError(Exception):
     def __init__(self):
-        super().__init__("You cannot play this card.")
+        super().__init__(f"The number of opponents has to be "
+                         f"between 1 and {MAX_OPPONENTS}.")
 
 
 class Game:
@@ -50,26 +64,87 @@ class Game:
 
     :param winners: The players who have won the game
     :type winners: List['Player']
+
+    :param main_player: The player sitting at the terminal,
+    None if every seat is played by a bot
+    :type main_player: 'MainPlayer'
+
+    :param controllers: The controllers making decisions for each seat
+    :type controllers: List['PlayerController']
+
+    :param seed: The seed of the game's random number generator
+    :type seed: int
+
+    :param renderer: Shows the game to whoever is watching it
+    :type renderer: 'Renderer'
+
+    :param rules: The house rules compiled into lookup tables
+    :type rules: 'RuleBook'
+
+    :param profiler: Times the phases of every turn, None if it is not timed
+    :type profiler: 'PhaseProfiler'
     """
-    def __init__(self, player_name: str, num_of_opponets: int) -> None:
+    def __init__(self, player_name: Optional[str], num_of_opponets: int,
+                 controllers: Optional[List['PlayerController']] = None,
+                 start: bool = True, seed: Optional[int] = None,
+                 renderer: Optional['Renderer'] = None,
+                 num_of_decks: Optional[int] = None,
+                 profiler: Optional['PhaseProfiler'] = None,
+                 rules: Optional['Rules'] = None) -> None:
         """
-        Initialises the Game class
-        Throws error if the given nubmer of opponents is invalid
+        Initialises the Game class and deals the cards
+        Starts playing straight away unless start is False
+        Without a player name every seat is taken by an opponent
+        A random seed is picked if none is given
+        Without a number of decks one deck is used for every four players
+        With a profiler every turn played is timed by it
+        Without rules the standard rules are played
+        Throws error if the given nubmer of opponents is invalid,
+        there are not enough cards to deal or the rules are not consistent
         """
-        if num_of_opponets < 1 or num_of_opponets > 3:
+        if num_of_opponets < 1 or num_of_opponets > MAX_OPPONENTS:
             raise InvalidOppNumError()
+        if num_of_decks is None:
+            num_of_decks = decks_needed(num_of_opponets + 1)
+        if (num_of_decks < 1
+                or (num_of_opponets + 1) * 5 >= num_of_decks * CARD_COUNT):
+            raise ValueError('There are not enough cards to deal')
 
-        self._players = []
-        self._main_player = MainPlayer(player_name)
-        self._players.append(self._main_player)
-        for i in range(num_of_opponets):
-            self._players.append(Opponent(f'Player{i+1}'))
+        self._rules = compile_rules(rules if rules is not None else Rules())
 
-        self._stack = CardStack()
-        self._deck = Deck(self._stack)
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self._seed = seed
+        self._rng = random.Random(seed)
+        deck_rng = self.spawn_rng()
 
-        while self._deck.cards[-1].is_special() is True:
+        self._players = []
+        self._main_player = None
+        if player_name is not None:
+            self._main_player = MainPlayer(player_name)
+            self._players.append(self._main_player)
+        for i in range(num_of_opponets + 1 - len(self._players)):
+            self._players.append(Opponent(f'Player{i+1}',
+                                          rng=self.spawn_rng()))
+
+        if controllers is None:
+            controllers = [self.default_controller(player)
+                           for player in self._players]
+        if len(controllers) != len(self._players):
+            raise ValueError('Every seat needs exactly one controller')
+        self._controllers = dict(zip(self._players, controllers))
+        self._ring = SeatRing(self._players)
+        if renderer is None:
+            renderer = (TerminalRenderer(self._main_player)
+                        if self._main_player is not None else NullRenderer())
+        self._renderer = renderer
+
+        self._stack = CardStack(rules=self._rules)
+        self._deck = Deck(self._stack, deck_rng, num_of_decks)
+
+        while self._deck.cards[-1].is_special(self._rules) is True:
             self._deck.shuffle_deck()
+        self._initial_deck = tuple(card.code for card in self._deck.cards)
 
         self._stack.add_cards_on_top([self._deck.draw_card()])
         for i in range(5):
@@ -77,9 +152,29 @@ class Game:
                 player.add_card(self._deck.draw_card())
 
         self._winners = []
+        self._events = EventBus()
 
         self._turn_num = 0
-        self.handle_turn()
+        self._profiler = None
+        if profiler is not None:
+            self.enable_profiling(profiler)
+        if start:
+            self.run()
+
+    @classmethod
+    def headless(cls, num_of_players: int,
+                 controllers: Optional[List['PlayerController']] = None,
+                 seed: Optional[int] = None,
+                 num_of_decks: Optional[int] = None,
+                 profiler: Optional['PhaseProfiler'] = None,
+                 rules: Optional['Rules'] = None) -> 'Game':
+        """
+        Returns a dealt game played only by opponents
+        The game does not start until step or run is called
+        """
+        return cls(None, num_of_players - 1, controllers,
+                   start=False, seed=seed, num_of_decks=num_of_decks,
+                   profiler=profiler, rules=rules)
 
     @property
     def players(self) -> List['Player']:
@@ -105,6 +200,127 @@ class Game:
     def winners(self) -> List['Player']:
         return self._winners
 
+    @property
+    def renderer(self) -> 'Renderer':
+        return self._renderer
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @property
+    def rng(self) -> random.Random:
+        return self._rng
+
+    @property
+    def initial_deck(self) -> Tuple[int, ...]:
+        return self._initial_deck
+
+    @property
+    def events(self) -> 'EventBus':
+        return self._events
+
+    @property
+    def rules(self) -> 'RuleBook':
+        return self._rules
+
+    @property
+    def profiler(self) -> Optional['PhaseProfiler']:
+        return self._profiler
+
+    @property
+    def controllers(self) -> List['PlayerController']:
+        return [self._controllers[player] for player in self.players]
+
+    @staticmethod
+    def default_controller(player: 'Player') -> 'PlayerController':
+        """Returns the controller used for a player if none was given"""
+        if isinstance(player, MainPlayer):
+            return HumanController()
+        return OpponentController()
+
+    def spawn_rng(self) -> random.Random:
+        """
+        Returns a new generator seeded from the game's generator
+        so that every part of the game draws from its own stream
+        """
+        return random.Random(self._rng.getrandbits(64))
+
+    def get_controller(self, player: 'Player') -> 'PlayerController':
+        """Returns the controller making decisions for a player"""
+        return self._controllers[player]
+
+    def set_controller(self, player: 'Player',
+                       controller: 'PlayerController') -> None:
+        """Hands a player's decisions over to another controller"""
+        self._controllers[player] = controller
+
+    def enable_profiling(self, profiler: Optional['PhaseProfiler'] = None
+                         ) -> 'PhaseProfiler':
+        """
+        Starts timing the phases of every turn and returns the profiler.
+        The timed methods are replaced on this game and its stack only
+        and the renderer is shown through a ProfiledRenderer until
+        profiling stops, so a game that is not profiled runs
+        exactly the same code as before
+        """
+        self.disable_profiling()
+        if profiler is None:
+            profiler = PhaseProfiler()
+        for name, phase in PROFILED_METHODS.items():
+            setattr(self, name, profiler.wrap(phase, getattr(self, name)))
+        self._stack.add_cards_on_top = profiler.wrap(
+            'effects', self._stack.add_cards_on_top)
+        self._renderer = ProfiledRenderer(self._renderer, profiler)
+        self._profiler = profiler
+        return profiler
+
+    def disable_profiling(self) -> Optional['PhaseProfiler']:
+        """Stops timing the turns and returns the profiler that timed them"""
+        profiler = self._profiler
+        if profiler is None:
+            return None
+        for name in PROFILED_METHODS:
+            del self.__dict__[name]
+        del self._stack.__dict__['add_cards_on_top']
+        self._renderer = self._renderer.renderer
+        self._profiler = None
+        return profiler
+
+    def snapshot(self) -> 'GameState':
+        """Returns an immutable copy of the game's current state"""
+        return GameState(
+            tuple(player.get_state() for player in self.players),
+            tuple(self.deck.cards), tuple(self.stack.cards),
+            self.stack.forced_suit, self.stack.forced_value, self.turn_num,
+            tuple(self.get_player_index(player) for player in self.winners))
+
+    def restore(self, state: 'GameState') -> None:
+        """
+        Brings the game back to a state returned by snapshot
+        The state has to come from a game with the same number of seats
+        """
+        for player, player_state in zip(self.players, state.players):
+            player.set_state(player_state)
+        self.deck.set_cards(state.deck)
+        self.stack.set_cards(state.stack)
+        self.stack.set_forced_suit(state.forced_suit)
+        self.stack.set_forced_value(state.forced_value)
+        self._turn_num = state.turn_num
+        self._winners = [self.players[seat] for seat in state.winners]
+
+    def clone(self, controllers: List['PlayerController']) -> 'Game':
+        """
+        Returns an independent copy of the game in its current state
+        played by the given controllers. Every seat of the copy is
+        an opponent so nothing in it is ever displayed
+        """
+        copy = Game.headless(len(self.players), controllers, self._seed,
+                             self.deck.num_of_decks,
+                             rules=self._rules.rules)
+        copy.restore(self.snapshot())
+        return copy
+
     def increment_turn(self) -> None:
         """Increments the turn counter by one"""
         self._turn_num += 1
@@ -115,9 +331,7 @@ class Game:
 
     def get_player_index(self, player: 'Player') -> int:
         """Returns the player's index based on an object"""
-        for index, plr in enumerate(self.players):
-            if player == plr:
-                return index
+        return self._ring.seat_of(player)
 
     def left_of_player(self, player: 'Player') -> 'Player':
         """Returns the player left of a given player"""
@@ -129,11 +343,8 @@ class Game:
         Returns the previous player ignoring blocked players
         and players who have won
         """
-        prev = self.left_of_player(player)
-        while prev.status_effect == Status.BLOCKED or prev.won:
-            index = self.players.index(prev)
-            prev = self.players[(index - 1) % len(self.players)]
-        return prev
+        return self.players[self._ring.prev_seat(
+            self.get_player_index(player))]
 
     def right_of_player(self, player: 'Player') -> 'Player':
         """Returns the player right of a given player"""
@@ -145,21 +356,43 @@ class Game:
         Returns the next player ignoring blocked player
         and players who have won
         """
-        next = self.right_of_player(player)
-        while next.status_effect == Status.BLOCKED or next.won:
-            index = self.players.index(next)
-            next = self.players[(index + 1) % len(self.players)]
-        return next
+        return self.players[self._ring.next_seat(
+            self.get_player_index(player))]
+
+    def is_finished(self) -> bool:
+        """Returns True once all but one of the players have won"""
+        return len(self.winners) >= len(self.players) - 1
+
+    def step(self) -> bool:
+        """
+        Plays a single turn of the game
+        Returns False if the game has finished and there is nothing to play
+        """
+        if self.is_finished():
+            return False
+        self.handle_turn()
+        if self.is_finished():
+            self.finish_game()
+            return False
+        return True
+
+    def run(self, max_turns: Optional[int] = None) -> int:
+        """
+        Plays turns until the game finishes or max_turns have been played
+        Returns the number of turns that were played
+        """
+        played = 0
+        while max_turns is None or played < max_turns:
+            if not self.step():
+                break
+            played += 1
+        return played
 
     def handle_turn(self) -> None:
         """
         Does all the chcecks to decide on any special turns
         Reverts all turn-specific interactions after the turn is finished
         """
-        if len(self.winners) == len(self.players) - 1:
-            self.finish_game()
-            return
-
         player = self.get_current_player()
 
         if player.won:
@@ -171,13 +404,13 @@ class Game:
         if player.status_effect != Status.NOEFFECT:
             self.prepare_special_turn(player)
 
-        if isinstance(player, MainPlayer):
+        if player is self.main_player:
             clear_messages = True
 
         self.handle_player_turn(player)
 
-        if (self.stack.top_card.suit == Suits.SPADES and
-           self.stack.top_card.value == 13):
+        if (self._rules.effects[self.stack.top_card.code]
+                == Effect.KING_OF_SPADES):
             clear_messages = False
 
         if player.blocked_turns > 0:
@@ -196,61 +429,65 @@ class Game:
 
     def handle_player_turn(self, player: 'Player') -> None:
         """A basic turn with no special effects"""
+        moves = self.ask_for_moves(player)
+        if player.allowed_cards != []:
+            self.handle_effect_turn(player, moves)
+        elif len(moves) == 1 and moves[0] == len(player.hand):
+            self.handle_pass(player)
+        else:
+            self.handle_regular_turn(player, moves)
+
+    def ask_for_moves(self, player: 'Player') -> List[int]:
+        """Asks the player for moves until they give ones that can be played"""
         while True:
             try:
                 moves = self.get_player_input(player)
-
-                if max(moves) > len(player.hand) or min(moves) < 0:
-                    raise ValueError
-
-                if player.allowed_cards != []:
-                    self.handle_effect_turn(player, moves)
-                    break
-
-                if len(moves) == 1 and moves[0] == len(player.hand):
-                    self.handle_pass(player)
-                    break
-
-                if len(moves) > 1 and len(player.hand) in moves:
-                    raise ValueError
-
-                hand = [player.hand[move] for move in moves]
-
-                if not self.stack.is_valid_combo(hand):
-                    raise InvalidTopCardError
-
-                self.handle_regular_turn(player, moves)
-                break
-
             except ValueError:
-                self.main_player.set_error_message('This is not '
-                                                   'a valid option\n')
-            except InvalidTopCardError:
-                self.main_player.set_error_message('You cannot put this '
-                                                   'card on top of the '
-                                                   'card pile\n')
-            except EmptyDeckError:
-                self.main_player.set_error_message('The deck is empty\n')
-                break
-
-            except WrongCardIndexError:
-                pass
-
-            except InvalidStatusTransferError:
-                self.main_player.set_error_message("You cannot play this "
-                                                   "card this turn\n")
-                pass
+                self._renderer.error('This is not a valid option\n')
+                continue
+            message = self.check_moves(player, moves)
+            if message is None:
+                return moves
+            self._renderer.error(message)
+
+    def check_moves(self, player: 'Player', moves: List[int]
+                    ) -> Optional[str]:
+        """
+        Returns the message explaining why the moves cannot be played
+        Returns None if they can
+        """
+        hand = player.hand
+        if not moves or max(moves) > len(hand) or min(moves) < 0:
+            return 'This is not a valid option\n'
+
+        if player.allowed_cards != []:
+            if len(moves) > 1:
+                return 'You cannot play this card this turn\n'
+            if moves[0] == len(hand):
+                return None
+            card = hand[moves[0]]
+            if (card.value not in player.allowed_cards
+                    and (card.value != JACK
+                         or player.status_effect != Status.FORCESUIT)):
+                return 'You cannot play this card this turn\n'
+            return None
+
+        if len(moves) == 1 and moves[0] == len(hand):
+            return None
+        if len(hand) in moves or len(set(moves)) != len(moves):
+            return 'This is not a valid option\n'
+        if not self.stack.is_valid_combo([hand[move] for move in moves]):
+            return 'You cannot put this card on top of the card pile\n'
+        return None
 
     def progress_turn(self, clear: bool = True) -> None:
         """
-        Starts a new turn 
+        Moves the game on to the next turn
         and resets all the special messages for the main player
         """
         if clear:
-            self.main_player.clear_special_message()
-            self.main_player.clear_error_message()
+            self._renderer.end_turn()
         self.increment_turn()
-        self.handle_turn()
 
     def handle_regular_turn(self, player: 'Player', moves,
                             prev_player=None, next_player=None) -> None:
@@ -260,46 +497,95 @@ class Game:
         if next_player is None:
             next_player = self.next_player(player)
 
-        try:
-            cards = [player.hand[move] for move in moves]
-            self.stack.add_cards_on_top(player.remove_cards(moves),
-                                        prev_player, next_player,
-                                        self.players)
-
-            self.add_opponent_status(player, cards)
-
-        except KingOfSpadesException:
-            self.add_opponent_status(player, cards)
-            self.special_king_of_spades_interaction(prev_player)
+        cards = player.remove_cards(moves)
+        self.emit(EventType.CARD_PLAYED, player, cards)
+        effects = self.stack.add_cards_on_top(cards, prev_player,
+                                              next_player, self.players)
+        self.add_opponent_status(player, cards)
 
-        except AceException:
-            self.add_opponent_status(player, cards)
+        # the player makes their own decisions before the previous player
+        # answers a king of spades
+        if Effect.ACE in effects:
             new_suit = self.get_player_ace_suit(player)
             self.stack.set_forced_suit(new_suit)
+            self.emit(EventType.SUIT_FORCED, player, value=new_suit)
 
-        except JackException:
-            self.add_opponent_status(player, cards)
+        if Effect.JACK in effects:
             new_value = self.get_player_jack_card(player)
             player.set_played_jack(True)
             self.stack.set_forced_value(new_value)
+            self.emit(EventType.VALUE_FORCED, player, value=new_value)
             for play in self.players:
                 play.set_allowed_cards([new_value])
 
+        if Effect.KING_OF_SPADES in effects:
+            self.special_king_of_spades_interaction(prev_player)
+
         if len(player.hand) == 0:
             self.get_winner(player)
+        if len(player.hand) == 1 and player.said_makao:
+            self.emit(EventType.MAKAO, player)
         if len(player.hand) == 1 and not player.said_makao:
-            player.increase_cards_to_draw(5)
-            self.player_draw_cards(player) 
+            player.increase_cards_to_draw(self._rules.makao_penalty)
+            self.player_draw_cards(player, EventType.MAKAO_PENALTY)
+
+    def subscribe(self, callback: Callable[['Event'], None],
+                  event_types: Optional[Iterable['EventType']] = None
+                  ) -> None:
+        """Calls the callback with every event of the given types"""
+        self._events.subscribe(callback, event_types)
+
+    def unsubscribe(self, callback: Callable[['Event'], None]) -> None:
+        """Stops sending events to the callback"""
+        self._events.unsubscribe(callback)
+
+    def emit(self, event_type: 'EventType', player: 'Player',
+             cards: List['Card'] = (), value: int = 0) -> None:
+        """Publishes an event if anyone is subscribed to its type"""
+        if not self._events.wants(event_type):
+            return
+        self._events.publish(Event(event_type, self._turn_num,
+                                   self.get_player_index(player),
+                                   tuple(card.code for card in cards),
+                                   value))
+
+    def stream_events(self, max_turns: Optional[int] = None,
+                      event_types: Optional[Iterable['EventType']] = None
+                      ) -> Iterator['Event']:
+        """
+        Plays the game like run does and lazily yields
+        the events of the given types as they happen
+        """
+        pending = deque()
+        self.subscribe(pending.append, event_types)
+        try:
+            played = 0
+            while max_turns is None or played < max_turns:
+                finished = not self.step()
+                while pending:
+                    yield pending.popleft()
+                if finished:
+                    break
+                played += 1
+        finally:
+            self.unsubscribe(pending.append)
 
     def handle_pass(self, player: 'Player') -> None:
-        """Handles what happens if a player passes"""
-        card = self.deck.draw_card()
+        """
+        Handles what happens if a player passes
+        Nothing happens if there are no cards left to draw
+        """
+        drawn = self.deck.draw_cards(1)
+        if not drawn:
+            self._renderer.error('The deck is empty\n')
+            return
+        card = drawn[0]
         player.add_card(card)
+        self.emit(EventType.PASS, player, [card])
 
         if self.first_save(player, card):
             self.handle_regular_turn(player, [len(player.hand)-1])
-        if isinstance(player, Opponent):
-            self.add_opponent_status(player, -1)
+        self.add_opponent_status(player, -1)
 
     def first_save(self, player: 'Player', card: 'Card') -> None:
         """Allows a player to save themselves with the card draw"""
@@ -309,37 +595,33 @@ class Game:
                 return True
         return False
 
-    def get_player_first_save_input(self, player, card) -> None:
+    def get_player_first_save_input(self, player, card) -> int:
         """Returns the player's choice whether they want to be saved"""
-        if isinstance(player, MainPlayer):
-            ans = input(f'You drew a {card}. Play it? (y/n): ')
-            return 1 if ans == 'y' else 0
-        else:
-            return 1
+        choice = self.get_controller(player).get_first_save(self, player, card)
+        self.emit(EventType.FIRST_SAVE, player, [card], choice)
+        return choice
 
     def handle_effect_turn(self, player: 'Player', moves) -> None:
-        """Handles a turn with special card effects in play"""
-        if len(moves) > 1 or moves[0] > len(player.hand):
-            raise InvalidStatusTransferError
-
+        """
+        Handles a turn with special card effects in play
+        The moves have to be accepted by check_moves
+        """
         if len(moves) == 1 and moves[0] == len(player.hand):
             if player.status_effect == Status.FORCESUIT:
                 self.handle_pass(player)
+            else:
+                self.emit(EventType.PASS, player)
             return
 
         card = player.hand[moves[0]]
-        if card.value not in player.allowed_cards:
-            if card.value != 11 or player.status_effect != Status.FORCESUIT:
-                raise InvalidStatusTransferError
-
         prev_player = self.prev_player(player)
         next_player = self.next_player(player)
 
         if player.status_effect == Status.DRAW5:
-            if card.suit in [Suits.CLUBS, Suits.DIAMONDS]:
+            if not self._rules.draws[card.code]:
                 player.remove_status_effect()
             else:
-                if self.stack.top_card.suit == Suits.SPADES:
+                if self._rules.backward[self.stack.top_card.code]:
                     player.transfer_effect(next_player)
                 else:
                     player.transfer_effect(prev_player)
@@ -350,15 +632,11 @@ class Game:
 
     def get_player_input(self, player) -> List[int]:
         """Gets a player's input for their card choices"""
-        if isinstance(player, MainPlayer):
-            sentence = self.ask_player_input(player)
-            sequence = input(sentence).split(' ')
-            if sequence[-1] in ['MAKAO' or 'STOP']:
-                self.handle_special_inputs(player, sequence[-1])
-                sequence.pop()
-            moves = [int(card) - 1 for card in sequence]
-        else:
-            moves = [player.get_optimal_card(self.stack)]
+        moves = self.get_controller(player).get_moves(self, player)
+        if self._events.wants(EventType.MOVE):
+            self._events.publish(Event(EventType.MOVE, self._turn_num,
+                                       self.get_player_index(player),
+                                       tuple(moves), int(player.said_makao)))
         return moves
 
     def handle_special_inputs(self, player: 'Player', word: str) -> None:
@@ -369,114 +647,43 @@ class Game:
         if word == 'MAKAO':
             player.set_said_makao()
         if word == 'STOP':
+            self.emit(EventType.STOP, player)
             for play in self.players:
                 if not play.said_makao and len(play.hand) == 1:
-                    play.increase_cards_to_draw(5)
-                    self.player_draw_cards(play)
+                    if play.cards_to_draw > 0:
+                        self.player_draw_cards(play)
+                    play.increase_cards_to_draw(self._rules.makao_penalty)
+                    self.player_draw_cards(play, EventType.MAKAO_PENALTY)
 
     def ask_player_input(self, player: 'Player') -> str:
         """
-        Returns the main player the overview of the previous turn
-        and clears the terminal
+        Shows the main player the overview of the previous turn
+        and returns the prompt for their choice
         """
-        self.clear_screen()
-
-        additional_information = (self._main_player.special_message
-                                  + self._main_player.error_message)
-        if self._main_player.special_message != '':
-            additional_information += '\n'
-
-        special_message = ''
-        if player.status_effect in [Status.NOEFFECT, Status.FORCESUIT]:
-            special_message = ' and draw a card'
-
-        first_part = str(self.stack) + '\n'
-        second_part = player.get_hand_description()
-        third_part = (f'{len(player.hand)+1} '
-                      f'- Pass your turn{special_message}\n')
-        fourth_part = 'Your option is: '
-
-        sentence = (additional_information + first_part + second_part +
-                    third_part + fourth_part)
-
-        return sentence
+        return self._renderer.show_turn(self, player)
 
     def add_opponent_status(self, opponent: 'Opponent', cards) -> None:
-        """Returns the special message to display to the main player"""
-        main_player = self._main_player
+        """Reports the cards a player has played, -1 if they passed"""
         if cards == -1:
-            message = ''
-            if opponent.allowed_cards == [] or 11 in opponent.allowed_cards:
-                message = 'and draws a card '
-
-            hand_size = len(opponent.hand)
-            main_player.add_special_message(f'{opponent.name} passes '
-                                            f'{message}'
-                                            f'({hand_size} cards left)\n')
+            self._renderer.player_passed(opponent)
         else:
-            cards_played = [str(card) for card in cards]
-            cards_string = ''
-            for index, card in enumerate(cards_played):
-                cards_string += card
-                if index < len(cards_played) - 1:
-                    cards_string += ' and '
-
-            hand_size = len(opponent.hand)
-            makao = "MAKAO! " if opponent.said_makao and hand_size == 1 else ""
-            main_player.add_special_message(f'{makao}{opponent.name} '
-                                            f'played {cards_string}'
-                                            f'({hand_size} cards left)\n')
+            self._renderer.cards_played(opponent, cards)
 
     def prepare_special_turn(self, playing: 'Player') -> None:
         """
         Takes all the neccesarry measures before a turn
         after a special card has been played
         """
+        answers = self._rules.answers.get(playing.status_effect)
+        if answers is not None:
+            playing.set_allowed_cards(list(answers))
         if playing.status_effect == Status.BLOCKED:
-            message = ('' if playing.blocked_turns == 1
-                       else f' for {playing.blocked_turns} turns')
-
-            extra_message = ('You can play a 4 to transfer it to the next player\n' # NOQA
-                             if playing.blocked_turns == playing.total_blocked_turns # NOQA
-                             else '')
-
-            block_message = (f'{playing.name} was blocked{message}\n'
-                             if isinstance(playing, Opponent)
-                             else (f'{Fore.RED}You have been blocked{message}!\n' # NOQA
-                                   f'{extra_message}{Style.RESET_ALL}'))
-
-            self.main_player.add_special_message(block_message)
-            playing.set_allowed_cards([4])
-        elif playing.status_effect == Status.DRAW2OR3:
-            extra_message = 'You can play a 2 or a 3 to transfer it to the next player\n' # NOQA
-
-            block_message = (f'{playing.name} is about to draw '
-                             f'{playing.cards_to_draw} cards\n'
-                             if isinstance(playing, Opponent)
-                             else (f'{Fore.RED}You are about to draw '
-                                   f'{playing.cards_to_draw} cards!\n'
-                                   f'{extra_message}{Style.RESET_ALL}'))
-
-            self.main_player.add_special_message(block_message)
-            playing.set_allowed_cards([2, 3])
-        elif playing.status_effect == Status.DRAW5:
-            extra_message = 'You can play a King to either negate the effect or return it to sender\n' # NOQA
-
-            block_message = (f'{playing.name} is about to draw '
-                             f'{playing.cards_to_draw} cards\n'
-                             if isinstance(playing, Opponent)
-                             else (f'{Fore.RED}You are about to draw '
-                                   f'{playing.cards_to_draw} cards!\n'
-                                   f'{extra_message}{Style.RESET_ALL}'))
-
-            self.main_player.add_special_message(block_message)
-            playing.set_allowed_cards([13])
+            self.emit(EventType.BLOCK, playing, value=playing.blocked_turns)
+        self._renderer.special_turn(playing)
 
     def clear_screen(self):
-        if sys.platform == 'win32':
-            os.system('cls')
-        elif sys.platform == 'linux' or sys.platform == 'darwin':
-            os.system('clear')
+        """Clears the terminal if someone is watching the game"""
+        self._renderer.clear()
 
     def special_king_of_spades_interaction(self, player: 'Player') -> None:
         """
@@ -484,40 +691,33 @@ class Game:
         a king of spades has been played
         """
         self.prepare_special_turn(player)
-        moves = self.get_player_input(player)
+        moves = self.ask_for_moves(player)
         self.handle_effect_turn(player, moves)
         if player.cards_to_draw > 0:
             self.player_draw_cards(player)
-            print(self.ask_player_input(self.main_player))
+            if self.main_player is not None:
+                self.ask_player_input(self.main_player)
+
+    def get_suits_description(self) -> str:
+        """Returns the list of suits a player can pick from"""
+        suits_string = ''
+        for index, suit in enumerate(SUIT_SYMBOLS):
+            color = Fore.BLACK if index % 2 == 0 else Fore.RED
+            suits_string += (f'{index+1} - '
+                             f'{color + suit + Style.RESET_ALL}\n')
+        return suits_string
 
     def get_player_ace_suit(self, player):
         """Gets the player's decision after they have played an ace"""
-        suits = ['\u2660', '\u2666', '\u2663', '\u2665']
-        if isinstance(player, MainPlayer):
-            suits_string = ''
-            for index, suit in enumerate(suits):
-                color = Fore.BLACK if index % 2 == 0 else Fore.RED
-                suits_string += (f'{index+1} - '
-                                 f'{color + suit + Style.RESET_ALL}\n')
-            suit = int(input((f'Pick a suit: \n{suits_string}')))
-            return suit
-        elif isinstance(player, Opponent):
-            suit = player.get_optimal_suit()
-            self.main_player.add_special_message(f'{Fore.RED}{player} has '
-                                                 f'picked {suits[suit-1]} '
-                                                 f'as the new suit{Style.RESET_ALL}\n') # NOQA
-            return suit
+        suit = self.get_controller(player).get_ace_suit(self, player)
+        self._renderer.suit_picked(player, suit)
+        return suit
 
     def get_player_jack_card(self, player: 'Player') -> int:
         """Gets the player's decision after they have played a jack"""
-        if isinstance(player, MainPlayer):
-            value = int(input('Pick a value to force (from 5 to 10): '))
-            return value
-        elif isinstance(player, Opponent):
-            value = player.get_optimal_value()
-            self.main_player.add_special_message(f'{Fore.RED}{player} has picked {value} ' # NOQA
-                                                 f'as the forced card{Style.RESET_ALL}\n') # NOQA
-            return value
+        value = self.get_controller(player).get_jack_value(self, player)
+        self._renderer.value_picked(player, value)
+        return value
 
     def check_stack_forced_value(self) -> None:
         """Checks if the forced card value shoiuld be reset"""
@@ -526,12 +726,19 @@ class Game:
                 return
         self.stack.reset_forced_value()
     
-    def player_draw_cards(self, player: 'Player') -> None:
-        """Forces a player to draw all the cards they need to"""
-        self.main_player.add_special_message(f'{player} drew {player.cards_to_draw} cards') # NOQA
-        for _ in range(player.cards_to_draw):
-            player.add_card(self.deck.draw_card())
-        self.main_player.add_special_message(f' (at {len(player.hand)} cards) \n') # NOQA
+    def player_draw_cards(self, player: 'Player',
+                          event_type: 'EventType' = EventType.DRAW) -> None:
+        """
+        Forces a player to draw all the cards they need to
+        Stops early if there are no cards left to draw
+        The draw is reported as DRAW when it ends a penalty chain
+        and as MAKAO_PENALTY when the player forgot to say makao
+        """
+        drawn = self.deck.draw_cards(player.cards_to_draw)
+        for card in drawn:
+            player.add_card(card)
+        self.emit(event_type, player, drawn, len(drawn))
+        self._renderer.cards_drawn(player, len(drawn))
         player.remove_status_effect()
 
     def get_winner(self, player: 'Player') -> None:
@@ -539,19 +746,8 @@ class Game:
         player.win_game()
         if player not in self.winners:
             self._winners.append(player)
+            self.emit(EventType.PLAYER_WON, player, value=len(self.winners))
 
     def finish_game(self) -> None:
         """Finishes the game after n-1 players are winners"""
-        self.clear_screen()
-        self.main_player.clear_error_message()
-        self.main_player.clear_special_message()
-        ends = ['st', 'nd', 'rd', 'th']
-        print('The game is finished!\n')
-        for place, player in enumerate(self.winners):
-            print(f'{place+1}{ends[place]} place - {player}')
-
-        for player in self.players:
-            if player not in self.winners:
-                print(f'{player} lost :( \n')
-
-        return
+        self._renderer.finish(self)
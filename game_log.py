@@ -0,0 +1,324 @@
+from controller import PlayerController
+from events import Event, EventType
+from game import Game
+from card import Card, CARD_COUNT
+from typing import (Dict, Iterator, List, NamedTuple, Optional, Tuple,
+                    TYPE_CHECKING)
+import mmap
+import os
+import struct
+
+if TYPE_CHECKING:
+    from game_state import GameState
+    from player import Player
+
+
+MAGIC = b'MKL1'
+# magic, seed, number of players, number of cards in the deck
+HEADER = struct.Struct('<4sQBH')
+# event type, seat, turn, value, number of data bytes
+RECORD = struct.Struct('<BBIiH')
+# closes every game, the turn field holds the number of turns played
+END_OF_GAME = 0
+# written in place of hand indexes that do not fit in a byte
+INVALID_INDEX = 255
+
+DECISIONS = (EventType.MOVE, EventType.STOP, EventType.SUIT_FORCED,
+             EventType.VALUE_FORCED, EventType.FIRST_SAVE)
+
+
+class GameLogError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class ReplayError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class LoggedGame(NamedTuple):
+    """
+    A single game read from a log
+
+    :param seed: The seed the game was played with
+    :type seed: int
+
+    :param num_of_players: The number of seats at the table
+    :type num_of_players: int
+
+    :param deck: The codes of the cards in the deck after shuffling,
+    the last card is on top, 52 codes for every deck mixed in
+    :type deck: Tuple[int]
+
+    :param events: Everything that happened, in order
+    :type events: Tuple['Event']
+
+    :param turns: The number of turns that were played
+    :type turns: int
+    """
+    seed: int
+    num_of_players: int
+    deck: Tuple[int, ...]
+    events: Tuple[Event, ...]
+    turns: int
+
+
+def encode_event(event: 'Event') -> bytes:
+    """Returns the record an event is stored as"""
+    data = event.cards
+    if event.type == EventType.MOVE:
+        data = [index if 0 <= index < INVALID_INDEX else INVALID_INDEX
+                for index in data]
+    return RECORD.pack(event.type, event.seat, event.turn,
+                       event.value, len(data)) + bytes(data)
+
+
+class GameLogWriter:
+    """
+    Class GameLogWriter. Appends games to a binary log. Every game is
+    a header with the seed and the deck followed by one record per
+    event, cards are stored as their codes. A game is kept in memory
+    until it is detached and then written in a single append.
+    Without a path the games are only returned when they are detached.
+    Contains attributes:
+
+    :param path: The path of the log file
+    :type path: Optional[str]
+    """
+    def __init__(self, path: Optional[str] = None) -> None:
+        """Initialises the GameLogWriter class"""
+        self._path = path
+        self._buffers: Dict['Game', bytearray] = {}
+        self._callbacks = {}
+
+    @property
+    def path(self) -> Optional[str]:
+        return self._path
+
+    def attach(self, game: 'Game') -> None:
+        """
+        Starts recording a game, it has to be attached before
+        its first turn is played
+        Throws error if the seed cannot be stored
+        """
+        if not 0 <= game.seed < 2 ** 64:
+            raise GameLogError('Only seeds from 0 to 2**64 - 1 can be logged')
+        if game.turn_num != 0:
+            raise GameLogError('A game has to be logged from its first turn')
+        buffer = bytearray(HEADER.pack(MAGIC, game.seed, len(game.players),
+                                       len(game.initial_deck)))
+        buffer += bytes(game.initial_deck)
+        self._buffers[game] = buffer
+
+        def record(event: 'Event') -> None:
+            buffer.extend(encode_event(event))
+
+        self._callbacks[game] = record
+        game.subscribe(record)
+
+    def detach(self, game: 'Game') -> bytes:
+        """
+        Stops recording a game and appends it to the log
+        Returns the bytes the game is stored as
+        """
+        game.unsubscribe(self._callbacks.pop(game))
+        buffer = self._buffers.pop(game)
+        buffer += RECORD.pack(END_OF_GAME, 0, game.turn_num, 0, 0)
+        if self._path is not None:
+            append_games(self._path, buffer)
+        return bytes(buffer)
+
+    def record(self, game: 'Game', max_turns: Optional[int] = None) -> int:
+        """
+        Plays the game like run does and appends it to the log
+        Returns the number of turns that were played
+        """
+        self.attach(game)
+        try:
+            return game.run(max_turns)
+        finally:
+            self.detach(game)
+
+
+def append_games(path: str, data: bytes) -> None:
+    """Appends games that were already encoded to a log"""
+    with open(path, 'ab') as log:
+        log.write(data)
+
+
+def parse_games(data) -> Iterator['LoggedGame']:
+    """
+    Yields the games stored in a buffer holding a log
+    Throws error if the buffer is not a valid log
+    """
+    offset = 0
+    size = len(data)
+    while offset < size:
+        if size - offset < HEADER.size:
+            raise GameLogError('The log ends in the middle of a game')
+        magic, seed, players, deck_size = HEADER.unpack_from(data, offset)
+        if magic != MAGIC:
+            raise GameLogError(f'No game starts at byte {offset}')
+        offset += HEADER.size
+        deck = tuple(data[offset:offset + deck_size])
+        offset += deck_size
+
+        events = []
+        while True:
+            if size - offset < RECORD.size:
+                raise GameLogError('The log ends in the middle of a game')
+            event_type, seat, turn, value, length = RECORD.unpack_from(
+                data, offset)
+            offset += RECORD.size
+            if event_type == END_OF_GAME:
+                break
+            cards = tuple(data[offset:offset + length])
+            offset += length
+            events.append(Event(EventType(event_type), turn, seat,
+                                cards, value))
+        yield LoggedGame(seed, players, deck, tuple(events), turn)
+
+
+def read_games(path: str) -> Iterator['LoggedGame']:
+    """Memory maps a log and yields the games stored in it"""
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as log:
+        with mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from parse_games(data)
+
+
+class ReplayController(PlayerController):
+    """
+    Class ReplayController. Makes every decision the way it was logged.
+    A single controller is shared by all the seats of a replayed game
+    and keeps its position in the logged decisions
+    """
+    def __init__(self, decisions: List['Event']) -> None:
+        """Initialises the ReplayController class"""
+        self._decisions = decisions
+        self._position = 0
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    def seek(self, position: int) -> None:
+        """Moves to a position in the logged decisions"""
+        self._position = position
+
+    def next_decision(self, game: 'Game', player: 'Player',
+                      event_type: 'EventType') -> 'Event':
+        """
+        Returns the next logged decision
+        Throws error if the game asks for a different decision than was logged
+        """
+        if self._position >= len(self._decisions):
+            raise ReplayError('The game continues past the end of the log')
+        decision = self._decisions[self._position]
+        seat = game.get_player_index(player)
+        if decision.type != event_type or decision.seat != seat:
+            raise ReplayError(f'Seat {seat} was asked for {event_type.name} '
+                              f'but the log has {decision.type.name} '
+                              f'for seat {decision.seat}')
+        self._position += 1
+        return decision
+
+    def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        while (self._position < len(self._decisions)
+               and self._decisions[self._position].type == EventType.STOP):
+            self.next_decision(game, player, EventType.STOP)
+            game.handle_special_inputs(player, 'STOP')
+        decision = self.next_decision(game, player, EventType.MOVE)
+        if decision.value:
+            player.set_said_makao()
+        return list(decision.cards)
+
+    def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        return self.next_decision(game, player, EventType.SUIT_FORCED).value
+
+    def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        return self.next_decision(game, player, EventType.VALUE_FORCED).value
+
+    def get_first_save(self, game: 'Game', player: 'Player',
+                       card: 'Card') -> int:
+        return self.next_decision(game, player, EventType.FIRST_SAVE).value
+
+
+class GameReplayer:
+    """
+    Class GameReplayer. Rebuilds the state of a logged game at any turn
+    from its seed and the logged decisions, without asking anyone for
+    input. States are saved every few turns on the way, so going back
+    to an earlier turn only replays the turns after the closest save.
+    Contains attributes:
+
+    :param logged: The game that is replayed
+    :type logged: 'LoggedGame'
+
+    :param checkpoint_every: The number of turns between saved states
+    :type checkpoint_every: int
+    """
+    def __init__(self, logged: 'LoggedGame',
+                 checkpoint_every: int = 64) -> None:
+        """
+        Initialises the GameReplayer class and deals the logged game
+        Throws error if the seed does not give the logged deck
+        """
+        self._logged = logged
+        self._checkpoint_every = checkpoint_every
+        self._controller = ReplayController(
+            [event for event in logged.events if event.type in DECISIONS])
+        self._game = Game.headless(
+            logged.num_of_players,
+            [self._controller] * logged.num_of_players, logged.seed,
+            len(logged.deck) // CARD_COUNT)
+        if self._game.initial_deck != logged.deck:
+            raise ReplayError('The seed does not give the logged deck')
+        self._checkpoints = {}
+        self.save_checkpoint()
+
+    @property
+    def logged(self) -> 'LoggedGame':
+        return self._logged
+
+    @property
+    def game(self) -> 'Game':
+        return self._game
+
+    def save_checkpoint(self) -> None:
+        """Saves the current state of the replayed game"""
+        self._checkpoints[self._game.turn_num] = (
+            self._game.snapshot(), self._controller.position,
+            self._game.deck.rng.getstate())
+
+    def seek(self, turn: int) -> 'Game':
+        """
+        Brings the replayed game to the start of the given turn
+        Throws error if the game was not logged that far
+        """
+        if not 0 <= turn <= self._logged.turns:
+            raise ValueError(f'Only turns from 0 to {self._logged.turns} '
+                             f'were logged')
+        start = max(saved for saved in self._checkpoints if saved <= turn)
+        state, position, rng_state = self._checkpoints[start]
+        self._game.restore(state)
+        self._controller.seek(position)
+        self._game.deck.rng.setstate(rng_state)
+
+        while self._game.turn_num < turn:
+            playing = self._game.step()
+            if self._game.turn_num % self._checkpoint_every == 0:
+                self.save_checkpoint()
+            if not playing:
+                break
+        return self._game
+
+    def state_at(self, turn: int) -> 'GameState':
+        """Returns the state of the game at the start of the given turn"""
+        return self.seek(turn).snapshot()
+
+    def replay(self) -> 'Game':
+        """Replays the whole logged game"""
+        return self.seek(self._logged.turns)
@@ -0,0 +1,83 @@
+from typing import NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from card import Card
+
+
+class PlayerState(NamedTuple):
+    """
+    Immutable copy of everything that changes about a player during a game
+
+    :param hand: The cards in the player's hand
+    :type hand: Tuple['Card']
+
+    :param won: Whether the player has emptied their hand
+    :type won: bool
+
+    :param total_blocked_turns: The number of turns the player's block
+    lasted when it started
+    :type total_blocked_turns: int
+
+    :param blocked_turns: The number of turns the player is still blocked
+    :type blocked_turns: int
+
+    :param cards_to_draw: The number of cards the player has to draw
+    :type cards_to_draw: int
+
+    :param played_jack: Whether the player played a jack this turn
+    :type played_jack: bool
+
+    :param status_effect: The player's status from the Status enum
+    :type status_effect: int
+
+    :param allowed_cards: The values the player is restricted to
+    :type allowed_cards: Tuple[int]
+
+    :param said_makao: Whether the player said makao this turn
+    :type said_makao: bool
+    """
+    hand: Tuple['Card', ...]
+    won: bool
+    total_blocked_turns: int
+    blocked_turns: int
+    cards_to_draw: int
+    played_jack: bool
+    status_effect: int
+    allowed_cards: Tuple[int, ...]
+    said_makao: bool
+
+
+class GameState(NamedTuple):
+    """
+    Immutable copy of a game at a point in time. Cards are kept as
+    references to the shared card instances so copying a state
+    only copies the tuples holding them
+
+    :param players: The state of every seat, in seat order
+    :type players: Tuple['PlayerState']
+
+    :param deck: The cards in the deck, the last card is on top
+    :type deck: Tuple['Card']
+
+    :param stack: The cards on the card stack, the last card is on top
+    :type stack: Tuple['Card']
+
+    :param forced_suit: The suit forced by an ace, None if there is none
+    :type forced_suit: int
+
+    :param forced_value: The value forced by a jack, None if there is none
+    :type forced_value: int
+
+    :param turn_num: The turn the game is at
+    :type turn_num: int
+
+    :param winners: The seats of the players who have won, in order
+    :type winners: Tuple[int]
+    """
+    players: Tuple[PlayerState, ...]
+    deck: Tuple['Card', ...]
+    stack: Tuple['Card', ...]
+    forced_suit: Optional[int]
+    forced_value: Optional[int]
+    turn_num: int
+    winners: Tuple[int, ...]
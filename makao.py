@@ -1,7 +1,25 @@
-from game import Game, InvalidOppNumError
+from game import Game, InvalidOppNumError, MAX_OPPONENTS
+import sys
 
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'simulate':
+        from simulate import main
+        main(sys.argv[2:])
+        sys.exit()
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from server import main
+        main(sys.argv[2:])
+        sys.exit()
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        from benchmark import main
+        main(sys.argv[2:])
+        sys.exit()
+    if len(sys.argv) > 1 and sys.argv[1] == 'stats':
+        from analysis import main
+        main(sys.argv[2:])
+        sys.exit()
+
     choice = -1
     while choice != 3:
         try:
@@ -17,11 +35,12 @@ if __name__ == '__main__':
                     )
             elif choice == 2:
                 name = input('What is your name? ')
-                player_num = int(input('Input the number of opponents (1-3): '))
+                player_num = int(input(f'Input the number of opponents '
+                                       f'(1-{MAX_OPPONENTS}): '))
                 game = Game(name, player_num)
             elif choice != 3:
                 print('This it not a valid option\n')
         except ValueError:
             print('This is not a valid option\n')
         except InvalidOppNumError:
-            print('The number has to be between 1 and 3\n')
+            print(f'The number has to be between 1 and {MAX_OPPONENTS}\n')
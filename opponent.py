@@ -1,50 +1,61 @@
 from player import Player
-from card import Card
-from typing import List, Optional
-from card_stack import CardStack
-from random import random
+from card import Card, Suits
+from typing import Iterable, List, Optional
+from card_stack import CardStack, VALUE_MASKS
+from rules import JACK_DEMANDS
+import random
 
 
 class Opponent(Player):
     """
-    Class Opponent. Inherits from Player.
+    Class Opponent. Inherits from Player. Contains attributes:
+
+    :param rng: The random number generator behind the opponent's decisions
+    :type rng: random.Random
     """
-    def __init__(self, name: str, cards: Optional[List[Card]] = None):
+    def __init__(self, name: str, cards: Optional[List[Card]] = None,
+                 rng: Optional[random.Random] = None):
         """Initialises the Opponent class"""
         super().__init__(name, cards)
+        self._rng = rng if rng is not None else random.Random()
 
     def get_optimal_card(self, card_stack: 'CardStack') -> int:
         """
-        Returns the index of a card to be played by the opponent
-        Returns -1 if the opponent should skip their turn
+        Returns the index of a card to be played by the opponent,
+        the last playable card in the hand
+        Returns the size of the hand if the opponent should skip their turn
         """
         ans = len(self.hand)
-        for index, card in enumerate(self.hand):
-            if self.allowed_cards != []:
-                if card.value in self.allowed_cards:
-                    ans = index
-            else:
-                if (card_stack.is_valid_combo([card])):
-                    ans = index
+        if self.allowed_cards != []:
+            if not self.has_any_value(self.allowed_cards):
+                return ans
+            playable = 0
+            for value in self.allowed_cards:
+                playable |= VALUE_MASKS.get(value, 0)
+        else:
+            playable = card_stack.legal_cards(self.hand_mask)
+            if not playable:
+                return ans
+        for index in range(len(self.hand) - 1, -1, -1):
+            if playable >> self.hand[index].code & 1:
+                ans = index
+                break
         if ans != len(self.hand) and len(self.hand) == 2:
-            if random() > 0.5:
+            if self._rng.random() > 0.5:
                 self.set_said_makao()
         return ans
 
     def get_optimal_suit(self) -> int:
-        """Returns the optimal suit after the Ace special effect"""
-        suits_in_hand = [0]*4
-        for card in self.hand:
-            suit = card.suit
-            suits_in_hand[suit - 1] += 1
-
-        return suits_in_hand.index(max(suits_in_hand)) + 1
-
-    def get_optimal_value(self) -> int:
-        """Returns the optimal card value after the Jack interction"""
-        cards_in_hand = [0]*13
-        for card in self.hand:
-            value = card.value
-            cards_in_hand[value-1] += 1
+        """
+        Returns the optimal suit after the Ace special effect,
+        the suit the opponent holds the most cards of
+        """
+        return max(Suits, key=self.count_suit)
 
-        return cards_in_hand[4:10].index(max(cards_in_hand[4:10])) + 5
+    def get_optimal_value(self, demands: Iterable[int] = JACK_DEMANDS
+                          ) -> int:
+        """
+        Returns the optimal card value after the Jack interction,
+        the value a jack can force the opponent holds the most cards of
+        """
+        return max(demands, key=self.count_value)
@@ -1,7 +1,12 @@
-from card import Card
-from typing import List, Optional
+from card import Card, CARD_COUNT, JACK
+from game_state import PlayerState
+from typing import Iterator, List, Optional, TYPE_CHECKING
 from enum import IntEnum
 
+if TYPE_CHECKING:
+    from card_stack import CardStack
+    from seat_ring import SeatRing
+
 
 class WrongCardIndexError(Exception):
     def __init__(self):
@@ -28,6 +33,10 @@ class Player:
 
     :param total_blocked_turns: The amount of turns the player will blocked
     :type total_blocked_turns: int
+
+    :param hand_mask: The cards in the player's hand as a bitmask,
+    bit n is set if at least one card with code n is in the hand
+    :type hand_mask: int
     """
     def __init__(self, name: str, cards: Optional[List[Card]] = None) -> None:
         """Initialises the player class"""
@@ -36,6 +45,13 @@ class Player:
         else:
             self._hand = cards
 
+        self._hand_mask = 0
+        self._code_counts = [0] * CARD_COUNT
+        self._suit_counts = [0] * 5
+        self._value_counts = [0] * 14
+        for card in self._hand:
+            self._count_card(card)
+
         self._name = name
         self._won = False
         self._total_blocked_turns = 0
@@ -45,6 +61,7 @@ class Player:
         self._status_effect = Status.NOEFFECT
         self._allowed_cards = []
         self._said_makao = False
+        self._seat_ring = None
 
     @property
     def hand(self) -> List[Card]:
@@ -86,37 +103,147 @@ class Player:
     def said_makao(self) -> bool:
         return self._said_makao
 
+    @property
+    def hand_mask(self) -> int:
+        return self._hand_mask
+
+    @property
+    def active(self) -> bool:
+        """Returns True if the player takes turns, not blocked nor won"""
+        return not self._won and self._status_effect != Status.BLOCKED
+
+    def set_seat_ring(self, ring: 'SeatRing') -> None:
+        """Joins the ring that has to know when the player's turns stop"""
+        self._seat_ring = ring
+
+    def _set_status(self, effect: int, won: bool) -> None:
+        """Changes the status, telling the seat ring if it has to know"""
+        if self._seat_ring is not None and (
+                won != self._won
+                or (effect == Status.BLOCKED)
+                != (self._status_effect == Status.BLOCKED)):
+            self._seat_ring.invalidate()
+        self._status_effect = effect
+        self._won = won
+
     def set_played_jack(self, val) -> None:
         self._played_jack = val
 
+    def _count_card(self, card: 'Card') -> None:
+        """Adds a card to the hand's bitmask and counters"""
+        self._code_counts[card.code] += 1
+        self._hand_mask |= 1 << card.code
+        self._suit_counts[card.suit] += 1
+        self._value_counts[card.value] += 1
+
+    def _uncount_card(self, card: 'Card') -> None:
+        """Removes a card from the hand's bitmask and counters"""
+        self._code_counts[card.code] -= 1
+        if not self._code_counts[card.code]:
+            self._hand_mask &= ~(1 << card.code)
+        self._suit_counts[card.suit] -= 1
+        self._value_counts[card.value] -= 1
+
+    def has_card(self, card: 'Card') -> bool:
+        """Checks if the card is in the player's hand"""
+        return bool(self._hand_mask >> card.code & 1)
+
+    def count_card(self, card: 'Card') -> int:
+        """Returns the number of copies of a card in the player's hand"""
+        return self._code_counts[card.code]
+
+    def count_suit(self, suit: int) -> int:
+        """Returns the number of cards of a suit in the player's hand"""
+        return self._suit_counts[suit]
+
+    def count_value(self, value: int) -> int:
+        """Returns the number of cards of a value in the player's hand"""
+        return self._value_counts[value]
+
+    def has_any_value(self, values: List[int]) -> bool:
+        """Checks if the player holds a card of any of the given values"""
+        for value in values:
+            if self._value_counts[value]:
+                return True
+        return False
+
+    def legal_moves(self, card_stack: 'CardStack',
+                    max_length: Optional[int] = None
+                    ) -> Iterator[List[int]]:
+        """
+        Lazily yields every move the player can make this turn
+        as a list of hand indexes. Cards that are the same are
+        only yielded once. The last move is always the pass,
+        the index equal to the size of the hand
+        """
+        if self.allowed_cards != []:
+            seen = 0
+            for index, card in enumerate(self.hand):
+                bit = 1 << card.code
+                if seen & bit:
+                    continue
+                if (card.value in self.allowed_cards or
+                   (card.value == JACK and
+                        self.status_effect == Status.FORCESUIT)):
+                    seen |= bit
+                    yield [index]
+        else:
+            yield from card_stack.generate_combos(self.hand, max_length)
+        yield [len(self.hand)]
+
+    def get_state(self) -> 'PlayerState':
+        """Returns an immutable copy of the player's hand and status"""
+        return PlayerState(tuple(self._hand), self._won,
+                           self._total_blocked_turns, self._blocked_turns,
+                           self._cards_to_draw, self._played_jack,
+                           self._status_effect, tuple(self._allowed_cards),
+                           self._said_makao)
+
+    def set_state(self, state: 'PlayerState') -> None:
+        """Brings the player back to a state returned by get_state"""
+        self.set_hand(state.hand)
+        self._set_status(state.status_effect, state.won)
+        self._total_blocked_turns = state.total_blocked_turns
+        self._blocked_turns = state.blocked_turns
+        self._cards_to_draw = state.cards_to_draw
+        self._played_jack = state.played_jack
+        self._allowed_cards = list(state.allowed_cards)
+        self._said_makao = state.said_makao
+
+    def set_hand(self, cards: List['Card']) -> None:
+        """Replaces the player's whole hand"""
+        self._hand = list(cards)
+        self._hand_mask = 0
+        self._code_counts = [0] * CARD_COUNT
+        self._suit_counts = [0] * 5
+        self._value_counts = [0] * 14
+        for card in self._hand:
+            self._count_card(card)
+
     def add_card(self, card: 'Card') -> None:
         """Adds a card to the player's hand"""
         self._hand.append(card)
+        self._count_card(card)
 
-    def remove_cards(self, indexes: List[int]) -> 'Card':
+    def remove_cards(self, indexes: List[int]) -> List['Card']:
         """
         Removes cards from the player's hand
-        Throws error if given an invalid index
+        and returns them in the order they were given
+        Throws error if given an invalid or a repeated index
         """
-        new_hand = []
-        removed_cards = []
-
+        hand = self._hand
         for index in indexes:
-            if index > len(self.hand)-1 or index < 0:
+            if index > len(hand)-1 or index < 0:
                 raise WrongCardIndexError
-
-        for index, card in enumerate(self.hand):
-            if index not in indexes:
-                new_hand.append(card)
-            else:
-                removed_cards.append(card)
-
-        self._hand = new_hand
+        if len(indexes) > 1 and len(set(indexes)) != len(indexes):
+            raise WrongCardIndexError
+
+        removed_cards = [hand[index] for index in indexes]
+        for index in sorted(indexes, reverse=True):
+            del hand[index]
+        for card in removed_cards:
+            self._uncount_card(card)
         return removed_cards
-        # try:
-        #     return self._hand.pop(card_index)
-        # except IndexError:
-        #     raise WrongCardIndexError()
 
     def increase_block(self) -> None:
         """Increases the number of blocked turns after a 4"""
@@ -128,7 +255,7 @@ class Player:
         self._blocked_turns -= 1
         if self.blocked_turns == 0:
             self._total_blocked_turns = 0
-            self._status_effect = Status.NOEFFECT
+            self._set_status(Status.NOEFFECT, self._won)
             self._allowed_cards = []
 
     def increase_cards_to_draw(self, num: int) -> None:
@@ -141,7 +268,7 @@ class Player:
     def reset_cards_to_draw(self) -> None:
         """Resets the number of cards the player has to draw"""
         self._cards_to_draw = 0
-        self._status_effect = Status.NOEFFECT
+        self._set_status(Status.NOEFFECT, self._won)
         self.clear_allowed_cards()
 
     def get_hand_description(self) -> str:
@@ -153,11 +280,11 @@ class Player:
 
     def set_status_effect(self, effect: int) -> None:
         """Sets an effect after a special card has beeen played"""
-        self._status_effect = effect
+        self._set_status(effect, self._won)
 
     def remove_status_effect(self) -> List[int]:
         """Removed the special effect"""
-        self._status_effect = Status.NOEFFECT
+        self._set_status(Status.NOEFFECT, self._won)
         self._total_blocked_turns = 0
         self._blocked_turns = 0
         self._cards_to_draw = 0
@@ -181,7 +308,7 @@ class Player:
 
     def win_game(self) -> None:
         """Sets the player as a winner after they win the game"""
-        self._won = True
+        self._set_status(self._status_effect, True)
 
     def set_said_makao(self) -> None:
         """Sets if the player said Makao after being left with 1 card"""
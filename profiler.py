@@ -0,0 +1,119 @@
+from typing import Callable, Dict, List, Optional
+import json
+import time
+
+
+# the phases of a turn in the order they are reported
+PHASES = ('turn', 'special_turn', 'input', 'decision', 'validation',
+          'effects', 'draw', 'rendering')
+
+
+class PhaseProfiler:
+    """
+    Class PhaseProfiler. Counts the calls and measures the time spent
+    in every phase of a turn. Phases can run inside each other, a king
+    of spades resolves a whole special turn inside the effects of the
+    previous one, so every phase keeps its total time and its own time
+    without the phases it called. The own time of the turn phase is
+    what no other phase accounts for.
+    Contains attributes:
+
+    :param calls: The number of times every phase was entered
+    :type calls: Dict[str, int]
+
+    :param total: The seconds spent in every phase
+    :type total: Dict[str, float]
+
+    :param own: The seconds spent in every phase outside the phases it called
+    :type own: Dict[str, float]
+    """
+    def __init__(self, clock: Callable[[], float] = time.perf_counter
+                 ) -> None:
+        """Initialises the PhaseProfiler class with nothing measured"""
+        self._clock = clock
+        self._calls = dict.fromkeys(PHASES, 0)
+        self._total = dict.fromkeys(PHASES, 0.0)
+        self._own = dict.fromkeys(PHASES, 0.0)
+        # the time spent in called phases, one entry per running phase
+        self._children: List[float] = []
+
+    @property
+    def calls(self) -> Dict[str, int]:
+        return self._calls
+
+    @property
+    def total(self) -> Dict[str, float]:
+        return self._total
+
+    @property
+    def own(self) -> Dict[str, float]:
+        return self._own
+
+    def wrap(self, phase: str, function: Callable) -> Callable:
+        """Returns the function timed as part of the given phase"""
+        clock = self._clock
+        children = self._children
+        calls = self._calls
+        total = self._total
+        own = self._own
+
+        def timed(*args, **kwargs):
+            children.append(0.0)
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                inner = children.pop()
+                if children:
+                    children[-1] += elapsed
+                calls[phase] += 1
+                total[phase] += elapsed
+                own[phase] += elapsed - inner
+        timed.__wrapped__ = function
+        return timed
+
+    def merge(self, other: 'PhaseProfiler') -> None:
+        """Adds the measurements of another profiler to this one"""
+        self.merge_dict(other.as_dict())
+
+    def merge_dict(self, data: Dict[str, Dict[str, float]]) -> None:
+        """Adds measurements returned by as_dict to this profiler"""
+        for phase, values in data.items():
+            self._calls[phase] = self._calls.get(phase, 0) + values['calls']
+            self._total[phase] = self._total.get(phase, 0.0) + values['total']
+            self._own[phase] = self._own.get(phase, 0.0) + values['own']
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Returns the measurements of every phase that was entered"""
+        return {phase: {'calls': self._calls[phase],
+                        'total': self._total[phase],
+                        'own': self._own[phase]}
+                for phase in self._calls if self._calls[phase]}
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """Returns the measurements as JSON and writes them to the path"""
+        text = json.dumps(self.as_dict(), indent=2)
+        if path is not None:
+            with open(path, 'w') as file:
+                file.write(text + '\n')
+        return text
+
+    def summary(self) -> str:
+        """Returns a table of the measurements, slowest phases first"""
+        turn_time = self._total['turn'] or sum(self._own.values())
+        lines = [f'{"phase":12} {"calls":>9} {"total ms":>11} '
+                 f'{"own ms":>11} {"us/call":>9} {"share":>7}']
+        phases = sorted(self.as_dict().items(),
+                        key=lambda item: item[1]['own'], reverse=True)
+        for phase, values in phases:
+            share = values['own'] / turn_time if turn_time else 0.0
+            lines.append(f'{phase:12} {values["calls"]:9d} '
+                         f'{values["total"] * 1000:11.2f} '
+                         f'{values["own"] * 1000:11.2f} '
+                         f'{values["own"] / values["calls"] * 1e6:9.2f} '
+                         f'{share:7.1%}')
+        return '\n'.join(lines)
+
+    def __str__(self) -> str:
+        return self.summary()
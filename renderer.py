@@ -0,0 +1,298 @@
+from player import Player, Status
+from card import Card, JACK
+from colorama import Fore, Style
+from typing import List, Optional, TextIO, TYPE_CHECKING
+import re
+import shutil
+import sys
+
+if TYPE_CHECKING:
+    from game import Game
+    from main_player import MainPlayer
+    from profiler import PhaseProfiler
+
+
+CLEAR_SCREEN = '\x1b[2J'
+CURSOR_HOME = '\x1b[H'
+CLEAR_DOWN = '\x1b[J'
+
+_ESCAPE_SEQUENCE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+
+def count_rows(text: str, width: int) -> int:
+    """
+    Returns the number of terminal rows the text takes up,
+    counting lines that wrap around the terminal's width
+    """
+    rows = 0
+    for line in _ESCAPE_SEQUENCE.sub('', text).split('\n')[:-1]:
+        rows += max(1, -(-len(line) // width))
+    return rows
+
+
+SUIT_SYMBOLS = ['\u2660', '\u2666', '\u2663', '\u2665']
+VALUE_NAMES = {1: 'A', 11: 'J', 12: 'Q', 13: 'K'}
+ORDINAL_ENDS = {1: 'st', 2: 'nd', 3: 'rd'}
+
+
+def describe_values(values: List[int]) -> str:
+    """Returns the card values a player can answer with for a message"""
+    return ' or a '.join(VALUE_NAMES.get(value, str(value))
+                         for value in values)
+
+
+def ordinal(number: int) -> str:
+    """Returns the number with its English suffix, like 1st or 12th"""
+    if number % 100 in (11, 12, 13):
+        return f'{number}th'
+    return f'{number}{ORDINAL_ENDS.get(number % 10, "th")}'
+
+
+class Renderer:
+    """
+    Class Renderer. Receives everything the game wants to show.
+    This base class ignores all of it, so games nobody is watching
+    never format a single message
+    """
+    def cards_played(self, player: 'Player', cards: List['Card']) -> None:
+        """A player has put cards on the card stack"""
+
+    def player_passed(self, player: 'Player') -> None:
+        """A player has passed their turn"""
+
+    def special_turn(self, player: 'Player') -> None:
+        """A player starts their turn under a special effect"""
+
+    def cards_drawn(self, player: 'Player', count: int) -> None:
+        """A player had to draw cards"""
+
+    def suit_picked(self, player: 'Player', suit: int) -> None:
+        """A player has picked the suit after playing an ace"""
+
+    def value_picked(self, player: 'Player', value: int) -> None:
+        """A player has picked the value after playing a jack"""
+
+    def error(self, message: str) -> None:
+        """The last input was rejected"""
+
+    def end_turn(self) -> None:
+        """The main player's messages have been seen"""
+
+    def show_turn(self, game: 'Game', player: 'Player') -> str:
+        """Shows the state of the game and returns the input prompt"""
+        return ''
+
+    def clear(self) -> None:
+        """Clears whatever has been shown"""
+
+    def finish(self, game: 'Game') -> None:
+        """Shows the results of a finished game"""
+
+
+class NullRenderer(Renderer):
+    """Class NullRenderer. Used by games played only by bots"""
+
+
+class ProfiledRenderer(Renderer):
+    """
+    Class ProfiledRenderer. Times everything one game shows as rendering
+    and passes it on, so a renderer shared by several games is never
+    changed by profiling one of them. Contains attributes:
+
+    :param renderer: The renderer that shows the game
+    :type renderer: 'Renderer'
+    """
+    def __init__(self, renderer: 'Renderer',
+                 profiler: 'PhaseProfiler') -> None:
+        """Initialises the ProfiledRenderer class around the renderer"""
+        self._renderer = renderer
+        for name in vars(Renderer):
+            if not name.startswith('_'):
+                setattr(self, name, profiler.wrap(
+                    'rendering', getattr(renderer, name)))
+
+    @property
+    def renderer(self) -> 'Renderer':
+        return self._renderer
+
+
+class TerminalRenderer(Renderer):
+    """
+    Class TerminalRenderer. Collects messages for the main player and
+    draws frames on the terminal with escape sequences. A frame is a list
+    of regions, only the regions from the first one that changed downwards
+    are drawn again and every frame goes out in a single write.
+    Contains attributes:
+
+    :param main_player: The player sitting at the terminal
+    :type main_player: 'MainPlayer'
+
+    :param stream: The stream the frames are written to
+    :type stream: TextIO
+    """
+    def __init__(self, main_player: 'MainPlayer',
+                 stream: Optional[TextIO] = None) -> None:
+        """Initialises the TerminalRenderer class"""
+        self._main_player = main_player
+        self._stream = stream if stream is not None else sys.stdout
+        self._regions = None
+        if sys.platform == 'win32':
+            from colorama import just_fix_windows_console
+            just_fix_windows_console()
+
+    def clear(self) -> None:
+        """Clears the whole terminal"""
+        self._stream.write(CLEAR_SCREEN + CURSOR_HOME)
+        self._stream.flush()
+        self._regions = None
+
+    def draw(self, regions: List[str]) -> None:
+        """
+        Draws a frame, every region should end with a new line
+        Regions that did not change since the last frame are skipped
+        """
+        size = shutil.get_terminal_size()
+        frame = []
+        changed = self._regions is None or len(regions) != len(self._regions)
+        if not changed:
+            height = sum(count_rows(region, size.columns)
+                         for region in regions)
+            changed = height >= size.lines
+
+        frame.append(CLEAR_SCREEN + CURSOR_HOME if changed else CURSOR_HOME)
+        for index, region in enumerate(regions):
+            if not changed and region == self._regions[index]:
+                rows = count_rows(region, size.columns)
+                if rows:
+                    frame.append(f'\x1b[{rows}E')
+                continue
+            if not changed:
+                frame.append(CLEAR_DOWN)
+                changed = True
+            frame.append(region)
+        frame.append(CLEAR_DOWN)
+
+        self._stream.write(''.join(frame))
+        self._stream.flush()
+        self._regions = list(regions)
+
+    def cards_played(self, player: 'Player', cards: List['Card']) -> None:
+        cards_string = ' and '.join(str(card) for card in cards)
+        hand_size = len(player.hand)
+        makao = "MAKAO! " if player.said_makao and hand_size == 1 else ""
+        self._main_player.add_special_message(f'{makao}{player.name} '
+                                              f'played {cards_string}'
+                                              f'({hand_size} cards left)\n')
+
+    def player_passed(self, player: 'Player') -> None:
+        if player is self._main_player:
+            return
+        message = ''
+        if player.allowed_cards == [] or JACK in player.allowed_cards:
+            message = 'and draws a card '
+
+        hand_size = len(player.hand)
+        self._main_player.add_special_message(f'{player.name} passes '
+                                              f'{message}'
+                                              f'({hand_size} cards left)\n')
+
+    def special_turn(self, player: 'Player') -> None:
+        is_opponent = player is not self._main_player
+        if player.status_effect == Status.BLOCKED:
+            message = ('' if player.blocked_turns == 1
+                       else f' for {player.blocked_turns} turns')
+
+            extra_message = (f'You can play a {describe_values(player.allowed_cards)} to transfer it to the next player\n' # NOQA
+                             if player.blocked_turns == player.total_blocked_turns # NOQA
+                             else '')
+
+            block_message = (f'{player.name} was blocked{message}\n'
+                             if is_opponent
+                             else (f'{Fore.RED}You have been blocked{message}!\n' # NOQA
+                                   f'{extra_message}{Style.RESET_ALL}'))
+        elif player.status_effect == Status.DRAW2OR3:
+            extra_message = f'You can play a {describe_values(player.allowed_cards)} to transfer it to the next player\n' # NOQA
+
+            block_message = (f'{player.name} is about to draw '
+                             f'{player.cards_to_draw} cards\n'
+                             if is_opponent
+                             else (f'{Fore.RED}You are about to draw '
+                                   f'{player.cards_to_draw} cards!\n'
+                                   f'{extra_message}{Style.RESET_ALL}'))
+        elif player.status_effect == Status.DRAW5:
+            extra_message = 'You can play a King to either negate the effect or return it to sender\n' # NOQA
+
+            block_message = (f'{player.name} is about to draw '
+                             f'{player.cards_to_draw} cards\n'
+                             if is_opponent
+                             else (f'{Fore.RED}You are about to draw '
+                                   f'{player.cards_to_draw} cards!\n'
+                                   f'{extra_message}{Style.RESET_ALL}'))
+        else:
+            return
+        self._main_player.add_special_message(block_message)
+
+    def cards_drawn(self, player: 'Player', count: int) -> None:
+        self._main_player.add_special_message(f'{player} drew {count} cards'
+                                              f' (at {len(player.hand)} '
+                                              f'cards) \n')
+
+    def suit_picked(self, player: 'Player', suit: int) -> None:
+        if player is self._main_player:
+            return
+        self._main_player.add_special_message(f'{Fore.RED}{player} has '
+                                              f'picked {SUIT_SYMBOLS[suit-1]} '
+                                              f'as the new suit'
+                                              f'{Style.RESET_ALL}\n')
+
+    def value_picked(self, player: 'Player', value: int) -> None:
+        if player is self._main_player:
+            return
+        self._main_player.add_special_message(f'{Fore.RED}{player} has '
+                                              f'picked {value} as the '
+                                              f'forced card{Style.RESET_ALL}\n')
+
+    def error(self, message: str) -> None:
+        self._main_player.set_error_message(message)
+
+    def end_turn(self) -> None:
+        self._main_player.clear_special_message()
+        self._main_player.clear_error_message()
+
+    def show_turn(self, game: 'Game', player: 'Player') -> str:
+        """
+        Draws the main player the overview of the previous turn
+        and returns the prompt for their choice
+        """
+        main_player = self._main_player
+        additional_information = (main_player.special_message
+                                  + main_player.error_message)
+        if main_player.special_message != '':
+            additional_information += '\n'
+
+        special_message = ''
+        if player.status_effect in [Status.NOEFFECT, Status.FORCESUIT]:
+            special_message = ' and draw a card'
+
+        first_part = str(game.stack) + '\n'
+        second_part = player.get_hand_description()
+        third_part = (f'{len(player.hand)+1} '
+                      f'- Pass your turn{special_message}\n')
+        fourth_part = 'Your option is: '
+
+        # the messages change on almost every prompt, so they are drawn
+        # last and the top card and the hand above them are kept
+        self.draw([first_part, second_part + third_part,
+                   additional_information])
+        return fourth_part
+
+    def finish(self, game: 'Game') -> None:
+        self.clear()
+        self.end_turn()
+        print('The game is finished!\n', file=self._stream)
+        for place, player in enumerate(game.winners, 1):
+            print(f'{ordinal(place)} place - {player}', file=self._stream)
+
+        for player in game.players:
+            if player not in game.winners:
+                print(f'{player} lost :( \n', file=self._stream)
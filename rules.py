@@ -0,0 +1,334 @@
+from card import ALL_CARDS, Suits, ACE, JACK, QUEEN, KING
+from player import Status
+from typing import Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+from enum import IntEnum
+from functools import lru_cache
+import ast
+
+if TYPE_CHECKING:
+    from card import Card
+
+
+# the values a jack can force by the standard rules
+JACK_DEMANDS = (5, 6, 7, 8, 9, 10)
+
+
+class Effect(IntEnum):
+    """The decisions a played card leaves for the game to make"""
+    NONE = 0
+    ACE = 1
+    JACK = 2
+    KING_OF_SPADES = 3
+
+
+class InvalidRulesError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+def _freeze(value):
+    """Turns the lists in a parsed value into tuples"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _literal(value):
+    """Turns suits into plain numbers so the value can be parsed again"""
+    return int(value) if isinstance(value, IntEnum) else value
+
+
+def _is_count(value, low: int = 0, high: Optional[int] = None) -> bool:
+    """Returns True if the value is a whole number in the range"""
+    return (isinstance(value, int) and not isinstance(value, bool)
+            and low <= value and (high is None or value <= high))
+
+
+def _check_values(rules: 'Rules') -> None:
+    """
+    Checks that every rule has a value of the right kind
+    Throws error naming the first rule that does not
+    """
+    penalties = rules.penalty_cards
+    if (not isinstance(penalties, tuple)
+            or not all(isinstance(pair, tuple) and len(pair) == 2
+                       and _is_count(pair[0], ACE, KING)
+                       and _is_count(pair[1]) for pair in penalties)):
+        raise InvalidRulesError('penalty_cards has to be (value, cards) '
+                                'pairs of values from 1 to 13')
+    if len({value for value, _ in penalties}) != len(penalties):
+        raise InvalidRulesError('A value can only penalise once')
+    if not _is_count(rules.block_value, ACE, KING):
+        raise InvalidRulesError('block_value has to be from 1 to 13')
+    for name in ('forward_king', 'backward_king'):
+        suit = getattr(rules, name)
+        if suit is not None and not (_is_count(suit)
+                                     and suit in tuple(Suits)):
+            raise InvalidRulesError(f'{name} has to be a suit from 1 to 4 '
+                                    f'or None')
+    if (not isinstance(rules.jack_demands, tuple)
+            or not all(_is_count(value, ACE, KING)
+                       for value in rules.jack_demands)):
+        raise InvalidRulesError('jack_demands has to be values '
+                                'from 1 to 13')
+    for name in ('king_draw', 'makao_penalty'):
+        if not _is_count(getattr(rules, name)):
+            raise InvalidRulesError(f'{name} cannot be negative')
+    for name in ('queen_on_anything', 'anything_on_queen'):
+        if not isinstance(getattr(rules, name), bool):
+            raise InvalidRulesError(f'{name} has to be True or False')
+
+
+class Rules(NamedTuple):
+    """
+    The house rules a table plays by, the standard rules by default.
+    Every variant is compiled into lookup tables by compile_rules
+    before a game is dealt, so the rules cost nothing during play
+
+    :param penalty_cards: The values that make the next player draw
+    and how many cards they draw, as (value, cards) pairs
+    :type penalty_cards: Tuple[Tuple[int, int]]
+
+    :param block_value: The value that blocks the next player for a turn
+    :type block_value: int
+
+    :param forward_king: The suit of the king that makes the next player
+    draw, None if no king does
+    :type forward_king: int
+
+    :param backward_king: The suit of the king that makes the previous
+    player draw, None if no king does
+    :type backward_king: int
+
+    :param king_draw: The number of cards a king makes a player draw
+    :type king_draw: int
+
+    :param jack_demands: The values a jack can force
+    :type jack_demands: Tuple[int]
+
+    :param queen_on_anything: Whether a queen can be put on any card
+    :type queen_on_anything: bool
+
+    :param anything_on_queen: Whether any card can be put on a queen
+    :type anything_on_queen: bool
+
+    :param makao_penalty: The number of cards drawn for not saying makao
+    :type makao_penalty: int
+    """
+    penalty_cards: Tuple[Tuple[int, int], ...] = ((2, 2), (3, 3))
+    block_value: int = 4
+    forward_king: Optional[int] = Suits.HEARTS
+    backward_king: Optional[int] = Suits.SPADES
+    king_draw: int = 5
+    jack_demands: Tuple[int, ...] = JACK_DEMANDS
+    queen_on_anything: bool = True
+    anything_on_queen: bool = True
+    makao_penalty: int = 5
+
+    @classmethod
+    def parse(cls, text: str) -> 'Rules':
+        """
+        Returns the standard rules changed by a description like
+        'king_draw=3;jack_demands=(5, 6, 7)', fields separated by
+        semicolons and values written as Python literals
+        Throws error if a field does not exist, cannot be read
+        or has a value of the wrong kind
+        """
+        changes = {}
+        for field in filter(None, text.split(';')):
+            name, _, value = field.partition('=')
+            name = name.strip()
+            if name not in cls._fields:
+                raise InvalidRulesError(f'There is no rule called {name}')
+            try:
+                changes[name] = _freeze(ast.literal_eval(value.strip()))
+            except (ValueError, SyntaxError):
+                raise InvalidRulesError(f'{value} is not a valid value '
+                                        f'for {name}')
+        rules = cls(**changes)
+        _check_values(rules)
+        return rules
+
+    def describe(self) -> str:
+        """Returns the rules that differ from the standard ones"""
+        standard = Rules()
+        changes = [f'{name}={_literal(value)!r}' for name, value
+                   in zip(self._fields, self) if value != getattr(
+                       standard, name)]
+        return ';'.join(changes) or 'standard'
+
+
+class RuleBook:
+    """
+    Class RuleBook. The rules of a game compiled into tables
+    indexed by card code. Contains attributes:
+
+    :param rules: The rules the tables were compiled from
+    :type rules: 'Rules'
+
+    :param compatibility: For every card the mask of the cards that can be
+    put on it, bit n is set if the card with code n can
+    :type compatibility: Tuple[int]
+
+    :param special: Whether every card has a special effect
+    :type special: Tuple[bool]
+
+    :param statuses: The status every card gives, NOEFFECT if none
+    :type statuses: Tuple[int]
+
+    :param draws: The number of cards every card makes a player draw
+    :type draws: Tuple[int]
+
+    :param backward: Whether every card affects the previous player
+    instead of the next one
+    :type backward: Tuple[bool]
+
+    :param effects: The decision every card leaves for the game to make
+    :type effects: Tuple['Effect']
+
+    :param answers: The values a player can answer every status with
+    :type answers: Dict[int, List[int]]
+    """
+    def __init__(self, rules: 'Rules') -> None:
+        """
+        Initialises the RuleBook class by compiling the rules
+        Throws error if a rule has a value of the wrong kind
+        or the rules are not consistent
+        """
+        _check_values(rules)
+        penalties = dict(rules.penalty_cards)
+        effect_values = {rules.block_value, *penalties}
+        kings_penalise = (rules.forward_king is not None
+                          or rules.backward_king is not None)
+        if effect_values & {ACE, JACK, QUEEN, KING}:
+            raise InvalidRulesError('Aces, jacks, queens and kings '
+                                    'keep their own effects')
+        if rules.block_value in penalties:
+            raise InvalidRulesError('A card cannot both block and penalise')
+        if (not rules.jack_demands
+                or set(rules.jack_demands) & (effect_values
+                                                | {ACE, JACK, QUEEN})
+                or (KING in rules.jack_demands and kings_penalise)):
+            raise InvalidRulesError('A jack can only force cards '
+                                    'without an effect')
+        if (rules.forward_king is not None
+                and rules.forward_king == rules.backward_king):
+            raise InvalidRulesError('A king cannot penalise both ways')
+
+        self._rules = rules
+        statuses = []
+        draws = []
+        backward = []
+        effects = []
+        for card in ALL_CARDS:
+            status, effect = Status.NOEFFECT, Effect.NONE
+            draw, back = 0, False
+            if card.value in penalties:
+                status, draw = Status.DRAW2OR3, penalties[card.value]
+            elif card.value == rules.block_value:
+                status = Status.BLOCKED
+            elif card.value == JACK:
+                status, effect = Status.FORCESUIT, Effect.JACK
+            elif card.value == ACE:
+                effect = Effect.ACE
+            elif card.value == KING and card.suit == rules.forward_king:
+                status, draw = Status.DRAW5, rules.king_draw
+            elif card.value == KING and card.suit == rules.backward_king:
+                status, draw = Status.DRAW5, rules.king_draw
+                back, effect = True, Effect.KING_OF_SPADES
+            statuses.append(status)
+            draws.append(draw)
+            backward.append(back)
+            effects.append(effect)
+        self._statuses = tuple(statuses)
+        self._draws = tuple(draws)
+        self._backward = tuple(backward)
+        self._effects = tuple(effects)
+        queen = rules.queen_on_anything or rules.anything_on_queen
+        self._special = tuple(
+            status != Status.NOEFFECT or effect != Effect.NONE
+            or (card.value == QUEEN and queen)
+            for card, status, effect in zip(ALL_CARDS, statuses, effects))
+        self._compatibility = tuple(
+            sum(1 << card.code for card in ALL_CARDS
+                if self._fits(card, top)) for top in ALL_CARDS)
+        self._answers = {
+            Status.BLOCKED: [rules.block_value],
+            Status.DRAW2OR3: sorted(penalties),
+            Status.DRAW5: [KING],
+        }
+
+    def _fits(self, card: 'Card', top: 'Card') -> bool:
+        """Returns True if the card can be put on the top card"""
+        return (card.value == top.value or card.suit == top.suit
+                or (card.value == QUEEN and self._rules.queen_on_anything)
+                or (top.value == QUEEN and self._rules.anything_on_queen))
+
+    @property
+    def rules(self) -> 'Rules':
+        return self._rules
+
+    @property
+    def compatibility(self) -> Tuple[int, ...]:
+        return self._compatibility
+
+    @property
+    def special(self) -> Tuple[bool, ...]:
+        return self._special
+
+    @property
+    def statuses(self) -> Tuple[int, ...]:
+        return self._statuses
+
+    @property
+    def draws(self) -> Tuple[int, ...]:
+        return self._draws
+
+    @property
+    def backward(self) -> Tuple[bool, ...]:
+        return self._backward
+
+    @property
+    def effects(self) -> Tuple['Effect', ...]:
+        return self._effects
+
+    @property
+    def answers(self) -> Dict[int, List[int]]:
+        return self._answers
+
+    @property
+    def jack_demands(self) -> Tuple[int, ...]:
+        return self._rules.jack_demands
+
+    @property
+    def makao_penalty(self) -> int:
+        return self._rules.makao_penalty
+
+    def describe_demands(self) -> str:
+        """Returns the values a jack can force for a prompt"""
+        demands = sorted(self.jack_demands)
+        if demands == list(range(demands[0], demands[-1] + 1)):
+            return f'from {demands[0]} to {demands[-1]}'
+        return (', '.join(str(value) for value in demands[:-1])
+                + f' or {demands[-1]}')
+
+
+@lru_cache(maxsize=None)
+def _compile_frozen(rules: 'Rules') -> 'RuleBook':
+    """Returns the rules compiled into tables, only once per variant"""
+    return RuleBook(rules)
+
+
+def compile_rules(rules: 'Rules' = Rules()) -> 'RuleBook':
+    """
+    Returns the rules compiled into tables. Every variant is only
+    compiled once, games played by the same rules share their tables.
+    Lists in the rules are read as tuples
+    Throws error if the rules are not valid
+    """
+    rules = Rules._make(_freeze(value) for value in rules)
+    _check_values(rules)
+    return _compile_frozen(rules)
+
+
+STANDARD_RULES = compile_rules(Rules())
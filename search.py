@@ -0,0 +1,231 @@
+from controller import PlayerController
+from player import Player, Status
+from card import Card, JACK
+from typing import List, Optional, TYPE_CHECKING
+from math import log, sqrt
+import random
+import time
+
+if TYPE_CHECKING:
+    from game import Game
+    from game_state import GameState
+
+
+class RolloutController(PlayerController):
+    """
+    Class RolloutController. A cheap random policy used to finish
+    the games simulated during a search. Works for any kind of player
+
+    :param rng: The random number generator picking the moves
+    :type rng: random.Random
+    """
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        """Initialises the RolloutController class"""
+        self._rng = rng if rng is not None else random.Random()
+
+    def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        hand = player.hand
+        if player.allowed_cards != []:
+            forcesuit = player.status_effect == Status.FORCESUIT
+            playable = [index for index, card in enumerate(hand)
+                        if card.value in player.allowed_cards
+                        or (forcesuit and card.value == JACK)]
+        else:
+            legal = game.stack.legal_cards(player.hand_mask)
+            playable = ([index for index, card in enumerate(hand)
+                         if legal >> card.code & 1] if legal else [])
+        if not playable:
+            return [len(hand)]
+        if len(hand) == 2:
+            player.set_said_makao()
+        return [playable[self._rng.randrange(len(playable))]]
+
+    def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        return max(range(1, 5), key=player.count_suit)
+
+    def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        return max(game.rules.jack_demands, key=player.count_value)
+
+    def get_first_save(self, game: 'Game', player: 'Player',
+                       card: 'Card') -> int:
+        return 1
+
+
+class ScriptedController(PlayerController):
+    """
+    Class ScriptedController. Plays the given moves first
+    and then leaves every decision to another controller
+    """
+    def __init__(self, moves: List[List[int]],
+                 fallback: 'PlayerController') -> None:
+        """Initialises the ScriptedController class"""
+        self._moves = list(moves)
+        self._fallback = fallback
+
+    def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        if self._moves:
+            return self._moves.pop(0)
+        return self._fallback.get_moves(game, player)
+
+    def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        return self._fallback.get_ace_suit(game, player)
+
+    def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        return self._fallback.get_jack_value(game, player)
+
+    def get_first_save(self, game: 'Game', player: 'Player',
+                       card: 'Card') -> int:
+        return self._fallback.get_first_save(game, player, card)
+
+
+class MonteCarloController(PlayerController):
+    """
+    Class MonteCarloController. Picks moves with a Monte Carlo search:
+    every rollout deals the cards the player cannot see at random,
+    plays one of the legal moves and finishes the game with a cheap
+    policy. Moves are picked for rollouts with the UCB1 formula.
+    Contains attributes:
+
+    :param time_budget: Seconds the search may take per move, None for
+    no time limit
+    :type time_budget: float
+
+    :param max_rollouts: The number of rollouts per move, None for no limit
+    :type max_rollouts: int
+
+    :param rollout_turns: The number of turns a rollout is played for
+    :type rollout_turns: int
+
+    :param max_combo_length: The longest card sequence that is considered
+    :type max_combo_length: int
+    """
+    def __init__(self, time_budget: Optional[float] = 0.05,
+                 max_rollouts: Optional[int] = None,
+                 rollout_turns: int = 200, max_combo_length: int = 3,
+                 exploration: float = 1.4,
+                 rng: Optional[random.Random] = None) -> None:
+        """
+        Initialises the MonteCarloController class
+        Throws error if the search has neither a time nor a rollout limit
+        """
+        if time_budget is None and max_rollouts is None:
+            raise ValueError('The search needs a time or a rollout limit')
+        self._time_budget = time_budget
+        self._max_rollouts = max_rollouts
+        self._rollout_turns = rollout_turns
+        self._max_combo_length = max_combo_length
+        self._exploration = exploration
+        self._rng = rng if rng is not None else random.Random()
+        self._policy = RolloutController(self._rng)
+
+    @property
+    def time_budget(self) -> Optional[float]:
+        return self._time_budget
+
+    @property
+    def max_rollouts(self) -> Optional[int]:
+        return self._max_rollouts
+
+    def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        if game.get_current_player() is not player:
+            return self._policy.get_moves(game, player)
+
+        moves = list(player.legal_moves(game.stack, self._max_combo_length))
+        move = moves[0] if len(moves) == 1 else self.search(game, player,
+                                                            moves)
+        if move[0] != len(player.hand) and len(player.hand) - len(move) == 1:
+            player.set_said_makao()
+        return move
+
+    def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        return self._policy.get_ace_suit(game, player)
+
+    def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        return self._policy.get_jack_value(game, player)
+
+    def get_first_save(self, game: 'Game', player: 'Player',
+                       card: 'Card') -> int:
+        return 1
+
+    def search(self, game: 'Game', player: 'Player',
+               moves: List[List[int]]) -> List[int]:
+        """Returns the move with the most rollouts once the budget is spent"""
+        seat = game.get_player_index(player)
+        state = game.snapshot()
+        sim = game.clone([self._policy] * len(game.players))
+        visits = [0] * len(moves)
+        totals = [0.0] * len(moves)
+        deadline = None
+        if self._time_budget is not None:
+            deadline = time.perf_counter() + self._time_budget
+
+        rollouts = 0
+        while True:
+            if (self._max_rollouts is not None
+               and rollouts >= self._max_rollouts):
+                break
+            if (deadline is not None and rollouts >= len(moves)
+               and time.perf_counter() >= deadline):
+                break
+
+            if rollouts < len(moves):
+                choice = rollouts
+            else:
+                spread = self._exploration * sqrt(log(rollouts))
+                choice = max(range(len(moves)),
+                             key=lambda i: (totals[i] / visits[i]
+                                            + spread / sqrt(visits[i])))
+            totals[choice] += self.rollout(sim, state, seat, moves[choice])
+            visits[choice] += 1
+            rollouts += 1
+
+        best = max(range(len(moves)), key=lambda i: (visits[i], totals[i]))
+        return moves[best]
+
+    def rollout(self, sim: 'Game', state: 'GameState', seat: int,
+                move: List[int]) -> float:
+        """
+        Plays out a single random deal of the state after the move is made
+        The simulated game is reset to the state before every rollout
+        """
+        sim.restore(self.determinize(state, seat))
+        player = sim.players[seat]
+        sim.set_controller(player, ScriptedController([move], self._policy))
+        sim.run(self._rollout_turns)
+        return self.evaluate(sim, player)
+
+    def determinize(self, state: 'GameState', seat: int) -> 'GameState':
+        """
+        Returns the state with the cards the player in the seat cannot see
+        dealt at random, every other player keeps the number of cards
+        they hold
+        """
+        players = list(state.players)
+        others = [index for index in range(len(players)) if index != seat]
+        hidden = list(state.deck)
+        for index in others:
+            hidden.extend(players[index].hand)
+        self._rng.shuffle(hidden)
+
+        start = 0
+        for index in others:
+            size = len(players[index].hand)
+            players[index] = players[index]._replace(
+                hand=tuple(hidden[start:start + size]))
+            start += size
+        return state._replace(players=tuple(players),
+                              deck=tuple(hidden[start:]))
+
+    @staticmethod
+    def evaluate(game: 'Game', player: 'Player') -> float:
+        """
+        Scores the end of a rollout from 0 to 1
+        Unfinished games are scored by the size of the player's hand
+        """
+        if player in game.winners:
+            return 1 - game.winners.index(player) / len(game.players)
+        if game.is_finished():
+            return 0.0
+        fewest = min(len(other.hand) for other in game.players
+                     if not other.won)
+        return 0.5 * fewest / max(len(player.hand), 1)
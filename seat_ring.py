@@ -0,0 +1,69 @@
+from player import Player
+from typing import Dict, List, Optional
+
+
+class SeatRing:
+    """
+    Class SeatRing. Knows the seat of every player and, for every seat,
+    the next and the previous seat still taking turns, skipping blocked
+    players and players who have won. The players tell the ring when
+    that changes and the tables are rebuilt on the next lookup,
+    so every lookup in between is a single list access.
+    Contains attributes:
+
+    :param players: The players in seat order
+    :type players: List['Player']
+    """
+    def __init__(self, players: List['Player']) -> None:
+        """Initialises the SeatRing class and joins the players to it"""
+        self._players = list(players)
+        self._seats: Dict['Player', int] = {
+            player: seat for seat, player in enumerate(self._players)}
+        self._next: Optional[List[int]] = None
+        self._prev: Optional[List[int]] = None
+        for player in self._players:
+            player.set_seat_ring(self)
+
+    def seat_of(self, player: 'Player') -> Optional[int]:
+        """Returns the player's seat, None if they are not at the table"""
+        return self._seats.get(player)
+
+    def invalidate(self) -> None:
+        """Marks the tables as outdated after a player's status changed"""
+        self._next = None
+
+    def rebuild(self) -> None:
+        """
+        Rebuilds the next and previous tables. With nobody taking turns
+        the neighbouring seats are used
+        """
+        size = len(self._players)
+        active = [player.active for player in self._players]
+        if not any(active):
+            active = [True] * size
+        self._next = [0] * size
+        self._prev = [0] * size
+        following = None
+        for position in range(2 * size - 1, -1, -1):
+            seat = position % size
+            self._next[seat] = following
+            if active[seat]:
+                following = seat
+        preceding = None
+        for position in range(2 * size):
+            seat = position % size
+            self._prev[seat] = preceding
+            if active[seat]:
+                preceding = seat
+
+    def next_seat(self, seat: int) -> int:
+        """Returns the first seat after the given one taking turns"""
+        if self._next is None:
+            self.rebuild()
+        return self._next[seat]
+
+    def prev_seat(self, seat: int) -> int:
+        """Returns the first seat before the given one taking turns"""
+        if self._next is None:
+            self.rebuild()
+        return self._prev[seat]
@@ -0,0 +1,493 @@
+from game import Game, MAX_OPPONENTS
+from controller import (AsyncPlayerController, InvalidDecisionError,
+                        OpponentController, TimedController)
+from events import Event, EventType
+from card import Card
+from typing import Dict, List, Optional, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import itertools
+import json
+import random
+
+if TYPE_CHECKING:
+    from player import Player
+
+
+# events that show the cards to everyone, the rest only to their seat
+PUBLIC_CARDS = (EventType.CARD_PLAYED,)
+# decisions are sent as questions, not as events
+HIDDEN_EVENTS = (EventType.MOVE, EventType.FIRST_SAVE)
+
+
+class ProtocolError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+def encode_message(message: Dict) -> bytes:
+    """Returns a message as a single line of JSON"""
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+def decode_message(line: bytes) -> Dict:
+    """
+    Returns the message sent in a line of JSON
+    Throws error if the line is not a JSON object with a type
+    """
+    try:
+        message = json.loads(line)
+    except ValueError:
+        raise ProtocolError('Every line has to be a JSON object')
+    if not isinstance(message, dict) or 'type' not in message:
+        raise ProtocolError('Every message needs a type')
+    return message
+
+
+def describe_turn(game: 'Game', player: 'Player') -> Dict:
+    """Returns what a player can see when they are asked for a decision"""
+    return {
+        'turn': game.turn_num,
+        'seat': game.get_player_index(player),
+        'hand': [card.code for card in player.hand],
+        'top': game.stack.top_card.code,
+        'forced_suit': game.stack.forced_suit,
+        'forced_value': game.stack.forced_value,
+        'allowed': list(player.allowed_cards),
+        'hands': [len(other.hand) for other in game.players],
+    }
+
+
+def describe_event(event: 'Event', seat: int) -> Dict:
+    """Returns an event the way the player at the given seat sees it"""
+    message = {'type': 'event', 'event': event.type.name,
+               'turn': event.turn, 'seat': event.seat,
+               'count': len(event.cards), 'value': event.value}
+    if event.type in PUBLIC_CARDS or event.seat == seat:
+        message['cards'] = list(event.cards)
+    return message
+
+
+class Connection:
+    """
+    Class Connection. A single client connected to the server.
+    Sending is only done from the event loop, answers are read
+    by listen and handed to whoever is waiting in ask.
+    Contains attributes:
+
+    :param name: The name the client joined with
+    :type name: str
+    """
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter, name: str) -> None:
+        """Initialises the Connection class"""
+        self._reader = reader
+        self._writer = writer
+        self._name = name
+        self._answers = asyncio.Queue()
+        self._closed = False
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def send(self, message: Dict) -> None:
+        """Sends a message unless the client has gone away"""
+        if not self._closed:
+            self._writer.write(encode_message(message))
+
+    async def ask(self, message: Dict) -> Dict:
+        """
+        Sends a question and waits for the answer to it
+        Throws error if the client goes away before answering
+        """
+        while not self._answers.empty():
+            if self._answers.get_nowait() is None:
+                self._answers.put_nowait(None)
+                break
+        self.send(message)
+        answer = await self._answers.get()
+        if answer is None:
+            self._answers.put_nowait(None)
+            raise ConnectionError(f'{self._name} has disconnected')
+        return answer
+
+    async def listen(self) -> None:
+        """Reads answers until the client disconnects"""
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                try:
+                    message = decode_message(line)
+                except ProtocolError as e:
+                    self.send({'type': 'error', 'message': str(e)})
+                    continue
+                if message['type'] == 'answer':
+                    self._answers.put_nowait(message)
+        except ConnectionError:
+            pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Disconnects the client, bots take over its decisions"""
+        if self._closed:
+            return
+        self._closed = True
+        self._answers.put_nowait(None)
+        self._writer.close()
+
+
+class RemoteController(AsyncPlayerController):
+    """
+    Class RemoteController. Sends every decision to a client and awaits
+    the answer. Throws error if the client has gone away or sent
+    an answer that cannot be used, so whoever awaits it can decide
+    another way. The words said with the last moves are kept
+    until the table's thread takes them, the game is never changed
+    from the event loop.
+    Contains attributes:
+
+    :param connection: The client playing the seat
+    :type connection: 'Connection'
+    """
+    def __init__(self, connection: 'Connection') -> None:
+        """Initialises the RemoteController class"""
+        self._connection = connection
+        self._last_moves_turn = None
+        self._said: List[str] = []
+
+    @property
+    def connection(self) -> 'Connection':
+        return self._connection
+
+    def take_said(self) -> List[str]:
+        """Returns the words said with the last moves and forgets them"""
+        said, self._said = self._said, []
+        return said
+
+    async def ask(self, game: 'Game', player: 'Player', decision: str,
+                  **details) -> Dict:
+        """
+        Returns the client's answer to a decision
+        Throws error if the client has gone away
+        """
+        if self._connection.closed:
+            raise ConnectionError(f'{self._connection.name} has disconnected')
+        return await self._connection.ask({
+            'type': 'ask', 'decision': decision,
+            **describe_turn(game, player), **details})
+
+    async def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        self._said = []
+        retry = self._last_moves_turn == game.turn_num
+        self._last_moves_turn = game.turn_num
+        answer = await self.ask(game, player, 'moves', retry=retry)
+        moves = answer.get('moves')
+        if (not isinstance(moves, list) or not moves
+                or not all(isinstance(move, int) for move in moves)):
+            raise InvalidDecisionError('Moves have to be a list of indexes')
+        said = answer.get('say', [])
+        if (not isinstance(said, list)
+                or not all(isinstance(word, str) for word in said)):
+            raise InvalidDecisionError('Words have to be a list of strings')
+        self._said = [word for word in said if word in ('MAKAO', 'STOP')]
+        return moves
+
+    async def get_ace_suit(self, game: 'Game', player: 'Player') -> int:
+        answer = await self.ask(game, player, 'ace_suit')
+        if answer.get('value') not in range(1, 5):
+            raise InvalidDecisionError('The suit has to be from 1 to 4')
+        return answer['value']
+
+    async def get_jack_value(self, game: 'Game', player: 'Player') -> int:
+        answer = await self.ask(game, player, 'jack_value')
+        if answer.get('value') not in game.rules.jack_demands:
+            raise InvalidDecisionError(f'The value has to be '
+                                       f'{game.rules.describe_demands()}')
+        return answer['value']
+
+    async def get_first_save(self, game: 'Game', player: 'Player',
+                             card: 'Card') -> int:
+        answer = await self.ask(game, player, 'first_save', card=card.code)
+        if answer.get('value') not in (0, 1):
+            raise InvalidDecisionError('The choice has to be 0 or 1')
+        return answer['value']
+
+
+class RemoteSeatController(TimedController):
+    """
+    Class RemoteSeatController. Plays a client's seat from the table's
+    thread, waiting for the RemoteController with a time limit and
+    saying the words the client sent with its moves on that thread
+    """
+    def get_moves(self, game: 'Game', player: 'Player') -> List[int]:
+        moves = super().get_moves(game, player)
+        for word in self.controller.take_said():
+            game.handle_special_inputs(player, word)
+        return moves
+
+
+class Table:
+    """
+    Class Table. A single game hosted by the server, the clients take
+    the first seats and bots fill the rest.
+    Contains attributes:
+
+    :param table_id: The number the server gave the table
+    :type table_id: int
+
+    :param connections: The clients sitting at the table
+    :type connections: List['Connection']
+
+    :param game: The game played at the table
+    :type game: 'Game'
+    """
+    def __init__(self, table_id: int, connections: List['Connection'],
+                 num_of_players: int, seed: int,
+                 loop: asyncio.AbstractEventLoop,
+                 timeout: Optional[float] = None) -> None:
+        """
+        Initialises the Table class and deals the game
+        A client that does not decide within the timeout
+        has the decision made by a bot
+        """
+        self._table_id = table_id
+        self._connections = connections
+        self._loop = loop
+        controllers = [RemoteSeatController(RemoteController(connection),
+                                            timeout,
+                                            fallback=OpponentController(),
+                                            loop=loop)
+                       for connection in connections]
+        controllers += [OpponentController() for _ in
+                        range(num_of_players - len(connections))]
+        self._game = Game.headless(num_of_players, controllers, seed)
+        self._game.subscribe(
+            self.broadcast,
+            [event_type for event_type in EventType
+             if event_type not in HIDDEN_EVENTS])
+
+    @property
+    def table_id(self) -> int:
+        return self._table_id
+
+    @property
+    def connections(self) -> List['Connection']:
+        return self._connections
+
+    @property
+    def game(self) -> 'Game':
+        return self._game
+
+    def broadcast(self, event: 'Event') -> None:
+        """Passes an event on to every client at the table"""
+        for seat, connection in enumerate(self._connections):
+            self._loop.call_soon_threadsafe(
+                connection.send, describe_event(event, seat))
+
+    def announce(self) -> None:
+        """Tells every client at the table its seat, from the event loop"""
+        for seat, connection in enumerate(self._connections):
+            connection.send({'type': 'start', 'table': self._table_id,
+                             'seat': seat, 'seed': self._game.seed,
+                             'players': len(self._game.players)})
+
+    def play(self, max_turns: Optional[int] = None) -> int:
+        """
+        Plays the whole game, blocking the calling thread
+        The clients are told the game has started once a thread
+        picks it up, before any of its events reach them
+        Returns the number of turns that were played
+        """
+        self._loop.call_soon_threadsafe(self.announce)
+        return self._game.run(max_turns)
+
+
+class GameServer:
+    """
+    Class GameServer. Hosts many tables over TCP with a JSON line
+    protocol. Every table is played in its own worker thread while
+    the event loop only moves messages, so a client that stalls
+    holds up its own table and only until its decision times out.
+    Contains attributes:
+
+    :param table_size: The number of seats at every table
+    :type table_size: int
+
+    :param wait: The seconds a table waits for more clients
+    before bots fill the empty seats
+    :type wait: float
+
+    :param max_tables: The number of tables played at the same time
+    :type max_tables: int
+
+    :param timeout: The seconds a client has for every decision
+    :type timeout: Optional[float]
+    """
+    def __init__(self, table_size: int = 4, wait: float = 10.0,
+                 max_tables: int = 256, seed: Optional[int] = None,
+                 max_turns: int = 10000,
+                 timeout: Optional[float] = 30.0) -> None:
+        """
+        Initialises the GameServer class
+        Throws error if the table size is invalid
+        """
+        if table_size < 2 or table_size > MAX_OPPONENTS + 1:
+            raise ValueError(f'A table needs from 2 to {MAX_OPPONENTS + 1} '
+                             f'seats')
+        self._table_size = table_size
+        self._wait = wait
+        self._max_turns = max_turns
+        self._timeout = timeout
+        self._rng = random.Random(seed)
+        self._executor = ThreadPoolExecutor(max_workers=max_tables)
+        self._table_ids = itertools.count(1)
+        self._waiting: List['Connection'] = []
+        self._timer = None
+        self._tables = set()
+        self._connections = set()
+        self._server = None
+
+    @property
+    def table_size(self) -> int:
+        return self._table_size
+
+    @property
+    def tables(self) -> int:
+        return len(self._tables)
+
+    async def start(self, host: str = '127.0.0.1',
+                    port: int = 0) -> asyncio.AbstractServer:
+        """Starts accepting clients and returns the listening server"""
+        self._server = await asyncio.start_server(self.handle_client,
+                                                  host, port)
+        return self._server
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """Seats a client that has just connected and reads its answers"""
+        try:
+            message = decode_message(await reader.readline())
+            if message['type'] != 'join':
+                raise ProtocolError('The first message has to be a join')
+        except (ProtocolError, ConnectionError) as e:
+            writer.write(encode_message({'type': 'error',
+                                         'message': str(e)}))
+            writer.close()
+            return
+        connection = Connection(reader, writer,
+                                str(message.get('name', 'Player')))
+        self._connections.add(connection)
+        self.seat(connection)
+        try:
+            await connection.listen()
+        finally:
+            self._connections.discard(connection)
+
+    def seat(self, connection: 'Connection') -> None:
+        """Puts a client at the open table, starting it once it is full"""
+        self._waiting.append(connection)
+        if len(self._waiting) >= self._table_size:
+            self.open_table()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._wait, self.open_table)
+
+    def open_table(self) -> None:
+        """Starts a table with the waiting clients and bots"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        connections = [connection for connection in self._waiting
+                       if not connection.closed]
+        self._waiting = []
+        if not connections:
+            return
+        table = Table(next(self._table_ids), connections, self._table_size,
+                      self._rng.getrandbits(64), asyncio.get_running_loop(),
+                      self._timeout)
+        task = asyncio.get_running_loop().create_task(self.run_table(table))
+        self._tables.add(task)
+        task.add_done_callback(self._tables.discard)
+
+    async def run_table(self, table: 'Table') -> int:
+        """
+        Plays a table in a worker thread and reports the results
+        Tables past the limit wait for a free thread before they start
+        A table that fails still tells its clients it has finished,
+        with the error and the results so far
+        """
+        error = None
+        try:
+            turns = await asyncio.get_running_loop().run_in_executor(
+                self._executor, table.play, self._max_turns)
+        except Exception as e:
+            turns = table.game.turn_num
+            error = f'The table has stopped: {e}'
+        winners = [table.game.get_player_index(player)
+                   for player in table.game.winners]
+        message = {'type': 'finished', 'table': table.table_id,
+                   'turns': turns, 'winners': winners}
+        if error is not None:
+            message['error'] = error
+        for connection in table.connections:
+            connection.send(message)
+        return turns
+
+    async def close(self) -> None:
+        """
+        Stops accepting clients and waits for the tables to finish,
+        bots take over from every client that is still connected
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._waiting:
+            self.open_table()
+        for connection in list(self._connections):
+            connection.close()
+        if self._tables:
+            await asyncio.gather(*self._tables)
+        self._executor.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='makao serve',
+        description='Hosts games for clients speaking JSON lines over TCP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--table-size', type=int, default=4)
+    parser.add_argument('--wait', type=float, default=10.0,
+                        help='seconds before bots fill an open table')
+    parser.add_argument('--max-tables', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='seconds a client has for every decision')
+    args = parser.parse_args(argv)
+
+    async def serve() -> None:
+        server = GameServer(args.table_size, args.wait, args.max_tables,
+                            args.seed, timeout=args.timeout)
+        listening = await server.start(args.host, args.port)
+        try:
+            await listening.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
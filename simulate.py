@@ -0,0 +1,278 @@
+from game import Game
+from game_log import GameLogWriter, append_games
+from profiler import PhaseProfiler
+from events import Event, EventType
+from card import Card, Suits, KING
+from rules import Rules, RuleBook, InvalidRulesError, STANDARD_RULES
+from typing import Dict, Iterator, List, Optional
+from multiprocessing import Pool
+import argparse
+import json
+import sys
+
+
+SPECIAL_CARD_NAMES = {11: 'J', 12: 'Q', 1: 'A'}
+SUIT_NAMES = {Suits.SPADES: '♠', Suits.DIAMONDS: '♦',
+              Suits.CLUBS: '♣', Suits.HEARTS: '♥'}
+
+
+def special_card_name(suit: int, value: int,
+                      rules: 'RuleBook' = STANDARD_RULES) -> Optional[str]:
+    """
+    Returns the name a special card is reported under
+    Returns None if the card has no special effect under the rules
+    """
+    if not Card(suit, value).is_special(rules):
+        return None
+    if value == KING:
+        return f'K{SUIT_NAMES[suit]}'
+    return SPECIAL_CARD_NAMES.get(value, str(value))
+
+
+def play_game(task: tuple) -> Dict:
+    """
+    Plays a single game with only opponents and returns its results
+    The task is a (seed, number of players, turn limit, log, profile,
+    rules) tuple, if log is True the game is also returned in the binary
+    log format and if profile is True the time spent in every phase of
+    its turns is returned too. None as the rules plays the standard ones
+    """
+    seed, num_of_players, max_turns, log, profile, rules = task
+    profiler = PhaseProfiler() if profile else None
+    game = Game.headless(num_of_players, seed=seed, profiler=profiler,
+                         rules=rules)
+    writer = GameLogWriter() if log else None
+    if writer is not None:
+        writer.attach(game)
+    specials = {}
+
+    def count_specials(event: 'Event') -> None:
+        for code in event.cards:
+            card = Card.from_code(code)
+            name = special_card_name(card.suit, card.value, game.rules)
+            if name is not None:
+                specials[name] = specials.get(name, 0) + 1
+
+    game.subscribe(count_specials, [EventType.CARD_PLAYED])
+    game.run(max_turns)
+    record = writer.detach(game) if writer is not None else None
+
+    first_seat = None
+    if game.winners:
+        first_seat = game.get_player_index(game.winners[0])
+
+    return {
+        'seed': seed,
+        'rules': rules,
+        'finished': game.is_finished(),
+        'turns': game.turn_num,
+        'first_seat': first_seat,
+        'specials': specials,
+        'log': record,
+        'profile': profiler.as_dict() if profiler is not None else None,
+    }
+
+
+class SimulationResults:
+    """
+    Class SimulationResults. Aggregates the results of simulated games
+
+    :param num_of_players: The number of players at every table
+    :type num_of_players: int
+
+    :param profiler: The phase timings of all profiled games
+    :type profiler: 'PhaseProfiler'
+    """
+    def __init__(self, num_of_players: int) -> None:
+        """Initialises the SimulationResults class"""
+        self._num_of_players = num_of_players
+        self._games = 0
+        self._unfinished = 0
+        self._total_turns = 0
+        self._wins = [0] * num_of_players
+        self._specials = {}
+        self._profiler = PhaseProfiler()
+
+    @property
+    def games(self) -> int:
+        return self._games
+
+    @property
+    def unfinished(self) -> int:
+        return self._unfinished
+
+    @property
+    def wins(self) -> List[int]:
+        return self._wins
+
+    @property
+    def specials(self) -> Dict[str, int]:
+        return self._specials
+
+    @property
+    def profiler(self) -> 'PhaseProfiler':
+        return self._profiler
+
+    @property
+    def average_turns(self) -> float:
+        return self._total_turns / self._games if self._games else 0.0
+
+    def win_rates(self) -> List[float]:
+        """Returns how often each seat finished first"""
+        if not self._games:
+            return [0.0] * self._num_of_players
+        return [wins / self._games for wins in self._wins]
+
+    def add_game(self, result: Dict) -> None:
+        """Adds the result of a single game to the totals"""
+        self._games += 1
+        self._total_turns += result['turns']
+        if not result['finished']:
+            self._unfinished += 1
+        if result['first_seat'] is not None:
+            self._wins[result['first_seat']] += 1
+        for name, count in result['specials'].items():
+            self._specials[name] = self._specials.get(name, 0) + count
+        if result.get('profile'):
+            self._profiler.merge_dict(result['profile'])
+
+    def __str__(self) -> str:
+        """Gives a summary of the games played so far"""
+        rates = ', '.join(f'seat {seat+1}: {rate:.1%}'
+                          for seat, rate in enumerate(self.win_rates()))
+        specials = ', '.join(f'{name}: {count / max(self._games, 1):.2f}'
+                             for name, count in sorted(self._specials.items()))
+        return (f'{self._games} games ({self._unfinished} unfinished), '
+                f'{self.average_turns:.1f} turns on average\n'
+                f'Win rate - {rates}\n'
+                f'Special cards per game - {specials}')
+
+
+def play_games(tasks: List[tuple], workers: int = 1) -> Iterator[Dict]:
+    """
+    Plays the games described by play_game tasks and yields their results,
+    in any order if there is more than one worker
+    """
+    if workers > 1:
+        with Pool(workers) as pool:
+            yield from pool.imap_unordered(play_game, tasks, chunksize=16)
+    else:
+        yield from map(play_game, tasks)
+
+
+def simulate(games: int, num_of_players: int, workers: int = 1,
+             seed: int = 0, max_turns: int = 10000,
+             report_every: int = 0, out=sys.stdout,
+             log_path: Optional[str] = None,
+             profile: bool = False,
+             rules: Optional['Rules'] = None) -> SimulationResults:
+    """
+    Plays the given number of games and returns the aggregated results
+    Game number i is played with the seed seed + i
+    With a log path every game is appended to that binary log
+    With profile the phases of every turn are timed
+    Throws error if games played by other than the standard rules
+    would be logged, the log does not record the rules
+    """
+    if log_path is not None and rules not in (None, Rules()):
+        raise InvalidRulesError('Only games played by the standard rules '
+                                'can be logged')
+    results = SimulationResults(num_of_players)
+    tasks = [(seed + index, num_of_players, max_turns,
+              log_path is not None, profile, rules)
+             for index in range(games)]
+
+    for result in play_games(tasks, workers):
+        results.add_game(result)
+        if log_path is not None:
+            append_games(log_path, result['log'])
+        if report_every and results.games % report_every == 0:
+            print(f'{results}\n', file=out, flush=True)
+    return results
+
+
+def sweep(variants: List['Rules'], games: int, num_of_players: int,
+          workers: int = 1, seed: int = 0, max_turns: int = 10000,
+          profile: bool = False) -> Dict['Rules', SimulationResults]:
+    """
+    Plays the given number of games by every variant of the rules
+    in a single batch sharing the workers and returns the results
+    of every variant. Every variant plays the same seeds, game number i
+    with the seed seed + i, so the variants are compared on the same deals
+    """
+    results = {rules: SimulationResults(num_of_players)
+               for rules in variants}
+    tasks = [(seed + index, num_of_players, max_turns, False, profile, rules)
+             for index in range(games) for rules in results]
+    for result in play_games(tasks, workers):
+        results[result['rules']].add_game(result)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='makao simulate',
+        description='Plays games with only opponents and reports the results')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--opponents', type=int, default=3,
+                        help='number of opponents besides the first seat')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-turns', type=int, default=10000)
+    parser.add_argument('--report-every', type=int, default=None,
+                        help='games between progress reports '
+                             '(a tenth of all games by default)')
+    parser.add_argument('--log', default=None,
+                        help='binary log every game is appended to')
+    parser.add_argument('--variant', action='append', default=None,
+                        help='house rules to play besides the standard '
+                             'ones, like "king_draw=3;block_value=5", '
+                             'can be given many times')
+    parser.add_argument('--profile', action='store_true',
+                        help='time the phases of every turn')
+    parser.add_argument('--profile-json', default=None,
+                        help='file the phase timings are written to')
+    args = parser.parse_args(argv)
+
+    if args.variant is not None:
+        if args.log is not None:
+            parser.error('games played by variants cannot be logged')
+        try:
+            variants = [Rules()] + [Rules.parse(text)
+                                    for text in args.variant]
+            for rules in variants:
+                RuleBook(rules)
+        except InvalidRulesError as error:
+            parser.error(str(error))
+        sweeps = sweep(variants, args.games, args.opponents + 1,
+                       args.workers, args.seed, args.max_turns,
+                       args.profile or args.profile_json is not None)
+        for rules, results in sweeps.items():
+            print(f'Rules - {rules.describe()}\n{results}\n')
+            if args.profile:
+                print(f'{results.profiler}\n')
+        if args.profile_json is not None:
+            with open(args.profile_json, 'w') as file:
+                json.dump({rules.describe(): results.profiler.as_dict()
+                           for rules, results in sweeps.items()},
+                          file, indent=2)
+                file.write('\n')
+        return
+
+    report_every = args.report_every
+    if report_every is None:
+        report_every = max(args.games // 10, 1)
+    results = simulate(args.games, args.opponents + 1, args.workers,
+                       args.seed, args.max_turns, report_every,
+                       log_path=args.log,
+                       profile=args.profile or args.profile_json is not None)
+    if results.games % report_every != 0:
+        print(results)
+    if args.profile:
+        print(f'\n{results.profiler}')
+    if args.profile_json is not None:
+        results.profiler.to_json(args.profile_json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+from analysis import GameArchive
+from game_log import (read_games, encode_event, LoggedGame, HEADER, RECORD,
+                      MAGIC, END_OF_GAME)
+from events import Event, EventType
+from simulate import simulate
+from card import Card, Suits
+import io
+import numpy as np
+
+
+def make_log(tmp_path, games=6):
+    path = str(tmp_path / 'games.mkl')
+    simulate(games, 3, max_turns=400, seed=23, out=io.StringIO(),
+             log_path=path)
+    return path
+
+
+def test_archive_matches_logged_games(tmp_path):
+    path = make_log(tmp_path)
+    archive = GameArchive.load([path])
+    logged = list(read_games(path))
+    assert archive.games == len(logged)
+    assert sorted(archive.seeds) == sorted(game.seed for game in logged)
+    assert np.array_equal(archive.turns, [game.turns for game in logged])
+    assert len(archive.event_type) == sum(len(game.events)
+                                          for game in logged)
+    same = GameArchive.from_games(logged)
+    assert np.array_equal(same.card_code, archive.card_code)
+    assert np.array_equal(same.card_event, archive.card_event)
+
+
+def test_archive_statistics(tmp_path):
+    path = make_log(tmp_path)
+    archive = GameArchive.load([path])
+    frequencies = archive.special_card_frequencies()
+    assert frequencies and all(count > 0 for count in frequencies.values())
+    chains = archive.penalty_chains()
+    assert len(chains) <= len(archive.events_of(EventType.DRAW))
+    assert (chains > 0).all()
+    counts, edges = archive.game_lengths(bins=4)
+    assert counts.sum() == archive.games
+    rates = archive.win_rates(3)
+    assert np.isclose(rates.sum(), 1.0)
+    assert -1.0 <= archive.first_player_advantage() <= 1.0
+    assert 'games' in str(archive)
+
+
+def card(suit: int, value: int) -> int:
+    return Card(suit, value).code
+
+
+def played(turn: int, seat: int, *cards: int) -> 'Event':
+    return Event(EventType.CARD_PLAYED, turn, seat, cards)
+
+
+def drew(event_type: 'EventType', turn: int, seat: int,
+         count: int) -> 'Event':
+    return Event(event_type, turn, seat, tuple(range(count)), count)
+
+
+def test_penalty_chains_of_a_known_log():
+    first = (
+        played(0, 0, card(Suits.SPADES, 2)),
+        played(1, 1, card(Suits.HEARTS, 2)),
+        drew(EventType.MAKAO_PENALTY, 1, 1, 5),
+        played(2, 2, card(Suits.HEARTS, 3)),
+        drew(EventType.DRAW, 3, 0, 7),
+        played(4, 1, card(Suits.HEARTS, 13)),
+        played(5, 2, card(Suits.CLUBS, 13)),
+        played(6, 0, card(Suits.HEARTS, 5)),
+        Event(EventType.PASS, 7, 1, (4,)),
+        played(8, 2, card(Suits.HEARTS, 13), card(Suits.CLUBS, 13)),
+        played(9, 0, card(Suits.SPADES, 13)),
+        drew(EventType.DRAW, 9, 2, 10),
+        Event(EventType.STOP, 10, 1),
+        drew(EventType.MAKAO_PENALTY, 10, 2, 5),
+        played(11, 0, card(Suits.CLUBS, 2)),
+    )
+    second = (
+        played(0, 0, card(Suits.SPADES, 3)),
+        drew(EventType.DRAW, 1, 1, 3),
+    )
+    games = [LoggedGame(1, 3, (), first, 12), LoggedGame(2, 2, (), second, 2)]
+    buffer = b''.join(
+        HEADER.pack(MAGIC, game.seed, game.num_of_players, 0)
+        + b''.join(encode_event(event) for event in game.events)
+        + RECORD.pack(END_OF_GAME, 0, game.turns, 0, 0) for game in games)
+
+    for archive in (GameArchive.from_games(games),
+                    GameArchive.from_buffer(buffer)):
+        assert list(archive.penalty_chains()) == [3, 2, 1]
+        assert archive.average_penalty_chain() == 2.0
@@ -0,0 +1,37 @@
+from benchmark import (run_suite, find_regressions, save_baseline,
+                       load_baseline, MICROBENCHMARKS)
+
+
+def test_run_suite_reports_every_benchmark():
+    results = run_suite(games=2, size=52, players=[2])
+    assert results['games_2p.games_per_second'] > 0
+    assert results['games_2p.turns_per_second'] > 0
+    assert 'games_2p.peak_kib' in results
+    assert 'games_2p.retained_blocks_per_turn' in results
+    for name in MICROBENCHMARKS:
+        assert results[f'micro.{name}.ops_per_second'] > 0
+
+
+def test_find_regressions():
+    baseline = {'games_2p.turns_per_second': 1000.0,
+                'games_2p.peak_kib': 100.0}
+    assert find_regressions({'games_2p.turns_per_second': 900.0,
+                             'games_2p.peak_kib': 110.0}, baseline) == []
+    regressions = find_regressions({'games_2p.turns_per_second': 500.0,
+                                    'games_2p.peak_kib': 200.0}, baseline)
+    assert len(regressions) == 2
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    assert load_baseline(path) is None
+    save_baseline(path, {'micro.card_str.ops_per_second': 5.0})
+    assert load_baseline(path) == {'micro.card_str.ops_per_second': 5.0}
+
+
+def test_find_regressions_with_negative_baseline():
+    baseline = {'games_2p.retained_blocks_per_turn': -2.0}
+    assert find_regressions({'games_2p.retained_blocks_per_turn': -3.0},
+                            baseline) == []
+    assert len(find_regressions({'games_2p.retained_blocks_per_turn': 1.0},
+                                baseline)) == 1
@@ -1,5 +1,7 @@
 from card import Card, Suits, InvalidSuitError, ValueNotInRangeError
+from card import ALL_CARDS, CARD_COUNT
 from colorama import Fore, Style
+import pickle
 import pytest
 
 
@@ -22,3 +24,34 @@ def test_card_init_invaid_value():
 def test_card_name():
     two_of_spades = Card(Suits.SPADES, 2)
     assert str(two_of_spades) == '2' + Fore.BLACK + '\u2660' + Style.RESET_ALL
+
+
+def test_card_is_interned():
+    assert Card(Suits.HEARTS, 12) is Card(Suits.HEARTS, 12)
+    assert Card(Suits.HEARTS, 12) is not Card(Suits.SPADES, 12)
+
+
+def test_card_code():
+    assert Card(Suits.SPADES, 1).code == 0
+    assert Card(Suits.HEARTS, 13).code == CARD_COUNT - 1
+    for code, card in enumerate(ALL_CARDS):
+        assert card.code == code
+        assert Card.from_code(code) is card
+
+
+def test_card_hash_agrees_with_eq():
+    assert len(set(ALL_CARDS)) == CARD_COUNT
+    assert hash(Card(Suits.CLUBS, 5)) == hash(Card(Suits.CLUBS, 5))
+    assert {Card(Suits.CLUBS, 5): 1}[Card(Suits.CLUBS, 5)] == 1
+
+
+def test_card_is_immutable():
+    card = Card(Suits.CLUBS, 5)
+    with pytest.raises(AttributeError):
+        card._value = 6
+    assert card.value == 5
+
+
+def test_card_pickle_keeps_identity():
+    card = Card(Suits.DIAMONDS, 9)
+    assert pickle.loads(pickle.dumps(card)) is card
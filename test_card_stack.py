@@ -1,7 +1,6 @@
-from card_stack import CardStack, KingOfSpadesException
+from card_stack import CardStack, Effect
 from card import Card, Suits
 from player import Player, Status
-import pytest
 
 
 def test_card_stack_init():
@@ -64,10 +63,10 @@ def test_card_stack_add5_prev():
     next_player = Player([])
     prev_player = Player([])
     all_players = [next_player, prev_player]
-    with pytest.raises(KingOfSpadesException):
-        stack.add_cards_on_top([king_of_spades], prev_player,
-                               next_player, all_players)
-        assert prev_player.status_effect == Status.DRAW5
+    effect = stack.add_cards_on_top([king_of_spades], prev_player,
+                                    next_player, all_players)
+    assert effect == [Effect.KING_OF_SPADES]
+    assert prev_player.status_effect == Status.DRAW5
 
 
 def test_card_stack_add5_next():
@@ -79,3 +78,93 @@ def test_card_stack_add5_next():
     stack.add_cards_on_top([king_of_hearts], prev_player,
                            next_player, all_players)
     assert next_player.status_effect == Status.DRAW5
+
+
+def test_card_stack_legal_mask():
+    stack = CardStack([Card(Suits.HEARTS, 7)])
+    mask = stack.legal_mask()
+    assert mask >> Card(Suits.HEARTS, 2).code & 1
+    assert mask >> Card(Suits.CLUBS, 7).code & 1
+    assert mask >> Card(Suits.SPADES, 12).code & 1
+    assert not mask >> Card(Suits.SPADES, 8).code & 1
+
+
+def test_card_stack_legal_mask_forced_suit():
+    stack = CardStack([Card(Suits.HEARTS, 1)])
+    stack.set_forced_suit(Suits.CLUBS)
+    assert stack.is_valid_combo([Card(Suits.CLUBS, 9)])
+    assert stack.is_valid_combo([Card(Suits.SPADES, 1)])
+    assert not stack.is_valid_combo([Card(Suits.HEARTS, 9)])
+
+
+def test_card_stack_legal_mask_forced_value():
+    stack = CardStack([Card(Suits.HEARTS, 11)])
+    stack.set_forced_value(7)
+    assert stack.is_valid_combo([Card(Suits.CLUBS, 7)])
+    assert stack.is_valid_combo([Card(Suits.SPADES, 11)])
+    assert not stack.is_valid_combo([Card(Suits.HEARTS, 8)])
+
+
+def test_card_stack_legal_cards():
+    stack = CardStack([Card(Suits.HEARTS, 7)])
+    hand = [Card(Suits.SPADES, 7), Card(Suits.SPADES, 8)]
+    player = Player('Alice', hand)
+    assert stack.legal_cards(player.hand_mask) == 1 << hand[0].code
+
+
+def test_card_stack_generate_combos():
+    stack = CardStack([Card(Suits.HEARTS, 7)])
+    hand = [Card(Suits.HEARTS, 5), Card(Suits.CLUBS, 5),
+            Card(Suits.SPADES, 9)]
+    combos = list(stack.generate_combos(hand))
+    assert [0] in combos
+    assert [0, 1] in combos
+    assert [1] not in combos
+    assert all(2 not in combo for combo in combos)
+    assert all(stack.is_valid_combo([hand[index] for index in combo])
+               for combo in combos)
+
+
+def test_card_stack_generate_combos_max_length():
+    stack = CardStack([Card(Suits.HEARTS, 7)])
+    hand = [Card(Suits.HEARTS, value) for value in range(5, 10)]
+    assert all(len(combo) <= 2
+               for combo in stack.generate_combos(hand, max_length=2))
+
+
+def test_card_stack_combo_triggers_every_card():
+    stack = CardStack([Card(Suits.CLUBS, 5)])
+    next_player = Player('Next')
+    prev_player = Player('Prev')
+    aces = [Card(Suits.CLUBS, 1), Card(Suits.HEARTS, 1)]
+    effect = stack.add_cards_on_top(aces, prev_player, next_player,
+                                    [next_player, prev_player])
+    assert effect == [Effect.ACE]
+    assert stack.cards[-2:] == aces
+    twos = [Card(Suits.HEARTS, 2), Card(Suits.SPADES, 2)]
+    effect = stack.add_cards_on_top(twos, prev_player, next_player,
+                                    [next_player, prev_player])
+    assert effect == []
+    assert next_player.cards_to_draw == 4
+
+
+def test_card_stack_combo_keeps_every_decision():
+    stack = CardStack([Card(Suits.SPADES, 7)])
+    next_player = Player('Next')
+    prev_player = Player('Prev')
+    combo = [Card(Suits.SPADES, 13), Card(Suits.SPADES, 1)]
+    effects = stack.add_cards_on_top(combo, prev_player, next_player,
+                                     [next_player, prev_player])
+    assert effects == [Effect.KING_OF_SPADES, Effect.ACE]
+    assert prev_player.status_effect == Status.DRAW5
+    assert prev_player.cards_to_draw == 5
+
+
+def test_card_stack_covered_ace_leaves_no_suit():
+    stack = CardStack([Card(Suits.SPADES, 7)])
+    next_player = Player('Next')
+    prev_player = Player('Prev')
+    combo = [Card(Suits.SPADES, 1), Card(Suits.SPADES, 13)]
+    effects = stack.add_cards_on_top(combo, prev_player, next_player,
+                                     [next_player, prev_player])
+    assert effects == [Effect.KING_OF_SPADES]
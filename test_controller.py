@@ -0,0 +1,112 @@
+from controller import (AsyncAdapter, AsyncPlayerController,
+                        InvalidDecisionError, OpponentController,
+                        PassController, TimedController, HumanController,
+                        PlayerController)
+from game import Game
+import asyncio
+import pytest
+
+
+class SlowController(AsyncPlayerController):
+    async def get_moves(self, game, player):
+        await asyncio.sleep(10)
+
+    async def get_ace_suit(self, game, player):
+        raise InvalidDecisionError()
+
+    async def get_jack_value(self, game, player):
+        raise ConnectionError()
+
+    async def get_first_save(self, game, player, card):
+        return 1
+
+
+def test_timed_controller_falls_back_to_pass():
+    game = Game.headless(2, seed=3)
+    player = game.players[0]
+    controller = TimedController(SlowController(), timeout=0.01)
+    assert controller.get_moves(game, player) == [len(player.hand)]
+    assert controller.timed_out == 1
+    assert controller.get_ace_suit(game, player) in range(1, 5)
+    assert controller.get_jack_value(game, player) in range(5, 11)
+    assert controller.get_first_save(game, player, player.hand[0]) == 1
+    controller.close()
+
+
+def test_timed_controller_per_decision_timeouts():
+    controller = TimedController(SlowController(), timeout=1,
+                                 timeouts={'get_moves': 0.5})
+    assert controller.timeout_for('get_moves') == 0.5
+    assert controller.timeout_for('get_ace_suit') == 1
+
+
+def test_game_with_awaited_bots_matches_plain_bots():
+    plain = Game.headless(3, seed=8)
+    plain.run(300)
+    timed = [TimedController(AsyncAdapter(OpponentController()), timeout=5)
+             for _ in range(3)]
+    awaited = Game.headless(3, timed, seed=8)
+    awaited.run(300)
+    assert awaited.snapshot() == plain.snapshot()
+    for controller in timed:
+        controller.close()
+
+
+def test_timed_controller_with_running_loop():
+    async def run():
+        loop = asyncio.get_running_loop()
+        controller = TimedController(SlowController(), timeout=0.01,
+                                     fallback=OpponentController(),
+                                     loop=loop)
+        game = Game.headless(2, [controller, PassController()], seed=4)
+        return await loop.run_in_executor(None, game.run, 20)
+
+    assert asyncio.run(run()) > 0
+
+
+class MovesOnlyController(PlayerController):
+    def get_moves(self, game, player):
+        return [len(player.hand)]
+
+
+class AsyncMovesOnlyController(AsyncPlayerController):
+    async def get_moves(self, game, player):
+        return [len(player.hand)]
+
+
+def test_incomplete_controllers_cannot_be_created():
+    with pytest.raises(TypeError):
+        MovesOnlyController()
+    with pytest.raises(TypeError):
+        AsyncMovesOnlyController()
+
+
+def test_human_controller_handles_stop(monkeypatch):
+    game = Game.headless(2, seed=1)
+    player = game.players[0]
+    words = []
+    monkeypatch.setattr(game, 'ask_player_input', lambda player: '')
+    monkeypatch.setattr(game, 'handle_special_inputs',
+                        lambda player, word: words.append(word))
+    monkeypatch.setattr('builtins.input', lambda prompt: '1 STOP')
+    assert HumanController().get_moves(game, player) == [0]
+    assert words == ['STOP']
+
+
+def test_human_controller_asks_again(monkeypatch):
+    game = Game.headless(2, seed=1)
+    player = game.players[0]
+    answers = iter(['x', '7', '', '3', 'x', '2', '11', '7'])
+    prompts = []
+
+    def answer(prompt):
+        prompts.append(prompt)
+        return next(answers)
+
+    monkeypatch.setattr('builtins.input', answer)
+    controller = HumanController()
+    assert controller.get_ace_suit(game, player) == 3
+    assert controller.get_jack_value(game, player) == 7
+    assert len(prompts) == 8
+    assert prompts[1].startswith('There is no such suit')
+    assert prompts[5].startswith('This value cannot be forced')
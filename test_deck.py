@@ -1,5 +1,7 @@
-from deck import Deck
+from deck import Deck, EmptyDeckError
 from card_stack import CardStack
+import random
+import pytest
 
 
 def test_deck_init():
@@ -24,3 +26,68 @@ def test_deck_refresh():
     assert len(deck.cards) == 51
     deck.refresh_deck()
     assert len(deck.cards) == 52
+
+
+def test_deck_shuffle_uses_rng():
+    first = Deck(CardStack(), random.Random(3))
+    second = Deck(CardStack(), random.Random(3))
+    first.shuffle_deck()
+    second.shuffle_deck()
+    assert first.cards == second.cards
+
+
+def test_deck_draw_cards_matches_draw_card():
+    first = Deck(CardStack(), random.Random(5))
+    second = Deck(CardStack(), random.Random(5))
+    drawn = first.draw_cards(7)
+    assert drawn == [second.draw_card() for _ in range(7)]
+    assert first.cards == second.cards
+
+
+def test_deck_recycles_card_stack():
+    stack = CardStack()
+    deck = Deck(stack, random.Random(1))
+    stack.set_cards(deck.draw_cards(45))
+    top = stack.top_card
+    drawn = deck.draw_cards(10)
+    assert len(drawn) == 10
+    assert stack.cards == [top]
+    assert len(deck.cards) == 41
+    assert len(set(drawn + deck.cards + stack.cards)) == 52
+
+
+def test_deck_draw_cards_stops_when_empty():
+    stack = CardStack()
+    deck = Deck(stack)
+    stack.set_cards(deck.draw_cards(2))
+    assert len(deck.draw_cards(60)) == 51
+    assert deck.draw_cards(3) == []
+
+
+def test_deck_empty_with_empty_card_stack():
+    stack = CardStack()
+    deck = Deck(stack)
+    deck.draw_cards(52)
+    with pytest.raises(EmptyDeckError):
+        deck.draw_card()
+    assert deck.draw_cards(3) == []
+    assert stack.cards == []
+
+
+def test_deck_keeps_single_card_on_stack():
+    stack = CardStack()
+    deck = Deck(stack)
+    stack.set_cards(deck.draw_cards(1))
+    top = stack.top_card
+    deck.draw_cards(51)
+    with pytest.raises(EmptyDeckError):
+        deck.draw_card()
+    assert stack.cards == [top]
+
+
+def test_deck_several_decks():
+    deck = Deck(CardStack(), num_of_decks=2)
+    assert len(deck.cards) == 104
+    deck.draw_cards(10)
+    deck.refresh_deck()
+    assert len(deck.cards) == 104
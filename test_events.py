@@ -0,0 +1,44 @@
+from events import Event, EventBus, EventType
+from game import Game
+
+
+def test_event_bus_filters_types():
+    bus = EventBus()
+    received = []
+    bus.subscribe(received.append, [EventType.PASS])
+    assert bus.wants(EventType.PASS)
+    assert not bus.wants(EventType.DRAW)
+    bus.publish(Event(EventType.PASS, 0, 1))
+    bus.publish(Event(EventType.DRAW, 0, 1, (), 2))
+    assert received == [Event(EventType.PASS, 0, 1)]
+
+
+def test_event_bus_unsubscribe():
+    bus = EventBus()
+    received = []
+    bus.subscribe(received.append)
+    bus.unsubscribe(received.append)
+    assert not any(bus.wants(event_type) for event_type in EventType)
+
+
+def test_game_emits_events():
+    game = Game.headless(2, seed=21)
+    events = []
+    game.subscribe(events.append)
+    game.run(100)
+    types = {event.type for event in events}
+    assert EventType.CARD_PLAYED in types
+    assert EventType.PASS in types
+    for event in events:
+        assert 0 <= event.seat < 2
+        assert event.turn <= game.turn_num
+
+
+def test_game_stream_events():
+    game = Game.headless(3, seed=23)
+    events = list(game.stream_events(event_types=[EventType.PLAYER_WON]))
+    assert game.is_finished()
+    assert [event.value for event in events] == [1, 2]
+    assert [event.seat for event in events] == [
+        game.get_player_index(player) for player in game.winners]
+    assert not game.events.wants(EventType.PLAYER_WON)
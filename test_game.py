@@ -1,22 +1,41 @@
 from game import Game, InvalidOppNumError
+from controller import HumanController, OpponentController
+from opponent import Opponent
+from card import Card, Suits
+from search import RolloutController
+from renderer import NullRenderer, TerminalRenderer
 import pytest
 
 
-def test_game_init(monkeypatch):
-    monkeypatch.setattr(Game, 'handle_turn', lambda self: None)
-    game = Game("Alice", 2)
+def test_game_init():
+    game = Game("Alice", 2, start=False)
     assert len(game.players) == 3
 
 
-def test_game_init_wrong_opp_num(monkeypatch):
-    monkeypatch.setattr(Game, 'handle_turn', lambda self: None)
+def test_game_init_wrong_opp_num():
     with pytest.raises(InvalidOppNumError):
-        Game('Alice', 4)
+        Game('Alice', 12, start=False)
+    with pytest.raises(InvalidOppNumError):
+        Game('Alice', 0, start=False)
+
+
+def test_game_not_enough_cards():
+    with pytest.raises(ValueError):
+        Game.headless(12, num_of_decks=1)
+
 
+def test_game_large_table_with_several_decks():
+    game = Game.headless(10, seed=12)
+    assert game.deck.num_of_decks == 3
+    assert (len(game.deck.cards) + len(game.stack.cards)
+            + sum(len(player.hand) for player in game.players)) == 156
+    game.run(500)
+    assert (len(game.deck.cards) + len(game.stack.cards)
+            + sum(len(player.hand) for player in game.players)) == 156
 
-def test_game_turn_counter(monkeypatch):
-    monkeypatch.setattr(Game, 'handle_turn', lambda self: None)
-    game = Game("Alice", 2)
+
+def test_game_turn_counter():
+    game = Game("Alice", 2, start=False)
     assert game.get_current_player().name == "Alice"
     game.increment_turn()
     assert game.get_current_player().name == "Player1"
@@ -27,9 +46,8 @@ def test_game_turn_counter(monkeypatch):
     game.increment_turn()
 
 
-def test_game_next_player(monkeypatch):
-    monkeypatch.setattr(Game, 'handle_turn', lambda self: None)
-    game = Game('Alice', 2)
+def test_game_next_player():
+    game = Game('Alice', 2, start=False)
     alice, opp1, opp2 = game.players
     assert game.get_current_player() == alice
     assert game.right_of_player(alice) == opp1
@@ -38,3 +56,128 @@ def test_game_next_player(monkeypatch):
     assert game.left_of_player(opp1) == alice
     assert game.right_of_player(opp2) == alice
     assert game.left_of_player(opp2) == opp1
+
+
+def test_game_run_is_iterative(monkeypatch):
+    game = Game('Alice', 2, start=False)
+    monkeypatch.setattr(Game, 'handle_turn',
+                        lambda self: self.progress_turn())
+    assert game.run(5000) == 5000
+    assert game.turn_num == 5000
+
+
+def test_game_headless():
+    game = Game.headless(3)
+    assert len(game.players) == 3
+    assert game.main_player is None
+    assert game.turn_num == 0
+    assert all(isinstance(player, Opponent) for player in game.players)
+    assert all(len(player.hand) == 5 for player in game.players)
+    assert all(isinstance(controller, OpponentController)
+               for controller in game.controllers)
+
+
+def test_game_default_controllers():
+    game = Game('Alice', 1, start=False)
+    assert isinstance(game.get_controller(game.main_player), HumanController)
+    assert isinstance(game.get_controller(game.players[1]),
+                      OpponentController)
+
+
+def test_game_headless_plays_turns():
+    game = Game.headless(2)
+    assert game.run(50) > 0
+    assert game.turn_num > 0
+
+
+def test_game_seed_is_reproducible():
+    first = Game.headless(3, seed=42)
+    second = Game.headless(3, seed=42)
+    assert first.deck.cards == second.deck.cards
+    first.run(200)
+    second.run(200)
+    assert first.turn_num == second.turn_num
+    assert first.stack.cards == second.stack.cards
+    for one, other in zip(first.players, second.players):
+        assert one.hand == other.hand
+
+
+def test_game_picks_seed():
+    game = Game.headless(2)
+    assert game.seed is not None
+    replay = Game.headless(2, seed=game.seed)
+    assert replay.deck.cards == game.deck.cards
+
+
+def test_game_clone_is_independent():
+    game = Game('Alice', 2, start=False, seed=4)
+    copy = game.clone([RolloutController()] * 3)
+    assert copy.main_player is None
+    assert copy.players[0].hand == game.players[0].hand
+    copy.run(20)
+    assert game.turn_num == 0
+    assert all(len(player.hand) == 5 for player in game.players)
+
+
+def test_game_snapshot_restore():
+    game = Game.headless(3, seed=11)
+    game.run(15)
+    state = game.snapshot()
+    hands = [list(player.hand) for player in game.players]
+    game.run(30)
+    game.restore(state)
+    assert game.snapshot() == state
+    assert game.turn_num == state.turn_num
+    assert [player.hand for player in game.players] == hands
+    assert game.deck.cards == list(state.deck)
+    assert game.stack.cards == list(state.stack)
+
+
+def test_game_snapshot_is_immutable():
+    game = Game.headless(2, seed=12)
+    state = game.snapshot()
+    game.players[0].add_card(game.deck.draw_card())
+    assert len(state.players[0].hand) == 5
+    assert len(state.deck) == len(game.deck.cards) + 1
+
+
+def test_game_headless_uses_null_renderer():
+    game = Game.headless(2)
+    assert isinstance(game.renderer, NullRenderer)
+    assert isinstance(Game('Alice', 1, start=False).renderer,
+                      TerminalRenderer)
+
+
+def test_game_combo_resolves_every_effect(monkeypatch):
+    game = Game.headless(3, seed=1)
+    player = game.players[0]
+    prev_player = game.prev_player(player)
+    calls = []
+    monkeypatch.setattr(game, 'get_player_ace_suit',
+                        lambda player: calls.append('ace') or Suits.CLUBS)
+    monkeypatch.setattr(game, 'special_king_of_spades_interaction',
+                        lambda player: calls.append(player))
+    game.stack.set_cards([Card(Suits.SPADES, 7)])
+    player.set_hand([Card(Suits.SPADES, 13), Card(Suits.SPADES, 1),
+                     Card(Suits.HEARTS, 9), Card(Suits.HEARTS, 8)])
+    game.handle_regular_turn(player, [0, 1])
+    assert calls == ['ace', prev_player]
+    assert game.stack.forced_suit == Suits.CLUBS
+    assert prev_player.cards_to_draw == 5
+
+
+def test_game_reports_only_the_cards_drawn():
+    drawn = []
+
+    class DrawRenderer(NullRenderer):
+        def cards_drawn(self, player, count):
+            drawn.append(count)
+
+    game = Game(None, 1, start=False, seed=3, renderer=DrawRenderer())
+    player = game.players[0]
+    game.stack.set_cards(game.stack.cards[-1:])
+    game.deck.draw_cards(len(game.deck.cards) - 2)
+    player.increase_cards_to_draw(5)
+    game.player_draw_cards(player)
+    assert drawn == [2]
+    assert player.cards_to_draw == 0
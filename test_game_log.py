@@ -0,0 +1,61 @@
+from game_log import (GameLogWriter, GameLogError, GameReplayer,
+                      read_games, parse_games)
+from game import Game
+import pytest
+
+
+def test_log_round_trip(tmp_path):
+    path = str(tmp_path / 'games.mkl')
+    writer = GameLogWriter(path)
+    played = []
+    for seed in (23, 24):
+        game = Game.headless(3, seed=seed)
+        writer.record(game, 400)
+        played.append(game)
+    logged = list(read_games(path))
+    assert len(logged) == 2
+    for game, entry in zip(played, logged):
+        assert entry.seed == game.seed
+        assert entry.num_of_players == 3
+        assert entry.deck == game.initial_deck
+        assert entry.turns == game.turn_num
+        assert all(0 <= code < 52 for code in entry.deck)
+
+
+def test_replay_rebuilds_every_turn(tmp_path):
+    path = str(tmp_path / 'games.mkl')
+    game = Game.headless(2, seed=24)
+    states = [game.snapshot()]
+    writer = GameLogWriter(path)
+    writer.attach(game)
+    while game.step():
+        states.append(game.snapshot())
+    states.append(game.snapshot())
+    writer.detach(game)
+
+    logged, = read_games(path)
+    replayer = GameReplayer(logged, checkpoint_every=8)
+    assert replayer.replay().is_finished()
+    for turn in (len(states) // 2, 3, 0, logged.turns):
+        assert replayer.state_at(turn) == states[turn]
+
+
+def test_log_rejects_late_attach(tmp_path):
+    game = Game.headless(2, seed=1)
+    game.step()
+    with pytest.raises(GameLogError):
+        GameLogWriter(str(tmp_path / 'games.mkl')).attach(game)
+
+
+def test_parse_rejects_garbage():
+    with pytest.raises(GameLogError):
+        list(parse_games(b'not a log at all, just some bytes'))
+
+
+def test_replay_with_several_decks(tmp_path):
+    path = str(tmp_path / 'games.mkl')
+    game = Game.headless(8, seed=9)
+    GameLogWriter(path).record(game, 150)
+    logged, = read_games(path)
+    assert len(logged.deck) == 104
+    assert GameReplayer(logged).replay().snapshot() == game.snapshot()
@@ -1,5 +1,6 @@
 from opponent import Opponent
 from card import Card, Suits
+from card_stack import CardStack
 
 
 def test_opponent_get_optimal_suit_1():
@@ -22,3 +23,28 @@ def test_opponent_get_optimal_suit_2():
     opp = Opponent('Bob', hand)
 
     assert opp.get_optimal_suit() == Suits.SPADES
+
+
+def test_opponent_decisions_follow_hand_changes():
+    hand = [Card(Suits.HEARTS, 6), Card(Suits.HEARTS, 7),
+            Card(Suits.CLUBS, 9)]
+    opp = Opponent('Bob', hand)
+    assert opp.get_optimal_suit() == Suits.HEARTS
+    assert opp.get_optimal_value() == 6
+
+    opp.remove_cards([0, 1])
+    opp.add_card(Card(Suits.SPADES, 9))
+    assert opp.get_optimal_suit() == Suits.SPADES
+    assert opp.get_optimal_value() == 9
+
+
+def test_opponent_get_optimal_card_picks_last_playable():
+    hand = [Card(Suits.HEARTS, 4), Card(Suits.CLUBS, 6)] * 10
+    opp = Opponent('Bob', hand + [Card(Suits.SPADES, 10)])
+    stack = CardStack([Card(Suits.HEARTS, 8)])
+    assert opp.get_optimal_card(stack) == 18
+
+    opp.set_allowed_cards([6])
+    assert opp.get_optimal_card(stack) == 19
+    opp.set_allowed_cards([2, 3])
+    assert opp.get_optimal_card(stack) == 21
@@ -1,4 +1,5 @@
-from player import Player, WrongCardIndexError
+from player import Player, Status, WrongCardIndexError
+from card_stack import CardStack
 import pytest
 from card import Card, Suits
 
@@ -46,3 +47,70 @@ def test_player_hand_description():
     queen_of_hearts = Card(Suits.HEARTS, 12)
     alice = Player("Alice", [two_of_spades, queen_of_hearts])
     assert alice.get_hand_description() == f'Your hand consists of: \n1 - {str(two_of_spades)} \n2 - {str(queen_of_hearts)} \n' # NOQA
+
+
+def test_player_hand_counters():
+    two_of_spades = Card(Suits.SPADES, 2)
+    two_of_hearts = Card(Suits.HEARTS, 2)
+    queen_of_hearts = Card(Suits.HEARTS, 12)
+    alice = Player("Alice", [two_of_spades, two_of_hearts])
+    alice.add_card(queen_of_hearts)
+    assert alice.has_card(queen_of_hearts)
+    assert not alice.has_card(Card(Suits.CLUBS, 12))
+    assert alice.count_value(2) == 2
+    assert alice.count_suit(Suits.HEARTS) == 2
+    assert alice.has_any_value([2, 3])
+    assert not alice.has_any_value([4])
+    assert alice.hand_mask == ((1 << two_of_spades.code)
+                               | (1 << two_of_hearts.code)
+                               | (1 << queen_of_hearts.code))
+
+    alice.remove_cards([0, 2])
+    assert not alice.has_card(two_of_spades)
+    assert not alice.has_card(queen_of_hearts)
+    assert alice.count_value(2) == 1
+    assert alice.count_suit(Suits.HEARTS) == 1
+    assert alice.hand_mask == 1 << two_of_hearts.code
+
+
+def test_player_remove_cards_keeps_order():
+    two_of_spades = Card(Suits.SPADES, 2)
+    three_of_spades = Card(Suits.SPADES, 3)
+    four_of_spades = Card(Suits.SPADES, 4)
+    alice = Player("Alice", [two_of_spades, three_of_spades, four_of_spades])
+    assert alice.remove_cards([2, 0]) == [four_of_spades, two_of_spades]
+    assert alice.hand == [three_of_spades]
+
+
+def test_player_remove_card_repeated_index():
+    alice = Player("Alice", [Card(Suits.SPADES, 2), Card(Suits.SPADES, 3)])
+    with pytest.raises(WrongCardIndexError):
+        alice.remove_cards([0, 0])
+    assert len(alice.hand) == 2
+
+
+def test_player_legal_moves():
+    stack = CardStack([Card(Suits.HEARTS, 7)])
+    alice = Player("Alice", [Card(Suits.HEARTS, 5), Card(Suits.SPADES, 9)])
+    moves = list(alice.legal_moves(stack))
+    assert moves == [[0], [2]]
+
+
+def test_player_legal_moves_with_effect():
+    stack = CardStack([Card(Suits.HEARTS, 2)])
+    alice = Player("Alice", [Card(Suits.SPADES, 3), Card(Suits.SPADES, 9),
+                             Card(Suits.CLUBS, 2)])
+    alice.set_status_effect(Status.DRAW2OR3)
+    alice.set_allowed_cards([2, 3])
+    assert list(alice.legal_moves(stack)) == [[0], [2], [3]]
+
+
+def test_player_counts_copies_of_a_card():
+    card = Card(Suits.SPADES, 7)
+    player = Player('Bob', [card, Card(Suits.HEARTS, 2), card])
+    assert player.count_card(card) == 2
+    player.remove_cards([0])
+    assert player.has_card(card)
+    assert player.count_card(card) == 1
+    player.remove_cards([1])
+    assert not player.has_card(card)
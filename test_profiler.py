@@ -0,0 +1,73 @@
+from profiler import PhaseProfiler, PHASES
+from game import Game, PROFILED_METHODS
+from renderer import NullRenderer
+import json
+
+
+def test_phase_profiler_separates_own_time():
+    ticks = iter(range(100))
+    profiler = PhaseProfiler(clock=lambda: next(ticks))
+    draw = profiler.wrap('draw', lambda: None)
+    turn = profiler.wrap('turn', lambda: draw())
+    turn()
+    assert profiler.calls['turn'] == 1
+    assert profiler.calls['draw'] == 1
+    assert profiler.total['turn'] == 3
+    assert profiler.own['turn'] == 2
+    assert profiler.own['draw'] == 1
+
+
+def test_profiled_game_plays_the_same():
+    plain = Game.headless(3, seed=5)
+    profiled = Game.headless(3, seed=5, profiler=PhaseProfiler())
+    assert plain.run(300) == profiled.run(300)
+    assert plain.snapshot() == profiled.snapshot()
+    calls = profiled.profiler.calls
+    assert calls['turn'] == profiled.turn_num
+    assert calls['input'] > 0
+    assert calls['validation'] > 0
+    assert calls['effects'] > 0
+
+
+def test_disable_profiling_restores_the_methods():
+    game = Game.headless(2, seed=3)
+    profiler = game.enable_profiling()
+    game.run(10)
+    assert game.disable_profiling() is profiler
+    assert game.profiler is None
+    for name in PROFILED_METHODS:
+        assert name not in vars(game)
+    assert 'add_cards_on_top' not in vars(game.stack)
+    assert not vars(game.renderer)
+    turns = profiler.calls['turn']
+    game.run(10)
+    assert profiler.calls['turn'] == turns
+
+
+def test_profiling_leaves_a_shared_renderer_alone():
+    renderer = NullRenderer()
+    first = Game(None, 1, start=False, seed=1, renderer=renderer)
+    second = Game(None, 1, start=False, seed=2, renderer=renderer)
+    first_profiler = first.enable_profiling()
+    second_profiler = second.enable_profiling()
+    assert not vars(renderer)
+    first.run(20)
+    second.run(20)
+    assert first.disable_profiling() is first_profiler
+    assert second.disable_profiling() is second_profiler
+    assert first.renderer is renderer
+    assert second.renderer is renderer
+    assert first_profiler.calls['rendering'] > 0
+    assert second_profiler.calls['rendering'] > 0
+
+
+def test_profiles_merge_and_export():
+    first = Game.headless(2, seed=1, profiler=PhaseProfiler())
+    first.run(50)
+    total = PhaseProfiler()
+    total.merge(first.profiler)
+    total.merge_dict(json.loads(first.profiler.to_json()))
+    assert total.calls['turn'] == 2 * first.profiler.calls['turn']
+    summary = total.summary()
+    assert summary.splitlines()[0].startswith('phase')
+    assert all(phase in PHASES for phase in total.as_dict())
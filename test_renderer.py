@@ -0,0 +1,104 @@
+from renderer import TerminalRenderer, NullRenderer, count_rows, ordinal
+from renderer import CLEAR_SCREEN, CURSOR_HOME, CLEAR_DOWN
+from main_player import MainPlayer
+from player import Player, Status
+from card import Card, Suits
+from game import Game
+import io
+
+
+def test_count_rows():
+    assert count_rows('', 80) == 0
+    assert count_rows('abc\n', 80) == 1
+    assert count_rows('abc\n\x1b[31mdef\x1b[0m\n', 80) == 2
+    assert count_rows('a' * 100 + '\n', 80) == 2
+
+
+def test_renderer_first_frame_clears_screen():
+    stream = io.StringIO()
+    renderer = TerminalRenderer(MainPlayer('Alice'), stream)
+    renderer.draw(['one\n', 'two\n'])
+    assert stream.getvalue() == (CLEAR_SCREEN + CURSOR_HOME + 'one\ntwo\n'
+                                 + CLEAR_DOWN)
+
+
+def test_renderer_skips_unchanged_regions():
+    stream = io.StringIO()
+    renderer = TerminalRenderer(MainPlayer('Alice'), stream)
+    renderer.draw(['one\n', 'two\n', 'three\n'])
+    stream.truncate(0)
+    stream.seek(0)
+    renderer.draw(['one\n', 'TWO\n', 'three\n'])
+    frame = stream.getvalue()
+    assert frame.startswith(CURSOR_HOME + '\x1b[1E' + CLEAR_DOWN)
+    assert 'one' not in frame
+    assert 'TWO\nthree\n' in frame
+
+
+def test_renderer_keeps_board_when_only_messages_change():
+    stream = io.StringIO()
+    game = Game('Alice', 1, start=False, seed=2)
+    alice = game.main_player
+    renderer = TerminalRenderer(alice, stream)
+    renderer.show_turn(game, alice)
+    stream.truncate(0)
+    stream.seek(0)
+    renderer.error('This is not a valid option\n')
+    renderer.show_turn(game, alice)
+    frame = stream.getvalue()
+    assert not frame.startswith(CLEAR_SCREEN)
+    assert str(game.stack) not in frame
+    assert alice.get_hand_description() not in frame
+    assert 'This is not a valid option' in frame
+
+def test_renderer_clear():
+    stream = io.StringIO()
+    renderer = TerminalRenderer(MainPlayer('Alice'), stream)
+    renderer.draw(['one\n'])
+    renderer.clear()
+    renderer.draw(['one\n'])
+    assert stream.getvalue().count('one') == 2
+
+
+def test_renderer_collects_messages():
+    alice = MainPlayer('Alice')
+    bob = Player('Bob', [Card(Suits.SPADES, 5)])
+    renderer = TerminalRenderer(alice, io.StringIO())
+    renderer.cards_played(bob, [Card(Suits.SPADES, 2)])
+    renderer.player_passed(alice)
+    bob.set_status_effect(Status.BLOCKED)
+    bob.increase_block()
+    renderer.special_turn(bob)
+    assert alice.special_messages[0].startswith('Bob played')
+    assert alice.special_messages[1] == 'Bob was blocked\n'
+    assert len(alice.special_messages) == 2
+    renderer.end_turn()
+    assert alice.special_messages == []
+
+
+def test_null_renderer_shows_nothing():
+    renderer = NullRenderer()
+    bob = Player('Bob')
+    renderer.cards_played(bob, [Card(Suits.SPADES, 2)])
+    renderer.error('message')
+    assert renderer.show_turn(None, bob) == ''
+
+
+def test_ordinal():
+    assert [ordinal(number) for number in (1, 2, 3, 4, 11, 12, 13, 21, 22,
+                                           101, 111)] == [
+        '1st', '2nd', '3rd', '4th', '11th', '12th', '13th', '21st', '22nd',
+        '101st', '111th']
+
+
+def test_renderer_finishes_large_table():
+    stream = io.StringIO()
+    renderer = TerminalRenderer(MainPlayer('Alice'), stream)
+    game = Game('Alice', 7, start=False, renderer=renderer)
+    for player in game.players[1:]:
+        game.winners.append(player)
+    game.finish_game()
+    output = stream.getvalue()
+    assert '6th place - Player6' in output
+    assert '7th place - Player7' in output
+    assert 'Alice lost' in output
@@ -0,0 +1,129 @@
+from rules import (Rules, RuleBook, InvalidRulesError, compile_rules,
+                   STANDARD_RULES)
+from card import Card, Suits, ALL_CARDS
+from card_stack import CardStack
+from player import Player, Status
+from game import Game
+import pytest
+
+
+def test_standard_rules_special_cards():
+    special = [card for card in ALL_CARDS if card.is_special(STANDARD_RULES)]
+    assert {card.value for card in special} == {1, 2, 3, 4, 11, 12, 13}
+    kings = [card.suit for card in special if card.value == 13]
+    assert sorted(kings) == [Suits.SPADES, Suits.HEARTS]
+
+
+def test_standard_rules_compatibility():
+    for top in ALL_CARDS:
+        for card in ALL_CARDS:
+            expected = (card.value == top.value or card.suit == top.suit
+                        or 12 in (card.value, top.value))
+            assert card.can_put_card(top, STANDARD_RULES) == expected
+
+
+def test_compile_rules_is_cached():
+    assert compile_rules(Rules()) is STANDARD_RULES
+    assert compile_rules(Rules(king_draw=3)) is compile_rules(
+        Rules(king_draw=3))
+
+
+def test_rules_parse_and_describe():
+    rules = Rules.parse('king_draw=3;jack_demands=[5, 6]')
+    assert rules == Rules(king_draw=3, jack_demands=(5, 6))
+    assert Rules.parse(rules.describe()) == rules
+    assert Rules().describe() == 'standard'
+    with pytest.raises(InvalidRulesError):
+        Rules.parse('kings=3')
+    with pytest.raises(InvalidRulesError):
+        Rules.parse('king_draw=three')
+
+
+@pytest.mark.parametrize('rules', [
+    Rules(block_value=2),
+    Rules(block_value=11),
+    Rules(jack_demands=(4, 5)),
+    Rules(jack_demands=()),
+    Rules(jack_demands=(13,)),
+    Rules(jack_demands=(13,), forward_king=None),
+    Rules(forward_king=Suits.SPADES),
+])
+def test_inconsistent_rules(rules):
+    with pytest.raises(InvalidRulesError):
+        RuleBook(rules)
+
+
+@pytest.mark.parametrize('rules', [
+    Rules(penalty_cards=(2, 2)),
+    Rules(penalty_cards=((2, 2), (2, 3))),
+    Rules(penalty_cards=((14, 2),)),
+    Rules(penalty_cards=((2, -1),)),
+    Rules(block_value=14),
+    Rules(block_value='4'),
+    Rules(forward_king=9),
+    Rules(backward_king=True),
+    Rules(king_draw=-1),
+    Rules(king_draw=2.5),
+    Rules(jack_demands=(14,)),
+    Rules(jack_demands=5),
+    Rules(makao_penalty=-5),
+    Rules(queen_on_anything=1),
+])
+def test_rules_of_the_wrong_kind(rules):
+    with pytest.raises(InvalidRulesError):
+        RuleBook(rules)
+    with pytest.raises(InvalidRulesError):
+        compile_rules(rules)
+
+
+def test_rules_parse_checks_values():
+    with pytest.raises(InvalidRulesError):
+        Rules.parse('penalty_cards=(2,2)')
+    with pytest.raises(InvalidRulesError):
+        Rules.parse('king_draw=-1')
+    with pytest.raises(InvalidRulesError):
+        Rules.parse('jack_demands={5: 6}')
+
+
+def test_compile_rules_reads_lists_as_tuples():
+    rules = compile_rules(Rules(jack_demands=[5, 6],
+                                penalty_cards=[[2, 2], [3, 3]]))
+    assert rules is compile_rules(Rules(jack_demands=(5, 6)))
+    assert rules.jack_demands == (5, 6)
+
+
+def test_jack_forces_kings_that_do_not_penalise():
+    rules = compile_rules(Rules(jack_demands=(5, 13), forward_king=None,
+                                backward_king=None))
+    assert rules.jack_demands == (5, 13)
+
+
+def test_variant_penalty_card():
+    rules = compile_rules(Rules(penalty_cards=((2, 2), (3, 3), (5, 1)),
+                                jack_demands=(6, 7, 8, 9, 10)))
+    stack = CardStack([Card(Suits.HEARTS, 6)], rules)
+    next_player = Player('Bob')
+    prev_player = Player('Alice')
+    effect = stack.add_cards_on_top([Card(Suits.HEARTS, 5)], prev_player,
+                                    next_player, [prev_player, next_player])
+    assert effect == []
+    assert next_player.status_effect == Status.DRAW2OR3
+    assert next_player.cards_to_draw == 1
+    assert rules.answers[Status.DRAW2OR3] == [2, 3, 5]
+
+
+def test_variant_without_queen_rule():
+    rules = compile_rules(Rules(queen_on_anything=False,
+                                anything_on_queen=False))
+    stack = CardStack([Card(Suits.HEARTS, 6)], rules)
+    assert not stack.is_valid_combo([Card(Suits.SPADES, 12)])
+    assert not Card(Suits.SPADES, 12).is_special(rules)
+
+
+def test_game_plays_by_its_rules():
+    rules = Rules(king_draw=3, block_value=10, jack_demands=(5, 6, 7, 8, 9))
+    game = Game.headless(3, seed=4, rules=rules)
+    assert game.rules.rules == rules
+    assert game.stack.rules is game.rules
+    game.run(200)
+    assert game.clone([game.controllers[0]] * 3).rules is game.rules
@@ -0,0 +1,47 @@
+from search import MonteCarloController
+from controller import OpponentController
+from game import Game
+import random
+import pytest
+
+
+def test_monte_carlo_needs_a_budget():
+    with pytest.raises(ValueError):
+        MonteCarloController(time_budget=None, max_rollouts=None)
+
+
+def test_monte_carlo_picks_legal_move():
+    controller = MonteCarloController(time_budget=None, max_rollouts=10,
+                                      rng=random.Random(1))
+    game = Game.headless(2, [controller, OpponentController()], seed=5)
+    player = game.players[0]
+    move = controller.get_moves(game, player)
+    assert move in list(player.legal_moves(game.stack, 3))
+    assert game.turn_num == 0
+    assert len(player.hand) == 5
+
+
+def test_monte_carlo_game_finishes():
+    controller = MonteCarloController(time_budget=None, max_rollouts=4,
+                                      rollout_turns=50,
+                                      rng=random.Random(2))
+    game = Game.headless(2, [controller, OpponentController()], seed=3)
+    game.run(300)
+    assert game.turn_num > 0
+
+
+def test_determinize_keeps_hand_sizes():
+    controller = MonteCarloController(max_rollouts=1)
+    game = Game.headless(3, seed=8)
+    game.run(10)
+    state = game.snapshot()
+    new_state = controller.determinize(state, 0)
+    assert ([len(player.hand) for player in new_state.players]
+            == [len(player.hand) for player in state.players])
+    assert new_state.players[0] == state.players[0]
+    assert new_state.stack == state.stack
+
+    def hidden(state):
+        return sorted(card.code for card in state.deck + state.players[1].hand
+                      + state.players[2].hand)
+    assert hidden(new_state) == hidden(state)
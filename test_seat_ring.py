@@ -0,0 +1,42 @@
+from seat_ring import SeatRing
+from player import Player, Status
+
+
+def make_ring(size):
+    players = [Player(f'P{seat}') for seat in range(size)]
+    return players, SeatRing(players)
+
+
+def test_seat_ring_neighbours():
+    players, ring = make_ring(5)
+    assert [ring.seat_of(player) for player in players] == list(range(5))
+    assert ring.seat_of(Player('Stranger')) is None
+    assert ring.next_seat(4) == 0
+    assert ring.prev_seat(0) == 4
+
+
+def test_seat_ring_skips_blocked_and_won():
+    players, ring = make_ring(6)
+    players[1].set_status_effect(Status.BLOCKED)
+    players[2].win_game()
+    assert ring.next_seat(0) == 3
+    assert ring.prev_seat(3) == 0
+    players[1].remove_status_effect()
+    assert ring.next_seat(0) == 1
+
+
+def test_seat_ring_follows_restored_state():
+    players, ring = make_ring(3)
+    state = players[1].get_state()
+    players[1].win_game()
+    assert ring.next_seat(0) == 2
+    players[1].set_state(state)
+    assert ring.next_seat(0) == 1
+
+
+def test_seat_ring_with_nobody_taking_turns():
+    players, ring = make_ring(3)
+    for player in players:
+        player.win_game()
+    assert ring.next_seat(0) == 1
+    assert ring.prev_seat(0) == 2
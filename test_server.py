@@ -0,0 +1,186 @@
+from server import GameServer, Table, decode_message, encode_message
+from game import Game
+import asyncio
+import threading
+from typing import Optional
+
+
+async def play_client(port: int, name: str, answer: bool = True,
+                      say: Optional[tuple] = ()) -> list:
+    """
+    Joins a table and passes every turn saying the given words,
+    returns what it received with the time it was received at
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(encode_message({'type': 'join', 'name': name}))
+    received = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        message = decode_message(line)
+        message['received_at'] = asyncio.get_running_loop().time()
+        received.append(message)
+        if message['type'] == 'finished':
+            break
+        if message['type'] != 'ask' or not answer:
+            continue
+        if message['decision'] == 'moves':
+            reply = {'moves': [len(message['hand'])], 'say': say}
+        elif message['decision'] == 'jack_value':
+            reply = {'value': 5}
+        elif message['decision'] == 'ace_suit':
+            reply = {'value': 1}
+        else:
+            reply = {'value': 0}
+        writer.write(encode_message({'type': 'answer', **reply}))
+    writer.close()
+    return received
+
+
+def test_clients_play_against_bots():
+    async def run():
+        server = GameServer(table_size=2, wait=0.01, seed=3, max_turns=200)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        results = await asyncio.wait_for(asyncio.gather(
+            play_client(port, 'a'), play_client(port, 'b')), 30)
+        await server.close()
+        return results
+
+    for received in asyncio.run(run()):
+        types = [message['type'] for message in received]
+        assert types[0] == 'start'
+        assert types[-1] == 'finished'
+        assert 'ask' in types
+        assert 'event' in types
+
+
+def test_stalled_client_does_not_block_other_tables():
+    async def run():
+        server = GameServer(table_size=2, wait=0.01, seed=4, max_turns=200)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        stalled = asyncio.create_task(play_client(port, 'slow', False))
+        await asyncio.sleep(0.05)
+        received = await asyncio.wait_for(play_client(port, 'fast'), 30)
+        assert not stalled.done()
+        await server.close()
+        await asyncio.wait_for(stalled, 30)
+        return received
+
+    assert asyncio.run(run())[-1]['type'] == 'finished'
+
+
+def test_hidden_cards_are_not_broadcast():
+    async def run():
+        server = GameServer(table_size=2, wait=0.01, seed=5, max_turns=100)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        received = await asyncio.wait_for(play_client(port, 'a'), 30)
+        await server.close()
+        return received
+
+    received = asyncio.run(run())
+    seat = received[0]['seat']
+    for message in received:
+        if message['type'] == 'event' and message['event'] == 'DRAW':
+            assert ('cards' in message) == (message['seat'] == seat)
+
+
+def test_slow_client_times_out():
+    async def run():
+        server = GameServer(table_size=2, wait=0.01, seed=6, max_turns=50,
+                            timeout=0.01)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        received = await asyncio.wait_for(
+            play_client(port, 'slow', False), 30)
+        await server.close()
+        return received
+
+    assert asyncio.run(run())[-1]['type'] == 'finished'
+
+
+def test_tables_past_the_limit_start_when_a_thread_is_free():
+    async def run():
+        server = GameServer(table_size=2, wait=0.01, seed=7, max_turns=100,
+                            max_tables=1)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        first = [asyncio.create_task(play_client(port, name))
+                 for name in ('a', 'b')]
+        await asyncio.sleep(0.005)
+        second = [asyncio.create_task(play_client(port, name))
+                  for name in ('c', 'd')]
+        results = await asyncio.wait_for(asyncio.gather(*first, *second), 30)
+        await server.close()
+        return results
+
+    a, b, c, d = asyncio.run(run())
+    assert a[0]['table'] != c[0]['table']
+    last_event = [message for message in a if message['type'] == 'event'][-1]
+    for received in (c, d):
+        assert received[0]['type'] == 'start'
+        assert received[0]['received_at'] >= last_event['received_at']
+
+
+def test_words_are_said_on_the_table_thread(monkeypatch):
+    threads = []
+    said = Game.handle_special_inputs
+
+    def record(self, player, word):
+        threads.append(threading.current_thread())
+        said(self, player, word)
+
+    monkeypatch.setattr(Game, 'handle_special_inputs', record)
+
+    async def run():
+        server = GameServer(table_size=2, wait=0.01, seed=8, max_turns=50)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        received = await asyncio.wait_for(
+            play_client(port, 'a', say=('MAKAO',)), 30)
+        await server.close()
+        return received
+
+    assert asyncio.run(run())[-1]['type'] == 'finished'
+    assert threads
+    assert threading.main_thread() not in threads
+
+
+def test_words_of_the_wrong_kind_are_rejected():
+    async def run():
+        server = GameServer(table_size=2, wait=0.01, seed=9, max_turns=50,
+                            timeout=1)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        received = await asyncio.wait_for(play_client(port, 'a', say=None),
+                                          30)
+        await server.close()
+        return received
+
+    received = asyncio.run(run())
+    assert received[-1]['type'] == 'finished'
+    assert 'error' not in received[-1]
+
+
+def test_failed_table_still_finishes(monkeypatch):
+    def fail(self, max_turns=None):
+        self._loop.call_soon_threadsafe(self.announce)
+        raise RuntimeError('broken')
+
+    monkeypatch.setattr(Table, 'play', fail)
+
+    async def run():
+        server = GameServer(table_size=2, wait=0.01, seed=2, max_turns=50)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        received = await asyncio.wait_for(play_client(port, 'a'), 30)
+        await server.close()
+        return received
+
+    finished = asyncio.run(run())[-1]
+    assert finished['type'] == 'finished'
+    assert finished['turns'] == 0
+    assert 'broken' in finished['error']
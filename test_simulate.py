@@ -0,0 +1,51 @@
+from simulate import simulate, play_game, special_card_name, sweep, main
+from rules import Rules
+from game_log import read_games
+from card import Suits
+import io
+import json
+
+
+def test_special_card_name():
+    assert special_card_name(Suits.SPADES, 13) == 'K♠'
+    assert special_card_name(Suits.HEARTS, 11) == 'J'
+    assert special_card_name(Suits.CLUBS, 13) is None
+    assert special_card_name(Suits.CLUBS, 7) is None
+
+
+def test_play_game_is_reproducible():
+    assert play_game((7, 3, 300, False, False, None)) == play_game(
+        (7, 3, 300, False, False, None))
+
+
+def test_simulate_aggregates_games():
+    out = io.StringIO()
+    results = simulate(6, 2, max_turns=300, report_every=3, out=out)
+    assert results.games == 6
+    assert sum(results.wins) + results.unfinished == 6
+    assert results.average_turns > 0
+    assert out.getvalue().count('games') == 2
+
+
+def test_simulate_writes_log(tmp_path):
+    path = str(tmp_path / 'games.mkl')
+    simulate(4, 2, max_turns=300, seed=10, out=io.StringIO(), log_path=path)
+    assert sorted(game.seed for game in read_games(path)) == [10, 11, 12, 13]
+
+
+def test_sweep_plays_every_variant():
+    variants = [Rules(), Rules(king_draw=3)]
+    results = sweep(variants, 3, 2, max_turns=200)
+    assert list(results) == variants
+    assert all(result.games == 3 for result in results.values())
+
+
+def test_variants_report_their_profiles(tmp_path, capsys):
+    path = str(tmp_path / 'profile.json')
+    main(['--games', '2', '--opponents', '1', '--max-turns', '100',
+          '--variant', 'king_draw=3', '--profile', '--profile-json', path])
+    assert capsys.readouterr().out.count('phase ') == 2
+    with open(path) as file:
+        profiles = json.load(file)
+    assert list(profiles) == ['standard', 'king_draw=3']
+    assert all(profile['turn']['calls'] > 0 for profile in profiles.values())